@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Applicant Tracking System (ATS) Detection
+
+Restaurant careers pages usually embed a hosted job board (Greenhouse, Lever,
+Workable, BambooHR, Harri, ...) through an iframe, script tag or outbound link.
+Those postings are often rendered by JavaScript, so counting elements in the
+careers HTML misses them. When a board is detected, the job count comes from
+the provider's public JSON listing endpoint instead.
+
+Every provider's base URL can be overridden, so the detector can be pointed at
+a local stand-in server (see ats_standin.py, which serves recorded listing
+responses from examples/fixtures/ats_listings.json):
+
+    detector = ATSDetector(api_bases={'lever': 'http://127.0.0.1:8000'})
+
+Providers marked experimental have an unconfirmed listing endpoint and are
+only detected with ATSDetector(experimental=True); otherwise their careers
+pages fall back to counting postings in the HTML.
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+
+# Start of a host name: not preceded by another label ("notlever.co", "x.jobs.lever.co")
+HOST_START = r'(?<![\w.-])'
+# End of a per-tenant host name ("acme.bamboohr.com", not "acme.bamboohr.com.example")
+HOST_END = r'(?![\w.-])'
+
+# Provider fingerprints and listing endpoints.
+#   patterns: regexes over HTML or URLs; group 1 is the board token. Hosts are
+#             anchored with HOST_START so lookalike hosts don't match.
+#   api_base: default base URL ({token} is substituted for per-tenant hosts)
+#   endpoint: listing path appended to the base
+#   experimental: endpoint not confirmed against the live provider
+ATS_PROVIDERS = {
+    'greenhouse': {
+        'name': 'Greenhouse',
+        'patterns': [
+            HOST_START + r'(?:boards\.|job-boards\.)?greenhouse\.io/embed/job_board(?:/js)?\?for=([\w-]+)',
+            HOST_START + r'(?:boards|job-boards)\.greenhouse\.io/(?!embed\b)([\w-]+)',
+        ],
+        'api_base': 'https://boards-api.greenhouse.io',
+        'endpoint': '/v1/boards/{token}/jobs',
+    },
+    'lever': {
+        'name': 'Lever',
+        'patterns': [
+            HOST_START + r'jobs\.lever\.co/([\w.-]+)',
+        ],
+        'api_base': 'https://api.lever.co',
+        'endpoint': '/v0/postings/{token}?mode=json',
+    },
+    'workable': {
+        'name': 'Workable',
+        'patterns': [
+            HOST_START + r'apply\.workable\.com/(?!api\b)([\w-]+)',
+            r'//(?!apply\.|www\.)([\w-]+)\.workable\.com' + HOST_END,
+        ],
+        'api_base': 'https://apply.workable.com',
+        'endpoint': '/api/v1/widget/accounts/{token}',
+    },
+    'bamboohr': {
+        'name': 'BambooHR',
+        'patterns': [
+            r'//(?!www\.)([\w-]+)\.bamboohr\.com' + HOST_END,
+        ],
+        'api_base': 'https://{token}.bamboohr.com',
+        'endpoint': '/careers/list',
+    },
+    'harri': {
+        'name': 'Harri',
+        'patterns': [
+            # Harri's own pages share the path space with brand slugs
+            HOST_START + r'(?:www\.)?harri\.com/(?!(?:api|gateway|static|careers|about|blog|login|signup|'
+                         r'contact|pricing|privacy|terms|solutions|resources|employers|jobs|search)\b)([\w-]+)',
+        ],
+        'api_base': 'https://gateway.harri.com',
+        'endpoint': '/core/api/v1/harri_search/search_jobs?brand_slug={token}',
+        'experimental': True,
+    },
+    'ashby': {
+        'name': 'Ashby',
+        'patterns': [
+            HOST_START + r'jobs\.ashbyhq\.com/([\w.-]+)',
+        ],
+        'api_base': 'https://api.ashbyhq.com',
+        'endpoint': '/posting-api/job-board/{token}',
+    },
+    'smartrecruiters': {
+        'name': 'SmartRecruiters',
+        'patterns': [
+            HOST_START + r'(?:careers|jobs)\.smartrecruiters\.com/([\w-]+)',
+        ],
+        'api_base': 'https://api.smartrecruiters.com',
+        'endpoint': '/v1/companies/{token}/postings',
+    },
+}
+
+# Keys that hold the list of postings (or the total) in provider responses
+LISTING_KEYS = ['jobs', 'postings', 'result', 'offers', 'content', 'data']
+TOTAL_KEYS = ['totalFound', 'total', 'count']
+
+
+class ATSDetector:
+    """Detects embedded job boards and resolves their JSON listing endpoints."""
+
+    def __init__(self, api_bases: Optional[Dict[str, str]] = None, experimental: bool = False):
+        self.api_bases = api_bases or {}
+        self.experimental = experimental
+        self.compiled = [
+            (provider, re.compile(pattern, re.I))
+            for provider in self.providers()
+            for pattern in ATS_PROVIDERS[provider]['patterns']
+        ]
+
+    def detect(self, text: str) -> Optional[Tuple[str, str]]:
+        """Return (provider, board_token) for the first ATS fingerprint in HTML or a URL."""
+        if not text:
+            return None
+
+        for provider, pattern in self.compiled:
+            match = pattern.search(text)
+            if match:
+                return provider, match.group(1).rstrip('.')
+
+        return None
+
+    def listing_url(self, provider: str, token: str) -> str:
+        """Build the JSON listing URL for a detected board."""
+        spec = ATS_PROVIDERS[provider]
+        base = self.api_bases.get(provider, spec['api_base']).format(token=token)
+        return base.rstrip('/') + spec['endpoint'].format(token=token)
+
+    def count_jobs(self, data) -> int:
+        """Count postings in a provider's JSON listing response."""
+        if isinstance(data, list):
+            return len(data)
+
+        if not isinstance(data, dict):
+            return 0
+
+        for key in TOTAL_KEYS:
+            if isinstance(data.get(key), int):
+                return data[key]
+
+        for key in LISTING_KEYS:
+            value = data.get(key)
+            if isinstance(value, list):
+                return len(value)
+            if isinstance(value, dict):
+                return self.count_jobs(value)
+
+        return 0
+
+    def provider_name(self, provider: str) -> str:
+        """Human-readable provider name."""
+        return ATS_PROVIDERS[provider]['name']
+
+    def providers(self) -> List[str]:
+        """Provider keys this detector matches (experimental ones only if enabled)."""
+        return [
+            provider for provider, spec in ATS_PROVIDERS.items()
+            if self.experimental or not spec.get('experimental')
+        ]
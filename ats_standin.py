@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+ATS Stand-in Server
+
+Serves recorded job board listing responses (examples/fixtures/ats_listings.json)
+on localhost at each provider's listing endpoint, so ATS detection, listing
+URLs and job counts can be checked without calling the real providers.
+
+Each fixture has a careers page snippet embedding the board, the board
+token, the listing path the provider serves it at, a recorded response and
+the number of jobs in it. The check detects the board in the snippet, builds
+its listing URL against the stand-in, fetches it and counts the jobs.
+
+Experimental providers (unconfirmed endpoints, see ats_detector.py) have no
+fixture.
+
+Usage:
+    python ats_standin.py            # check every provider
+    python ats_standin.py --serve    # keep serving (prints the api_bases to use)
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ats_detector import ATS_PROVIDERS, ATSDetector
+
+
+FIXTURES_PATH = Path(__file__).parent / 'examples' / 'fixtures' / 'ats_listings.json'
+
+
+def load_fixtures(path: Path = FIXTURES_PATH) -> Dict[str, Dict]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def standin_bases(port: int, fixtures: Dict[str, Dict]) -> Dict[str, str]:
+    """ATSDetector api_bases pointing every provider at the stand-in (per-tenant hosts become a path)."""
+    bases = {}
+    for provider in fixtures:
+        tenant = '/{token}' if '{token}' in ATS_PROVIDERS[provider]['api_base'] else ''
+        bases[provider] = f'http://127.0.0.1:{port}/{provider}{tenant}'
+    return bases
+
+
+def start_standin_server(fixtures: Dict[str, Dict], port: int = 0) -> ThreadingHTTPServer:
+    """Serve each fixture's response at /<provider>[/<token>]<path>; anything else is a 404."""
+    routes = {}
+    for provider, fixture in fixtures.items():
+        tenant = f"/{fixture['token']}" if '{token}' in ATS_PROVIDERS[provider]['api_base'] else ''
+        routes[f"/{provider}{tenant}{fixture['path']}"] = json.dumps(fixture['response']).encode('utf-8')
+
+    class StandinHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = routes.get(self.path)
+            if body is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), StandinHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def check_provider(detector: ATSDetector, scraper, provider: str, fixture: Dict) -> List[str]:
+    """Problems found for one provider's fixture (empty if detection, URL and count all match)."""
+    board = detector.detect(fixture['careers_html'])
+    if board != (provider, fixture['token']):
+        return [f"detected {board}, expected ({provider!r}, {fixture['token']!r})"]
+
+    url = detector.listing_url(provider, fixture['token'])
+    data = scraper.request_json(url, timeout=5)
+    if data is None:
+        return [f'no listing at {url}']
+
+    jobs = detector.count_jobs(data)
+    if jobs != fixture['jobs']:
+        return [f"counted {jobs} jobs at {url}, expected {fixture['jobs']}"]
+    return []
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Check ATS detection and job counts against a local stand-in')
+    parser.add_argument('--fixtures', default=str(FIXTURES_PATH), help='Recorded listing responses JSON')
+    parser.add_argument('--serve', action='store_true', help='Keep serving instead of checking')
+    parser.add_argument('--port', type=int, default=0, help='Port (default: any free port)')
+
+    args = parser.parse_args(argv)
+
+    fixtures = load_fixtures(Path(args.fixtures))
+    server = start_standin_server(fixtures, args.port)
+    bases = standin_bases(server.server_address[1], fixtures)
+
+    if args.serve:
+        print(f"✅ ATS stand-in on http://127.0.0.1:{server.server_address[1]}")
+        print(f"   api_bases = {json.dumps(bases)}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.shutdown()
+        return
+
+    from automated_researcher import WebScraper
+
+    detector = ATSDetector(api_bases=bases)
+    scraper = WebScraper()
+    failed = 0
+    for provider, fixture in fixtures.items():
+        problems = check_provider(detector, scraper, provider, fixture)
+        if problems:
+            failed += 1
+            print(f"❌ {detector.provider_name(provider)}: {'; '.join(problems)}")
+        else:
+            print(f"✅ {detector.provider_name(provider)}: {fixture['jobs']} jobs ({fixture['token']})")
+    server.shutdown()
+
+    untested = [provider for provider in detector.providers() if provider not in fixtures]
+    if untested:
+        print(f"⚠️  No stand-in fixture for: {', '.join(untested)}")
+    if failed or untested:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
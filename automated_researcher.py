@@ -10,30 +10,153 @@ Validates trial data through:
 5. Confidence scoring
 """
 
+import codecs
 import csv
+import heapq
+from itertools import islice
 import json
 import re
+import threading
 import time
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
 from datetime import datetime
 import requests
 from bs4 import BeautifulSoup
 from fake_useragent import UserAgent
 from ratelimit import limits, sleep_and_retry
 
+from ats_detector import ATSDetector
+from confidence import ConfidenceEngine, match_locations
+from domain_index import CATEGORY_LABELS, OWNED, DomainIndex, default_index
+from evidence_store import EvidenceStore
+from filter_best_trials import score_research_priority
+from group_index import GroupIndex, normalize_company_name, website_domain
+from metrics import REGISTRY, add_metrics_arguments, finish_metrics, start_metrics
+from page_extractors import extract_homepage, extract_job_count, extract_location_count, parse_html
+import progress
+from trial_clusters import cluster_trials, summarize_clusters
+from trial_io import open_text, read_rows, write_rows
+from work_queue import WorkQueue, default_worker_id
+
+
+FETCHES = REGISTRY.counter('trial_icp_fetches', 'HTTP fetches by status and host bucket', ('status', 'host'))
+FETCH_SECONDS = REGISTRY.histogram('trial_icp_fetch_seconds', 'Fetch latency (request and body read)', ('host',))
+RATE_LIMIT_WAIT_SECONDS = REGISTRY.histogram('trial_icp_rate_limit_wait_seconds', 'Time spent waiting on the rate limiter')
+CACHE_REQUESTS = REGISTRY.counter('trial_icp_cache_requests', 'Cache lookups by cache and result', ('cache', 'result'))
+SKIPPED_FETCHES = REGISTRY.counter('trial_icp_skipped_fetches', 'Fetches skipped by domain category', ('category',))
+
+# Host buckets keep the fetch metrics' label cardinality bounded
+HOST_BUCKETS = {
+    'greenhouse.io': 'ats', 'lever.co': 'ats', 'workable.com': 'ats', 'bamboohr.com': 'ats',
+    'harri.com': 'ats', 'ashbyhq.com': 'ats', 'smartrecruiters.com': 'ats',
+    'google.com': 'maps', 'yelp.com': 'yelp',
+}
+
+
+def host_bucket(url: str) -> str:
+    """Coarse host label for a URL: ats, maps, yelp or website."""
+    return HOST_BUCKETS.get(website_domain(url), 'website')
+
+
+def empty_website_data() -> Dict:
+    """Website findings before (or without) a successful homepage fetch."""
+    return {
+        'website_accessible': False,
+        'has_locations_page': False,
+        'has_careers_page': False,
+        'locations_found': [],
+        'job_postings_count': 0,
+        'parent_company_mention': None,
+    }
+
+
+class HostRateLimiter:
+    """At most one request per period to each host; different hosts don't wait on each other."""
+
+    def __init__(self, period: float = 2.0):
+        self.period = period
+        self.next_slot: Dict[str, float] = {}
+        self.lock = threading.Lock()
+
+    def wait(self, url: str) -> float:
+        """Block until the URL's host may be requested. Returns seconds waited."""
+        if self.period <= 0:
+            return 0.0
+        host = urlparse(url).netloc.lower()
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, now))
+            self.next_slot[host] = slot + self.period
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
 
 class WebScraper:
     """Handles web scraping with rate limiting and error handling."""
 
-    def __init__(self):
+    MAX_RESPONSE_BYTES = 2 * 1024 * 1024  # 2 MB per response
+    CHUNK_SIZE = 16 * 1024
+    HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+    # Once the closing body tag has streamed in, the links and footer the
+    # extractors look at are all available
+    STOP_MARKERS = ('</body', '</html')
+
+    def __init__(self, max_bytes: int = MAX_RESPONSE_BYTES, domains: Optional[DomainIndex] = None):
         self.ua = UserAgent()
         self.session = requests.Session()
+        self.max_bytes = max_bytes
+        self.domains = domains or default_index()
+
+    def skip_fetch(self, url: str) -> bool:
+        """Whether a URL is on a social, aggregator, parked or free-mail domain (never worth a fetch)."""
+        category = self.domains.classify(url)
+        if category == OWNED:
+            return False
+        SKIPPED_FETCHES.inc(category)
+        progress.detail(f"  ⏭️  Skipping {url}: {CATEGORY_LABELS[category]}")
+        return True
+
+    def fetch_url(self, url: str, timeout: int = 10) -> Optional[str]:
+        """
+        Fetch URL content with rate limiting.
+
+        The body is streamed and decoded incrementally: non-HTML responses
+        (PDF menus, images) are skipped from the headers alone, and reading
+        stops at the closing body tag or after max_bytes, whichever comes first.
+        URLs on known non-restaurant domains return None without a request.
+        """
+        if self.skip_fetch(url):
+            return None
+        self._wait_for_turn()
+        return self.request_html(url, timeout)
+
+    def fetch_json(self, url: str, timeout: int = 10):
+        """Fetch and decode a JSON endpoint with rate limiting."""
+        self._wait_for_turn()
+        return self.request_json(url, timeout)
+
+    def _wait_for_turn(self):
+        """Block until the rate limiter (shared by page and JSON fetches) allows a request."""
+        requested_at = time.monotonic()
+        self._rate_limit()
+        RATE_LIMIT_WAIT_SECONDS.observe(time.monotonic() - requested_at)
 
     @sleep_and_retry
     @limits(calls=1, period=2)  # 1 call every 2 seconds
-    def fetch_url(self, url: str, timeout: int = 10) -> Optional[str]:
-        """Fetch URL content with rate limiting."""
+    def _rate_limit(self):
+        pass
+
+    def request_html(self, url: str, timeout: float = 10) -> Optional[str]:
+        """fetch_url without the rate limiter (the caller paces its requests)."""
+        started = time.monotonic()
+        host = host_bucket(url)
+        status = 'error'
+
         try:
             headers = {
                 'User-Agent': self.ua.random,
@@ -41,24 +164,101 @@ class WebScraper:
                 'Accept-Language': 'en-US,en;q=0.5',
             }
 
+            with self.session.get(url, headers=headers, timeout=timeout,
+                                  allow_redirects=True, stream=True) as response:
+                status = str(response.status_code)
+                response.raise_for_status()
+
+                content_type = response.headers.get('Content-Type', '')
+                mime_type = content_type.split(';')[0].strip().lower()
+                if mime_type and mime_type not in self.HTML_CONTENT_TYPES:
+                    progress.detail(f"  ⚠️  Skipping {url}: not HTML ({mime_type})")
+                    return None
+
+                return self._read_html(response)
+
+        except requests.RequestException as e:
+            progress.detail(f"  ⚠️  Error fetching {url}: {str(e)[:100]}")
+            return None
+
+        finally:
+            FETCHES.inc(status, host)
+            FETCH_SECONDS.observe(time.monotonic() - started, host)
+
+    def request_json(self, url: str, timeout: float = 10):
+        """fetch_json without the rate limiter (the caller paces its requests)."""
+        started = time.monotonic()
+        host = host_bucket(url)
+        status = 'error'
+
+        try:
+            headers = {
+                'User-Agent': self.ua.random,
+                'Accept': 'application/json',
+            }
+
             response = self.session.get(url, headers=headers, timeout=timeout, allow_redirects=True)
+            status = str(response.status_code)
             response.raise_for_status()
-            return response.text
+            return response.json()
 
-        except requests.RequestException as e:
-            print(f"  ⚠️  Error fetching {url}: {str(e)[:100]}")
+        except (requests.RequestException, ValueError) as e:
+            progress.detail(f"  ⚠️  Error fetching {url}: {str(e)[:100]}")
             return None
 
+        finally:
+            FETCHES.inc(status, host)
+            FETCH_SECONDS.observe(time.monotonic() - started, host)
+
+    def _read_html(self, response: requests.Response) -> str:
+        """Decode a streamed response until a stop marker or the byte cap."""
+        try:
+            decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+        except LookupError:
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+        parts = []
+        received = 0
+        tail = ''
+
+        for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+            received += len(chunk)
+            text = decoder.decode(chunk)
+            parts.append(text)
+
+            # Keep a short tail so markers split across chunks are still seen
+            window = (tail + text).lower()
+            if any(marker in window for marker in self.STOP_MARKERS):
+                break
+            tail = window[-8:]
+
+            if received >= self.max_bytes:
+                progress.detail(f"  ⚠️  Truncated {response.url} at {received // 1024} KB")
+                break
+        else:
+            parts.append(decoder.decode(b'', final=True))
+
+        return ''.join(parts)
+
     def parse_html(self, html: str) -> BeautifulSoup:
         """Parse HTML content."""
-        return BeautifulSoup(html, 'lxml')
+        return parse_html(html)
 
 
 class RestaurantResearcher:
     """Researches restaurant details from various sources."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        ats_detector: Optional[ATSDetector] = None,
+        group_index: Optional[GroupIndex] = None,
+        confidence: Optional[ConfidenceEngine] = None,
+    ):
         self.scraper = WebScraper()
+        self.domains = self.scraper.domains
+        self.confidence = confidence or ConfidenceEngine()
+        self.ats_detector = ats_detector or ATSDetector()
+        self.group_index = group_index
         self.cache = {}
 
     def find_website(self, company_name: str) -> Optional[str]:
@@ -70,16 +270,18 @@ class RestaurantResearcher:
         # TODO: Implement Google Custom Search API
         return None
 
-    def scrape_website_basics(self, website: str) -> Dict:
+    def _fetch_timeout(self, deadline: Optional[float], default: int = 10) -> Optional[float]:
+        """Cap a fetch timeout by the time left before the trial deadline."""
+        if deadline is None:
+            return default
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        return min(default, remaining)
+
+    def scrape_website_basics(self, website: str, deadline: Optional[float] = None) -> Dict:
         """Scrape basic info from restaurant website."""
-        result = {
-            'website_accessible': False,
-            'has_locations_page': False,
-            'has_careers_page': False,
-            'locations_found': [],
-            'job_postings_count': 0,
-            'parent_company_mention': None,
-        }
+        result = empty_website_data()
 
         if not website:
             return result
@@ -88,111 +290,71 @@ class RestaurantResearcher:
         if not website.startswith('http'):
             website = 'https://' + website
 
-        print(f"    🌐 Scraping website: {website}")
+        progress.detail(f"    🌐 Scraping website: {website}")
 
         # Fetch homepage
-        html = self.scraper.fetch_url(website)
+        timeout = self._fetch_timeout(deadline)
+        if timeout is None:
+            return result
+        html = self.scraper.fetch_url(website, timeout=timeout)
         if not html:
             return result
 
         result['website_accessible'] = True
-        soup = self.scraper.parse_html(html)
-
-        # Look for common page links
-        links = soup.find_all('a', href=True)
-        link_texts = [(link.get_text().lower(), link['href']) for link in links]
-
-        # Check for locations page
-        location_keywords = ['location', 'locations', 'our restaurants', 'find us', 'store locator']
-        for text, href in link_texts:
-            if any(keyword in text for keyword in location_keywords):
-                result['has_locations_page'] = True
-                locations_url = href if href.startswith('http') else website.rstrip('/') + '/' + href.lstrip('/')
-                result['locations_url'] = locations_url
-                break
-
-        # Check for careers page
-        careers_keywords = ['career', 'careers', 'jobs', 'join us', 'hiring', 'employment']
-        for text, href in link_texts:
-            if any(keyword in text for keyword in careers_keywords):
-                result['has_careers_page'] = True
-                careers_url = href if href.startswith('http') else website.rstrip('/') + '/' + href.lstrip('/')
-                result['careers_url'] = careers_url
-                break
-
-        # Look for parent company mentions in footer
-        footer = soup.find('footer')
-        if footer:
-            footer_text = footer.get_text()
-            # Look for "© 2024 Company Name" pattern
-            copyright_match = re.search(r'©\s*\d{4}\s+([A-Z][A-Za-z\s&]+(?:LLC|Inc|Group|Hospitality))', footer_text)
-            if copyright_match:
-                result['parent_company_mention'] = copyright_match.group(1).strip()
-
+        result.update(extract_homepage(html, website))
         return result
 
-    def count_locations_from_page(self, locations_url: str) -> int:
+    def count_locations_from_page(self, locations_url: str, timeout: float = 10) -> int:
         """Count locations from locations page."""
-        print(f"    📍 Checking locations page...")
+        progress.detail(f"    📍 Checking locations page...")
 
-        html = self.scraper.fetch_url(locations_url)
+        html = self.scraper.fetch_url(locations_url, timeout=timeout)
         if not html:
             return 0
 
-        soup = self.scraper.parse_html(html)
-
-        # Look for address patterns
-        addresses = []
-
-        # Method 1: Find elements with address-like text
-        address_patterns = [
-            r'\d+\s+[\w\s]+(?:Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Drive|Dr|Lane|Ln|Way)',
-            r'\d+\s+[A-Z][a-z]+\s+[A-Z][a-z]+',  # "123 Main Street"
-        ]
-
-        text = soup.get_text()
-        for pattern in address_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            addresses.extend(matches)
-
-        # Method 2: Look for structured location data
-        location_markers = soup.find_all(['div', 'li', 'article'], class_=re.compile(r'location|store|restaurant', re.I))
-        if location_markers:
-            return len(location_markers)
+        return extract_location_count(html)
 
-        # Return unique addresses found
-        unique_addresses = list(set(addresses))
-        return len(unique_addresses) if unique_addresses else 0
-
-    def count_job_postings(self, careers_url: str) -> int:
+    def count_job_postings(self, careers_url: str, timeout: float = 10) -> int:
         """Count job postings from careers page."""
-        print(f"    💼 Checking careers page...")
+        progress.detail(f"    💼 Checking careers page...")
+
+        # Careers links often point straight at a hosted job board
+        board = self.ats_detector.detect(careers_url)
+        if board:
+            return self.count_ats_postings(*board, timeout=timeout)
 
-        html = self.scraper.fetch_url(careers_url)
+        html = self.scraper.fetch_url(careers_url, timeout=timeout)
         if not html:
             return 0
 
-        soup = self.scraper.parse_html(html)
+        # Embedded job board (iframe/script) - ask the provider's JSON endpoint
+        board = self.ats_detector.detect(html)
+        if board:
+            return self.count_ats_postings(*board, timeout=timeout)
 
-        # Look for job posting indicators
-        job_elements = soup.find_all(['div', 'li', 'article'], class_=re.compile(r'job|position|opening|career', re.I))
+        return extract_job_count(html)
 
-        if job_elements:
-            return len(job_elements)
+    def count_ats_postings(self, provider: str, token: str, timeout: float = 10) -> int:
+        """Count postings from a detected ATS provider's JSON listing endpoint."""
+        progress.detail(f"    💼 {self.ats_detector.provider_name(provider)} job board detected ({token})")
 
-        # Alternative: Count links to job applications
-        job_links = soup.find_all('a', href=re.compile(r'apply|job|position', re.I))
-        return len(job_links) if job_links else 0
+        data = self.scraper.fetch_json(self.ats_detector.listing_url(provider, token), timeout=timeout)
+        if data is None:
+            return 0
 
-    def research_trial(self, trial: Dict) -> Dict:
+        return self.ats_detector.count_jobs(data)
+
+    def start_research(self, trial: Dict) -> Tuple[Dict, Optional[Dict], bool]:
         """
-        Full research on a single trial.
+        The checks before any page is fetched.
+
+        Returns (research, group, done): the initial result, the trial's
+        restaurant group (if indexed), and whether research already ended
+        (skipped, reused group evidence, or no website to fetch).
         """
         company_name = trial.get('company_name', 'Unknown')
         website = trial.get('website', '')
 
-        print(f"\n  🔍 Researching: {company_name}")
-
         research = {
             'company_name': company_name,
             'research_date': datetime.now().isoformat(),
@@ -208,6 +370,7 @@ class RestaurantResearcher:
             'actual_locations_found': 0,
             'job_postings_count': 0,
             'parent_company': 'None detected',
+            'group_evidence': 'None',
 
             # Validation
             'locations_match': 'Unknown',
@@ -219,175 +382,441 @@ class RestaurantResearcher:
             'research_notes': []
         }
 
-        # Skip if not a restaurant
-        if trial.get('is_restaurant') != 'Yes':
-            research['research_status'] = 'Skipped - Not a restaurant'
-            research['research_notes'].append('Not identified as restaurant')
-            return research
-
-        # Skip "your restaurant" test accounts
-        if company_name.lower() == 'your restaurant':
-            research['research_status'] = 'Skipped - Test account'
-            research['research_notes'].append('Generic test account name')
-            return research
+        skipped = self.skip_reason(trial)
+        if skipped:
+            research['research_status'], note = skipped
+            research['research_notes'].append(note)
+            return research, None, True
+
+        # Reuse evidence from a group member researched earlier
+        group = self.group_index.lookup(trial) if self.group_index else None
+        reuse_group = bool(group) and group['evidence'].get('source') == 'research'
+        if self.group_index is not None:
+            CACHE_REQUESTS.inc('group_index', 'hit' if reuse_group else 'miss')
+        if reuse_group:
+            self.apply_group_evidence(research, group)
+            research['research_notes'].append(
+                f"Reused research of {group['evidence'].get('researched_company')} ({group['holding_company']})"
+            )
+            research['locations_match'] = match_locations(
+                trial.get('num_locations', ''), research['actual_locations_found']
+            )
+            return research, group, True
 
         # Find or validate website
         if not website:
             research['research_notes'].append('No website provided in trial data')
             # TODO: Could use Google search to find website
+            return research, group, True
+
+        # Social profiles, delivery listings and parked domains never have a locations page
+        category = self.domains.classify(website)
+        if category != OWNED:
+            SKIPPED_FETCHES.inc(category)
+            research['research_notes'].append(f'Website is a {CATEGORY_LABELS[category]} - not fetched')
+            return research, group, True
+
+        return research, group, False
+
+    def skip_reason(self, trial: Dict) -> Optional[Tuple[str, str]]:
+        """(research_status, note) if a trial's own row rules it out of research, else None."""
+        # Skip if not a restaurant
+        if trial.get('is_restaurant') != 'Yes':
+            return 'Skipped - Not a restaurant', 'Not identified as restaurant'
+
+        # Skip "your restaurant" test accounts
+        if trial.get('company_name', 'Unknown').lower() == 'your restaurant':
+            return 'Skipped - Test account', 'Generic test account name'
+
+        return None
+
+    def research_trial(self, trial: Dict, deadline: Optional[float] = None) -> Dict:
+        """
+        Full research on a single trial.
+
+        If a deadline (time.monotonic() value) is given, fetch timeouts are
+        capped to the time left and remaining pages are skipped once it passes.
+        """
+        progress.detail(f"\n  🔍 Researching: {trial.get('company_name', 'Unknown')}")
+
+        research, group, done = self.start_research(trial)
+        if done:
             return research
+        website = research['website']
 
         # Scrape website basics
-        website_data = self.scrape_website_basics(website)
+        website_data = self.scrape_website_basics(website, deadline=deadline)
         research.update(website_data)
 
         if not website_data['website_accessible']:
-            research['research_notes'].append('Website not accessible')
+            if self._fetch_timeout(deadline) is None:
+                research['research_status'] = 'Partial - Deadline reached'
+                research['research_notes'].append('Trial deadline reached before website fetch')
+            else:
+                research['research_notes'].append('Website not accessible')
             return research
 
         # Count locations if page found
         if website_data['has_locations_page']:
-            locations_found = self.count_locations_from_page(website_data.get('locations_url', ''))
-            research['actual_locations_found'] = locations_found
-            research['research_notes'].append(f'Found {locations_found} locations on website')
+            timeout = self._fetch_timeout(deadline)
+            if timeout is None:
+                research['research_status'] = 'Partial - Deadline reached'
+                research['research_notes'].append('Trial deadline reached before locations page')
+            else:
+                locations_found = self.count_locations_from_page(website_data.get('locations_url', ''), timeout=timeout)
+                research['actual_locations_found'] = locations_found
+                research['research_notes'].append(f'Found {locations_found} locations on website')
 
         # Count job postings if page found
         if website_data['has_careers_page']:
-            jobs_found = self.count_job_postings(website_data.get('careers_url', ''))
-            research['job_postings_count'] = jobs_found
-            research['research_notes'].append(f'Found {jobs_found} job postings')
-
-        # Parent company
-        if website_data.get('parent_company_mention'):
-            research['parent_company'] = website_data['parent_company_mention']
-            research['research_notes'].append(f"Parent company: {website_data['parent_company_mention']}")
-
-        # Validate locations match
-        declared = trial.get('num_locations', '')
-        actual = research['actual_locations_found']
-
-        if actual > 0:
-            if declared == str(actual) or declared == '1' and actual == 1:
-                research['locations_match'] = 'Exact'
-            elif declared in ['2-5'] and 2 <= actual <= 5:
-                research['locations_match'] = 'Range match'
-            elif abs(actual - int(declared.split('-')[0] if '-' in declared else declared or '0')) <= 1:
-                research['locations_match'] = 'Close'
+            timeout = self._fetch_timeout(deadline)
+            if timeout is None:
+                research['research_status'] = 'Partial - Deadline reached'
+                research['research_notes'].append('Trial deadline reached before careers page')
             else:
-                research['locations_match'] = 'Mismatch'
+                jobs_found = self.count_job_postings(website_data.get('careers_url', ''), timeout=timeout)
+                research['job_postings_count'] = jobs_found
+                research['research_notes'].append(f'Found {jobs_found} job postings')
 
+        self.finish_research(trial, research, group)
         return research
 
-    def calculate_confidence(self, research: Dict) -> int:
-        """Calculate confidence score (0-120)."""
-        score = 50  # Base
-
-        # Website accessible (+15)
-        if research.get('website_accessible'):
-            score += 15
-
-        # Locations match (+25)
-        match = research.get('locations_match', 'Unknown')
-        if match == 'Exact':
-            score += 25
-        elif match == 'Range match':
-            score += 20
-        elif match == 'Close':
-            score += 10
-
-        # Job postings found (+15)
-        jobs = research.get('job_postings_count', 0)
-        if jobs >= 10:
-            score += 15
-        elif jobs >= 3:
-            score += 10
-        elif jobs >= 1:
-            score += 5
+    def finish_research(self, trial: Dict, research: Dict, group: Optional[Dict]):
+        """Parent company, group fallback and location validation once the pages are in."""
+        # Parent company
+        if research.get('parent_company_mention'):
+            research['parent_company'] = research['parent_company_mention']
+            research['research_notes'].append(f"Parent company: {research['parent_company_mention']}")
+
+        # Fall back to the group mapping's location count
+        if group and research['actual_locations_found'] == 0:
+            mapped_locations = group['evidence'].get('actual_locations_found', 0)
+            if mapped_locations:
+                research['actual_locations_found'] = mapped_locations
+                research['group_evidence'] = group['holding_company']
+                research['research_notes'].append(
+                    f"Group mapping lists {mapped_locations} restaurants under {group['holding_company']}"
+                )
 
-        # Parent company detected (+20 bonus)
-        if research.get('parent_company') != 'None detected':
-            score += 20
+        # Validate locations match
+        research['locations_match'] = match_locations(
+            trial.get('num_locations', ''), research['actual_locations_found']
+        )
 
-        return min(score, 120)
+        if self.group_index is not None and research['research_status'] == 'Complete':
+            self.group_index.record_research(trial, research)
 
+    def research_for_member(self, research: Dict, trial: Dict) -> Dict:
+        """
+        Fan a cluster representative's research out to another cluster member.
 
-def main():
-    import argparse
+        A member its own row rules out (not a restaurant, test account) gets
+        its own skipped result instead of the representative's findings.
+        """
+        if self.skip_reason(trial):
+            return self.start_research(trial)[0]
+
+        member = dict(research)
+        member['company_name'] = trial.get('company_name', 'Unknown')
+        member['declared_locations'] = trial.get('num_locations', '')
+        member['declared_employees'] = trial.get('employees_per_location', '')
+        member['tier'] = trial.get('tier', '')
+        member['website'] = trial.get('website', '') or research.get('website', '')
+        member['locations_match'] = match_locations(
+            trial.get('num_locations', ''), member['actual_locations_found']
+        )
+        member['research_notes'] = research['research_notes'] + [
+            f"Fanned out from cluster representative {research['company_name']}"
+        ]
+        return member
+
+    def apply_group_evidence(self, research: Dict, group: Dict):
+        """Copy a researched group's location and job evidence onto a trial."""
+        evidence = group['evidence']
+        research['website_accessible'] = evidence.get('website_accessible', False)
+        research['actual_locations_found'] = evidence.get('actual_locations_found', 0)
+        research['job_postings_count'] = evidence.get('job_postings_count', 0)
+        research['group_evidence'] = group['holding_company']
+        if normalize_company_name(group['holding_company']) != normalize_company_name(research['company_name']):
+            research['parent_company'] = group['holding_company']
+
+    def apply_confidence(self, research: Dict):
+        """Set confidence_score and confidence_tier on a research result."""
+        self.confidence.apply(research)
+
+
+def parse_duration(value: str) -> float:
+    """Parse a duration like '30m', '90s', '1.5h' or '45' (seconds) into seconds."""
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([smh]?)\s*', value.lower())
+    if not match:
+        raise ValueError(f"Invalid duration: {value!r} (expected e.g. 90s, 30m, 1h)")
+    amount = float(match.group(1))
+    unit = match.group(2) or 's'
+    return amount * {'s': 1, 'm': 60, 'h': 3600}[unit]
+
+
+class ResearchScheduler:
+    """
+    Feeds trials to the researcher in research-priority order.
+
+    Trials sit in a max-heap keyed by filter_best_trials.score_research_priority
+    (ties keep file order). Iteration stops once the global wall-clock budget is
+    spent; each yielded trial carries a deadline that never exceeds the budget.
+    """
+
+    def __init__(
+        self,
+        trials: List[Dict],
+        budget_seconds: Optional[float] = None,
+        trial_seconds: Optional[float] = None,
+        prioritize: bool = True,
+    ):
+        # Equal keys (prioritize=False) fall back to file order
+        self.heap = [
+            (-score_research_priority(trial) if prioritize else 0, index, trial)
+            for index, trial in enumerate(trials)
+        ]
+        heapq.heapify(self.heap)
+        self.budget_seconds = budget_seconds
+        self.trial_seconds = trial_seconds
+        self.started_at = None
+        self.budget_exhausted = False
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def time_left(self) -> Optional[float]:
+        """Seconds left in the global budget (None if unbounded)."""
+        if self.budget_seconds is None:
+            return None
+        if self.started_at is None:
+            return self.budget_seconds
+        return self.budget_seconds - (time.monotonic() - self.started_at)
+
+    def __iter__(self):
+        """Yield (trial, priority_score, deadline) until the heap or budget runs out."""
+        self.started_at = time.monotonic()
+        while self.heap:
+            remaining = self.time_left()
+            if remaining is not None and remaining <= 0:
+                self.budget_exhausted = True
+                return
+
+            neg_score, _, trial = heapq.heappop(self.heap)
+
+            limits_left = [t for t in (remaining, self.trial_seconds) if t is not None]
+            deadline = time.monotonic() + min(limits_left) if limits_left else None
+
+            yield trial, -neg_score, deadline
+
+
+def drain_queue(researcher: RestaurantResearcher, queue: WorkQueue, worker_id: str,
+                batch_size: int, lease_seconds: float, budget_seconds: Optional[float] = None,
+                trial_seconds: Optional[float] = None,
+                evidence_store: Optional[EvidenceStore] = None) -> int:
+    """Lease batches from the work queue and research them until it is empty or the budget runs out."""
+    started_at = time.monotonic()
+    researched = 0
+    reporter = progress.ProgressReporter(None, f'{worker_id} researched', 'trials')
+
+    while True:
+        if budget_seconds is not None and time.monotonic() - started_at >= budget_seconds:
+            reporter.finish()
+            progress.info(f"\n  ⏹️  Budget exhausted after {researched} trials")
+            return researched
+
+        batch = queue.lease(worker_id, batch_size=batch_size, lease_seconds=lease_seconds)
+        if not batch:
+            reporter.finish()
+            return researched
+
+        for position, (item_id, trial) in enumerate(batch):
+            time_left = None if budget_seconds is None else budget_seconds - (time.monotonic() - started_at)
+            if time_left is not None and time_left <= 0:
+                queue.release([pending_id for pending_id, _ in batch[position:]], worker_id)
+                reporter.finish()
+                progress.info(f"\n  ⏹️  Budget exhausted after {researched} trials")
+                return researched
+
+            limits_left = [t for t in (time_left, trial_seconds) if t is not None]
+            deadline = time.monotonic() + min(limits_left) if limits_left else None
+
+            progress.detail(f"[{worker_id} #{researched + 1}]", end=" ")
+            try:
+                research = researcher.research_trial(trial, deadline=deadline)
+                research['research_priority_score'] = score_research_priority(trial)
+                researcher.apply_confidence(research)
+            except Exception as e:
+                progress.detail(f"  ❌ Research failed: {str(e)[:100]}")
+                queue.fail(item_id, worker_id, str(e))
+                reporter.update('Failed')
+                continue
+
+            if not queue.complete(item_id, worker_id, research):
+                # The lease expired and the trial was requeued (or taken by another worker)
+                progress.detail("  ⚠️  Lease expired before the result was saved; discarded")
+                reporter.update('Lease lost')
+                continue
+            if evidence_store is not None:
+                evidence_store.upsert(trial, research)
+            researched += 1
+            reporter.update(research['confidence_tier'])
+
+
+def _research_in_order(researcher: RestaurantResearcher, scheduled, total: int):
+    """Research scheduled trials one at a time, yielding (trial, priority, research)."""
+    for i, (trial, priority, deadline) in enumerate(scheduled, 1):
+        progress.detail(f"[{i}/{total}] (priority {priority})", end=" ")
+        yield trial, priority, researcher.research_trial(trial, deadline=deadline)
+
+
+def _choose_researchable_representative(researcher: RestaurantResearcher, cluster: Dict):
+    """
+    Make the highest-priority member the researcher won't skip the cluster's
+    representative, so a test account or non-restaurant row never stands in
+    for (and fans its skip out to) researchable members.
+    """
+    if not researcher.skip_reason(cluster['representative']):
+        return
+    researchable = [t for t in cluster['members'] if not researcher.skip_reason(t)]
+    if researchable:
+        representative = max(researchable, key=score_research_priority)
+        cluster['members'] = [cluster['representative']] + [t for t in cluster['members'] if t is not representative]
+        cluster['representative'] = representative
+
+
+def research_trials(researcher: RestaurantResearcher, trials: List[Dict], limit: Optional[int] = None,
+                    budget_seconds: Optional[float] = None, trial_seconds: Optional[float] = None,
+                    prioritize: bool = True, cluster: bool = True,
+                    evidence_store: Optional[EvidenceStore] = None,
+                    pipeline=None) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Research trials in memory: one representative per email/website domain
+    cluster, highest priority first, fanned out to the rest of the cluster.
+
+    With a pipeline (staged_research.StagedResearch), representatives are
+    researched concurrently and handled in completion order.
+
+    `limit` counts researched representatives (clusters), not rows: each
+    representative's cluster members are added to the results on top of it.
+
+    Returns (results, clusters); researched clusters carry their 'research'.
+    """
+    # Research one representative per email/website domain cluster
+    if cluster:
+        clusters = cluster_trials(trials)
+    else:
+        clusters = [{'cluster_id': '', 'domains': [], 'representative': t, 'members': []} for t in trials]
+    for c in clusters:
+        _choose_researchable_representative(researcher, c)
+    cluster_by_trial = {id(c['representative']): c for c in clusters}
+    representatives = [c['representative'] for c in clusters]
+
+    scheduler = ResearchScheduler(
+        representatives,
+        budget_seconds=budget_seconds,
+        trial_seconds=trial_seconds,
+        prioritize=prioritize,
+    )
+
+    total = min(len(representatives), limit) if limit else len(representatives)
+
+    if cluster:
+        progress.info(f"🔗 {len(trials)} trials in {len(clusters)} email/website domain clusters")
+    progress.info(f"📊 Processing {total} trials ({'priority' if prioritize else 'file'} order)")
+    if pipeline is None:
+        progress.info(f"⏱️  Estimated time: {total * 6} seconds ({total * 6 / 60:.1f} minutes)")
+        progress.info(f"   (2 second delay between requests)")
+    else:
+        progress.info(f"⚙️  Staged research: {pipeline.fetchers} fetchers, {pipeline.parsers} parsers "
+              f"({pipeline.limiter.period:g}s between requests per host)")
+    if budget_seconds:
+        progress.info(f"   Budget: {budget_seconds / 60:.1f} minutes")
+    progress.info()
+
+    group_index = researcher.group_index
+    results = []
+    reporter = progress.ProgressReporter(total, 'Researched', 'trials')
 
-    parser = argparse.ArgumentParser(description='Automated trial research')
-    parser.add_argument('--input', default='data/input/first_500_trials.csv', help='Input CSV')
-    parser.add_argument('--output', default='data/output/researched_trials.csv', help='Output CSV')
-    parser.add_argument('--limit', type=int, help='Limit number to research')
-    parser.add_argument('--start', type=int, default=0, help='Start index (for batching)')
+    scheduled = islice(scheduler, total)
+    if pipeline is None:
+        researched = _research_in_order(researcher, scheduled, total)
+    else:
+        researched = pipeline.research(scheduled)
 
-    args = parser.parse_args()
+    for i, (trial, priority, research) in enumerate(researched, 1):
+        cluster_info = cluster_by_trial[id(trial)]
 
-    print("=" * 70)
-    print("AUTOMATED RESTAURANT TRIAL RESEARCHER")
-    print("=" * 70)
-    print()
+        research['research_priority_score'] = priority
+        research['cluster_id'] = cluster_info['cluster_id']
+        research['cluster_size'] = len(cluster_info['members']) + 1
 
-    # Read trials
-    with open(args.input, 'r', encoding='utf-8') as f:
-        trials = list(csv.DictReader(f))
+        # Calculate confidence
+        researcher.apply_confidence(research)
+        results.append(research)
+        cluster_info['research'] = research
+        if evidence_store is not None:
+            evidence_store.upsert(trial, research, commit=False)
+
+        # Fan the representative's findings out to the rest of its cluster
+        for member in cluster_info['members']:
+            member_research = researcher.research_for_member(research, member)
+            member_research['research_priority_score'] = score_research_priority(member)
+            member_research['cluster_id'] = research['cluster_id']
+            member_research['cluster_size'] = research['cluster_size']
+            researcher.apply_confidence(member_research)
+            results.append(member_research)
+            if evidence_store is not None:
+                evidence_store.upsert(member, member_research, commit=False)
+
+        if evidence_store is not None:
+            evidence_store.commit()
+
+        reporter.update(research['confidence_tier'])
 
-    # Apply limits
-    if args.start > 0:
-        trials = trials[args.start:]
+        # Save progress every 10 trials
+        if i % 10 == 0:
+            if group_index is not None:
+                group_index.save()
+            REGISTRY.checkpoint()
 
-    if args.limit:
-        trials = trials[:args.limit]
+    reporter.finish()
 
-    print(f"📊 Processing {len(trials)} trials")
-    print(f"⏱️  Estimated time: {len(trials) * 6} seconds ({len(trials) * 6 / 60:.1f} minutes)")
-    print(f"   (2 second delay between requests)")
-    print()
+    if scheduler.budget_exhausted:
+        progress.info(f"\n  ⏹️  Budget exhausted after {len(results)} trials; {len(scheduler)} left unresearched")
 
-    # Research each trial
-    researcher = RestaurantResearcher()
-    results = []
+    if group_index is not None:
+        group_index.save()
 
-    start_time = time.time()
+    return results, clusters
 
-    for i, trial in enumerate(trials, 1):
-        print(f"[{i}/{len(trials)}]", end=" ")
 
-        research = researcher.research_trial(trial)
+def write_results(results: List[Dict], output_path: str):
+    """Write research results to CSV or Arrow."""
+    write_rows(results, output_path)
 
-        # Calculate confidence
-        confidence_score = researcher.calculate_confidence(research)
-        research['confidence_score'] = confidence_score
-
-        if confidence_score >= 90:
-            research['confidence_tier'] = 'High'
-        elif confidence_score >= 70:
-            research['confidence_tier'] = 'Medium'
-        elif confidence_score >= 50:
-            research['confidence_tier'] = 'Low'
-        else:
-            research['confidence_tier'] = 'Very Low'
 
-        results.append(research)
+def write_cluster_summary(researched_clusters: List[Dict], output_path: str):
+    """Write one row per researched cluster with its representative's findings."""
+    rows = summarize_clusters(researched_clusters)
+    for row, cluster in zip(rows, researched_clusters):
+        row['research_status'] = cluster['research']['research_status']
+        row['actual_locations_found'] = cluster['research']['actual_locations_found']
+        row['job_postings_count'] = cluster['research']['job_postings_count']
+        row['confidence_tier'] = cluster['research']['confidence_tier']
 
-        # Save progress every 10 trials
-        if i % 10 == 0:
-            elapsed = time.time() - start_time
-            remaining = (len(trials) - i) * (elapsed / i)
-            print(f"\n  ⏳ Progress: {i}/{len(trials)} | Elapsed: {elapsed/60:.1f}min | ETA: {remaining/60:.1f}min")
+    with open_text(output_path, 'w') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
 
-    # Write results
-    if results:
-        fieldnames = list(results[0].keys())
-        with open(args.output, 'w', encoding='utf-8', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(results)
 
-    # Summary
-    print()
-    print("=" * 70)
-    print("RESEARCH COMPLETE")
-    print("=" * 70)
+def print_research_summary(results: List[Dict], researched_clusters: List[Dict], clustered: bool = True):
+    """Print processed/skipped counts and the confidence distribution."""
+    progress.info()
+    progress.info("=" * 70)
+    progress.info("RESEARCH COMPLETE")
+    progress.info("=" * 70)
 
     processed = len([r for r in results if r['research_status'] == 'Complete'])
     skipped = len([r for r in results if 'Skipped' in r['research_status']])
@@ -397,16 +826,143 @@ def main():
         tier = r.get('confidence_tier', 'Unknown')
         confidence_counts[tier] = confidence_counts.get(tier, 0) + 1
 
-    print(f"Processed: {processed}")
-    print(f"Skipped: {skipped}")
-    print(f"\nConfidence Distribution:")
+    reused = len([r for r in results if r.get('group_evidence', 'None') != 'None'])
+
+    progress.info(f"Processed: {processed}")
+    progress.info(f"Skipped: {skipped}")
+    progress.info(f"Group evidence reused: {reused}")
+    if clustered:
+        fanned_out = len(results) - len(researched_clusters)
+        progress.info(f"Fanned out from cluster representatives: {fanned_out}")
+    progress.info(f"\nConfidence Distribution:")
     for tier in ['High', 'Medium', 'Low', 'Very Low']:
         count = confidence_counts.get(tier, 0)
         if count > 0:
-            print(f"  {tier}: {count}")
+            progress.info(f"  {tier}: {count}")
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
 
-    print(f"\n📄 Results saved to: {args.output}")
-    print("=" * 70)
+    parser = argparse.ArgumentParser(description='Automated trial research')
+    parser.add_argument('--input', default='data/input/first_500_trials.csv', help='Input CSV')
+    parser.add_argument('--output', default='data/output/researched_trials.csv', help='Output CSV')
+    parser.add_argument('--limit', type=int,
+                        help='Limit number of clusters to research (each representative fans out to its cluster; '
+                             'with --no-cluster, number of trials)')
+    parser.add_argument('--start', type=int, default=0, help='Start index (for batching)')
+    parser.add_argument('--budget', type=parse_duration, help='Global wall-clock budget, e.g. 30m, 90s, 1h')
+    parser.add_argument('--trial-timeout', type=parse_duration, help='Per-trial deadline, e.g. 20s')
+    parser.add_argument('--order', choices=['priority', 'file'], default='priority',
+                        help='Research highest priority first (default) or in file order')
+    parser.add_argument('--group-index', default='data/output/group_index.json',
+                        help='Restaurant group index JSON (seeded from the group mapping results)')
+    parser.add_argument('--no-group-index', action='store_true',
+                        help='Research every trial independently')
+    parser.add_argument('--cluster-summary', default='data/output/research_clusters.csv',
+                        help='Per-cluster summary CSV')
+    parser.add_argument('--no-cluster', action='store_true',
+                        help='Do not cluster trials by business email / website domain')
+    parser.add_argument('--evidence-db', default='data/output/evidence.db',
+                        help='SQLite evidence store updated with every research result')
+    parser.add_argument('--no-evidence-db', action='store_true', help='Only write the output CSV')
+    parser.add_argument('--queue', help='Drain this work queue database instead of reading --input')
+    parser.add_argument('--worker-id', default=default_worker_id(), help='Worker name for queue leases')
+    parser.add_argument('--batch-size', type=int, default=10, help='Trials leased per batch')
+    parser.add_argument('--lease', type=parse_duration, default=600, help='Lease duration, e.g. 10m')
+    parser.add_argument('--weights', help='Confidence weights JSON (see confidence.py)')
+    parser.add_argument('--fetchers', type=int, default=0,
+                        help='Fetch with N threads feeding parser processes (0: one trial at a time)')
+    parser.add_argument('--parsers', type=int, help='Parser processes for --fetchers (default: CPU count)')
+    parser.add_argument('--host-period', type=float, default=2.0,
+                        help='Seconds between requests to one host with --fetchers')
+    add_metrics_arguments(parser)
+    progress.add_progress_arguments(parser)
+
+    args = parser.parse_args(argv)
+    progress.configure(args.progress)
+
+    progress.info("=" * 70)
+    progress.info("AUTOMATED RESTAURANT TRIAL RESEARCHER")
+    progress.info("=" * 70)
+    progress.info()
+
+    start_metrics(args)
+    confidence = ConfidenceEngine.load(args.weights)
+    evidence_store = None if args.no_evidence_db else EvidenceStore(args.evidence_db)
+
+    if args.queue:
+        group_index = None if args.no_group_index else GroupIndex.load(args.group_index)
+        queue = WorkQueue(args.queue)
+        researched = drain_queue(
+            RestaurantResearcher(group_index=group_index, confidence=confidence), queue, args.worker_id,
+            batch_size=args.batch_size, lease_seconds=args.lease,
+            budget_seconds=args.budget, trial_seconds=args.trial_timeout,
+            evidence_store=evidence_store,
+        )
+        if group_index is not None:
+            group_index.save()
+        if evidence_store is not None:
+            evidence_store.close()
+
+        stats = queue.stats()
+        queue.close()
+        progress.info()
+        progress.info(f"✅ {args.worker_id} researched {researched} trials")
+        progress.info(f"Queue: {stats.get('pending', 0)} pending, {stats.get('leased', 0)} leased, "
+              f"{stats.get('done', 0)} done, {stats.get('failed', 0)} failed")
+        progress.info("   Export results with: python work_queue.py export")
+        finish_metrics(args)
+        return
+
+    # Read trials
+    trials = list(read_rows(args.input))
+
+    # Apply limits
+    if args.start > 0:
+        trials = trials[args.start:]
+
+    group_index = None if args.no_group_index else GroupIndex.load(args.group_index)
+    researcher = RestaurantResearcher(group_index=group_index, confidence=confidence)
+
+    pipeline = None
+    if args.fetchers > 0:
+        from staged_research import StagedResearch
+        pipeline = StagedResearch(researcher, fetchers=args.fetchers, parsers=args.parsers,
+                                  host_period=args.host_period)
+
+    results, clusters = research_trials(
+        researcher, trials,
+        limit=args.limit,
+        budget_seconds=args.budget,
+        trial_seconds=args.trial_timeout,
+        prioritize=args.order == 'priority',
+        cluster=not args.no_cluster,
+        evidence_store=evidence_store,
+        pipeline=pipeline,
+    )
+
+    if evidence_store is not None:
+        evidence_store.close()
+
+    # Write results
+    write_results(results, args.output)
+
+    # Per-cluster summary for the clusters that were researched
+    researched_clusters = [c for c in clusters if 'research' in c]
+    if researched_clusters and not args.no_cluster:
+        write_cluster_summary(researched_clusters, args.cluster_summary)
+
+    # Summary
+    print_research_summary(results, researched_clusters, clustered=not args.no_cluster)
+
+    progress.info(f"\n📄 Results saved to: {args.output}")
+    if evidence_store is not None:
+        progress.info(f"🗄️  Evidence stored in: {args.evidence_db} (query with evidence_store.py)")
+    if researched_clusters and not args.no_cluster:
+        progress.info(f"📄 Cluster summary saved to: {args.cluster_summary}")
+    finish_metrics(args)
+    progress.info("=" * 70)
 
 
 if __name__ == '__main__':
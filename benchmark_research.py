@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Research Pipeline Benchmark
+
+Times the staged research pipeline against stored fixture pages
+(examples/fixtures/restaurant_*.html) served locally with a simulated
+network latency. Every trial's website is a separate site on the fixture
+server, so each trial fetches a homepage, a locations page and a careers page.
+
+Configurations:
+- sequential:  one thread, fetch then parse (the researcher's current shape)
+- threads:     N fetcher threads, parsing inline (parsers share the GIL)
+- staged:      N fetcher threads feeding a process pool of parsers
+
+All configurations must produce identical research results; the benchmark
+checks that before reporting throughput.
+
+Usage:
+    python benchmark_research.py --trials 200 --latency 0.05
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+FIXTURES_DIR = Path(__file__).parent / 'examples' / 'fixtures'
+FIXTURE_PAGES = {
+    '': 'restaurant_home.html',
+    'locations': 'restaurant_locations.html',
+    'careers': 'restaurant_careers.html',
+}
+
+
+def start_fixture_server(latency: float) -> ThreadingHTTPServer:
+    """Serve /site<N>/, /site<N>/locations and /site<N>/careers from the fixtures."""
+    pages = {path: (FIXTURES_DIR / name).read_bytes() for path, name in FIXTURE_PAGES.items()}
+
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parts = self.path.strip('/').split('/')
+            body = pages.get(parts[1] if len(parts) > 1 else '')
+            time.sleep(latency)
+            if body is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def fixture_trials(count: int, port: int) -> List[Dict]:
+    return [
+        {
+            'company_name': f'Harbor Grill {i}',
+            'website': f'http://127.0.0.1:{port}/site{i}/',
+            'is_restaurant': 'Yes',
+            'num_locations': '2-5',
+            'tier': 'Tier 2',
+        }
+        for i in range(count)
+    ]
+
+
+def run_config(trials: List[Dict], fetchers: int, parsers: int, host_period: float) -> Dict:
+    """Research every trial with one configuration. Returns timing and results."""
+    from automated_researcher import RestaurantResearcher
+    from staged_research import StagedResearch
+
+    pipeline = StagedResearch(RestaurantResearcher(), fetchers=fetchers, parsers=parsers,
+                              host_period=host_period)
+    started = time.monotonic()
+    results = {}
+    for trial, _, research in pipeline.research((trial, 0, None) for trial in trials):
+        research.pop('research_date', None)
+        results[trial['company_name']] = research
+    seconds = time.monotonic() - started
+    return {'seconds': seconds, 'results': results}
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+    import os
+
+    import progress
+
+    parser = argparse.ArgumentParser(description='Benchmark the staged research pipeline on fixture pages')
+    parser.add_argument('--trials', type=int, default=200, help='Trials (fixture sites) to research')
+    parser.add_argument('--latency', type=float, default=0.05, help='Simulated seconds per page request')
+    parser.add_argument('--fetchers', type=int, default=8, help='Fetcher threads')
+    parser.add_argument('--parsers', type=int, default=os.cpu_count() or 2, help='Parser processes')
+    parser.add_argument('--host-period', type=float, default=0.0,
+                        help='Seconds between requests to one host (fixtures share a host, so 0)')
+
+    args = parser.parse_args(argv)
+    progress.configure('quiet')
+
+    server = start_fixture_server(args.latency)
+    trials = fixture_trials(args.trials, server.server_address[1])
+
+    configs = [
+        ('sequential', 1, 0),
+        ('threads', args.fetchers, 0),
+        ('staged', args.fetchers, args.parsers),
+    ]
+
+    print("=" * 70)
+    print("RESEARCH PIPELINE BENCHMARK")
+    print("=" * 70)
+    print(f"{args.trials} trials x 3 fixture pages, {args.latency * 1000:.0f}ms latency per page")
+    print()
+    print(f"{'Config':<12} {'Fetchers':>8} {'Parsers':>8} {'Seconds':>9} {'Trials/s':>9} {'Speedup':>8}")
+
+    baseline = None
+    for name, fetchers, parsers in configs:
+        run = run_config(trials, fetchers, parsers, args.host_period)
+        if baseline is None:
+            baseline = run
+        elif run['results'] != baseline['results']:
+            print(f"❌ {name} results differ from sequential")
+            server.shutdown()
+            raise SystemExit(1)
+
+        rate = args.trials / run['seconds']
+        speedup = baseline['seconds'] / run['seconds']
+        print(f"{name:<12} {fetchers:>8} {parsers:>8} {run['seconds']:>9.2f} {rate:>9.1f} {speedup:>7.1f}x")
+
+    server.shutdown()
+    print()
+    print("✅ All configurations produced identical research results")
+
+
+if __name__ == '__main__':
+    main()
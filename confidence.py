@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Confidence Scoring Engine
+
+One confidence model for every research result (automated researcher,
+source pipeline, stored results), driven by declarative weights:
+
+- base / cap:   starting score and maximum
+- categories:   points per value of a categorical feature
+- thresholds:   [minimum, points] steps for a count feature (highest step met wins)
+- flags:        points when a boolean feature is set
+- tiers:        [minimum score, tier] steps, plus default_tier below them
+
+Weights can be overridden from a JSON file with the same shape (missing
+keys keep their defaults). score_batch() scores a whole table column by
+column, so stored research can be re-scored with new weights offline:
+
+    python confidence.py rescore --input data/output/researched_trials.csv --weights weights.json
+    python confidence.py rescore --evidence-db data/output/evidence.db --weights weights.json
+"""
+
+import json
+from bisect import bisect_right
+from itertools import repeat
+from operator import add, mul
+from typing import Dict, List, Optional, Tuple
+
+
+DEFAULT_WEIGHTS = {
+    'base': 50,
+    'cap': 120,
+    'categories': {
+        'locations_match': {'Exact': 25, 'Range match': 20, 'Close': 10},
+        'website_quality': {'Professional': 15, 'Basic': 10},
+    },
+    'thresholds': {
+        'job_postings': [[10, 15], [3, 10], [1, 5]],
+        'review_count': [[100, 10], [50, 7], [20, 5]],
+    },
+    'flags': {
+        'parent_company_found': 20,
+    },
+    'tiers': [[90, 'High'], [70, 'Medium'], [50, 'Low']],
+    'default_tier': 'Very Low',
+}
+
+TRUE_VALUES = (True, 'True', 'true', 'Yes', 'yes', '1', 1)
+NO_PARENT = (None, '', 'None detected')
+
+
+def _count(value) -> int:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def match_locations(declared, actual) -> str:
+    """Compare a declared location bucket ('1', '2-5', '16+') with the locations found."""
+    declared = str(declared or '').strip()
+    actual = _count(actual)
+    if actual <= 0:
+        return 'Unknown'
+
+    if declared == str(actual):
+        return 'Exact'
+    elif declared == '2-5' and 2 <= actual <= 5:
+        return 'Range match'
+
+    low = declared.split('-')[0].rstrip('+')
+    if abs(actual - _count(low)) <= 1:
+        return 'Close'
+    return 'Mismatch'
+
+
+def website_quality(research: Dict) -> str:
+    """Professional (locations or careers page), Basic (site only) or None."""
+    quality = research.get('website_quality')
+    if quality in ('Professional', 'Basic'):
+        return quality
+    if research.get('website_accessible') in TRUE_VALUES:
+        if research.get('has_locations_page') in TRUE_VALUES or research.get('has_careers_page') in TRUE_VALUES:
+            return 'Professional'
+        return 'Basic'
+    return 'None'
+
+
+def locations_match(research: Dict) -> str:
+    match = research.get('locations_match')
+    if match in ('Exact', 'Range match', 'Close', 'Mismatch'):
+        return match
+    declared = research.get('declared_locations', '') or research.get('num_locations', '')
+    return match_locations(declared, research.get('actual_locations_found', 0))
+
+
+# Feature name -> extractor from a research result (dict, CSV row or stored JSON)
+FEATURES = {
+    'locations_match': locations_match,
+    'website_quality': website_quality,
+    'job_postings': lambda r: max(_count(r.get('job_postings_count')), _count(r.get('active_job_postings'))),
+    'review_count': lambda r: _count(r.get('review_count')),
+    'parent_company_found': lambda r: r.get('parent_company') not in NO_PARENT,
+}
+
+
+class ConfidenceEngine:
+    """Scores research results from declarative weights."""
+
+    def __init__(self, weights: Optional[Dict] = None):
+        self.weights = json.loads(json.dumps(DEFAULT_WEIGHTS))
+        for key, value in (weights or {}).items():
+            if isinstance(value, dict) and isinstance(self.weights.get(key), dict):
+                self.weights[key].update(value)
+            else:
+                self.weights[key] = value
+
+        for feature in list(self.weights['categories']) + list(self.weights['thresholds']) + list(self.weights['flags']):
+            if feature not in FEATURES:
+                raise ValueError(f"Unknown confidence feature: {feature}")
+
+        # Steps compiled to ascending bounds for bisect
+        self.steps = {}
+        for feature, steps in self.weights['thresholds'].items():
+            steps = sorted(steps)
+            self.steps[feature] = ([bound for bound, _ in steps], [0] + [points for _, points in steps])
+
+        tiers = sorted(self.weights['tiers'])
+        self.tier_bounds = [bound for bound, _ in tiers]
+        self.tier_names = [self.weights['default_tier']] + [name for _, name in tiers]
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> 'ConfidenceEngine':
+        """Engine with weights from a JSON file (defaults if no path)."""
+        if not path:
+            return cls()
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def features(self, results: List[Dict]) -> Dict[str, List]:
+        """Feature columns for a table of research results."""
+        used = set(self.weights['categories']) | set(self.weights['thresholds']) | set(self.weights['flags'])
+        return {feature: list(map(FEATURES[feature], results)) for feature in used}
+
+    def score_columns(self, columns: Dict[str, List], size: int) -> List[int]:
+        """Scores from feature columns, one weight term at a time."""
+        totals = [self.weights['base']] * size
+
+        for feature, points in self.weights['categories'].items():
+            totals = list(map(add, totals, map(points.get, columns[feature], repeat(0))))
+
+        for feature, (bounds, points) in self.steps.items():
+            steps = map(bisect_right, repeat(bounds), columns[feature])
+            totals = list(map(add, totals, map(points.__getitem__, steps)))
+
+        for feature, points in self.weights['flags'].items():
+            totals = list(map(add, totals, map(mul, map(bool, columns[feature]), repeat(points))))
+
+        cap = self.weights['cap']
+        return [min(total, cap) for total in totals]
+
+    def tiers(self, scores: List[int]) -> List[str]:
+        return [self.tier_names[i] for i in map(bisect_right, repeat(self.tier_bounds), scores)]
+
+    def tier(self, score: int) -> str:
+        """Convert a confidence score to its tier."""
+        return self.tier_names[bisect_right(self.tier_bounds, score)]
+
+    def score_batch(self, results: List[Dict]) -> Tuple[List[int], List[str]]:
+        """(scores, tiers) for a whole table of research results."""
+        scores = self.score_columns(self.features(results), len(results))
+        return scores, self.tiers(scores)
+
+    def score(self, research: Dict) -> int:
+        scores, _ = self.score_batch([research])
+        return scores[0]
+
+    def apply_batch(self, results: List[Dict]):
+        """Set confidence_score and confidence_tier on every result."""
+        scores, tiers = self.score_batch(results)
+        for research, score, tier in zip(results, scores, tiers):
+            research['confidence_score'] = score
+            research['confidence_tier'] = tier
+
+    def apply(self, research: Dict):
+        """Set confidence_score and confidence_tier on a research result."""
+        self.apply_batch([research])
+
+
+def tier_counts(results: List[Dict]) -> Dict[str, int]:
+    counts = {}
+    for research in results:
+        tier = research.get('confidence_tier') or 'Unknown'
+        counts[tier] = counts.get(tier, 0) + 1
+    return counts
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+    import time
+
+    from trial_io import read_rows, write_rows
+
+    parser = argparse.ArgumentParser(description='Re-score stored research with confidence weights')
+    parser.add_argument('command', choices=['rescore', 'weights'])
+    parser.add_argument('--weights', help='JSON weights file (defaults if omitted)')
+    parser.add_argument('--input', help='Research results file (CSV or Arrow)')
+    parser.add_argument('--output', help='Where to write re-scored results (default: overwrite --input)')
+    parser.add_argument('--evidence-db', help='Re-score every trial in this evidence store')
+
+    args = parser.parse_args(argv)
+
+    engine = ConfidenceEngine.load(args.weights)
+
+    if args.command == 'weights':
+        print(json.dumps(engine.weights, indent=2))
+        return
+
+    if not args.input and not args.evidence_db:
+        parser.error('rescore needs --input or --evidence-db')
+
+    started = time.time()
+
+    if args.evidence_db:
+        from evidence_store import EvidenceStore
+
+        store = EvidenceStore(args.evidence_db)
+        stored = store.research_results()
+        results = [research for _, research in stored]
+        before = tier_counts(results)
+        engine.apply_batch(results)
+        store.update_confidence(stored)
+        store.close()
+    else:
+        results = list(read_rows(args.input))
+        before = tier_counts(results)
+        engine.apply_batch(results)
+        write_rows(results, args.output or args.input)
+
+    after = tier_counts(results)
+    print(f"✅ Re-scored {len(results)} research results in {time.time() - started:.2f}s")
+    print(f"{'Confidence':<10} {'Before':>8} {'After':>8}")
+    for tier in engine.tier_names[::-1]:
+        print(f"{tier:<10} {before.get(tier, 0):>8} {after.get(tier, 0):>8}")
+
+
+if __name__ == '__main__':
+    main()
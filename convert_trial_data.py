@@ -6,34 +6,30 @@ Convert 7shifts trial export to ICP identification format.
 import csv
 import sys
 from pathlib import Path
+from typing import Dict, List, Optional
 
+import progress
+from trial_io import open_text, write_rows
 
-def convert_trial_data(input_path: Path, output_path: Path, limit: int = None):
-    """Convert 7shifts trial export to our format."""
-
-    print(f"Reading trial data from: {input_path}")
 
-    # Try different encodings
+def read_trial_export(input_path: Path) -> List[Dict]:
+    """Read a 7shifts trial export, trying common encodings."""
     for encoding in ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']:
         try:
-            with open(input_path, 'r', encoding=encoding) as infile:
+            with open_text(input_path, 'r', encoding=encoding) as infile:
                 reader = csv.DictReader(infile)
                 rows = list(reader)
-            print(f"✓ Successfully read file with {encoding} encoding")
-            break
+            progress.info(f"✓ Successfully read file with {encoding} encoding")
+            return rows
         except UnicodeDecodeError:
             continue
-    else:
-        print("Error: Could not decode file with any common encoding")
-        sys.exit(1)
 
-    if limit:
-        rows = rows[:limit]
-        print(f"Processing first {limit} trials")
-    else:
-        print(f"Processing all {len(rows)} trials")
+    print("Error: Could not decode file with any common encoding", file=sys.stderr)
+    sys.exit(1)
 
-    # Convert to our format
+
+def convert_rows(rows: List[Dict]) -> List[Dict]:
+    """Convert 7shifts export rows to our format."""
     converted = []
     for row in rows:
         company_name = row.get('Company / Account', '').strip()
@@ -64,26 +60,48 @@ def convert_trial_data(input_path: Path, output_path: Path, limit: int = None):
 
         notes = '; '.join(notes_parts)
 
-        converted.append({
+        trial = {
             'company_name': company_name,
             'email': email,
             'contact_name': f"{first_name} {last_name}".strip(),
             'notes': notes
-        })
+        }
+        # Enriched exports carry Google place IDs (used by maps_retier.py)
+        if 'location_place_ids' in row:
+            trial['location_place_ids'] = row['location_place_ids'].strip()
+        converted.append(trial)
+
+    return converted
+
+
+def convert_trial_data(input_path: Path, output_path: Path, limit: int = None):
+    """Convert 7shifts trial export to our format."""
+
+    print(f"Reading trial data from: {input_path}")
+
+    rows = read_trial_export(input_path)
+
+    if limit:
+        rows = rows[:limit]
+        print(f"Processing first {limit} trials")
+    else:
+        print(f"Processing all {len(rows)} trials")
+
+    # Convert to our format
+    converted = convert_rows(rows)
 
     # Write output
     print(f"Writing converted data to: {output_path}")
 
-    with open(output_path, 'w', encoding='utf-8', newline='') as outfile:
-        fieldnames = ['company_name', 'email', 'contact_name', 'notes']
-        writer = csv.DictWriter(outfile, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(converted)
+    fieldnames = ['company_name', 'email', 'contact_name', 'notes']
+    if converted and 'location_place_ids' in converted[0]:
+        fieldnames.append('location_place_ids')
+    write_rows(converted, output_path, fieldnames=fieldnames)
 
     print(f"✓ Converted {len(converted)} trials")
 
 
-if __name__ == '__main__':
+def main(argv: Optional[List[str]] = None):
     import argparse
 
     parser = argparse.ArgumentParser(description='Convert 7shifts trial data')
@@ -91,10 +109,14 @@ if __name__ == '__main__':
     parser.add_argument('--output', default='data/input/trials.csv', help='Output CSV')
     parser.add_argument('--limit', type=int, help='Limit number of trials to process')
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     convert_trial_data(
         Path(args.input),
         Path(args.output),
         limit=args.limit
     )
+
+
+if __name__ == '__main__':
+    main()
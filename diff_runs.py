@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Scoring Run Diff
+
+Shows which trials moved between two scoring runs (e.g. before and after a
+keyword list or tier rule change). The two scored outputs are joined on a
+stable key (email + company name by default) with a streaming hash join:
+
+- The file with fewer rows is the build side (--build-side picks one
+  instead): its key and compared columns go into a hash table. The other
+  file is streamed past it (probe side) and never held in memory. Rows are
+  counted by reading both files in step until the shorter one ends, so
+  compressed and Arrow inputs compare by rows, not bytes.
+- If the build side grows past --max-memory-rows, the table and the rest of
+  both files are spilled to disk in hash partitions (a Grace hash join), and
+  the partitions are joined one at a time.
+- Duplicate keys pair up in file order.
+
+Reports tier and restaurant type transition matrices, added and removed
+trials, and writes every changed, added or removed row to --output.
+
+Usage:
+    python diff_runs.py data/output/scored_before.csv data/output/scored_trials.csv
+    python trial_icp.py diff old.csv.gz new.csv.gz --output data/output/tier_changes.csv
+"""
+
+import csv
+import os
+import shutil
+import tempfile
+import time
+import zlib
+from collections import Counter
+from operator import itemgetter
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from trial_io import is_arrow, open_text, read_arrow_table, read_rows
+
+
+DEFAULT_KEY = ['email', 'company_name']
+COMPARE_FIELDS = ['tier', 'restaurant_type', 'num_locations', 'tier_reason']
+# Not compared, but carried along for the changed-rows report
+DISPLAY_FIELDS = ['company_name']
+
+MAX_MEMORY_ROWS = 2000000
+SPILL_PARTITIONS = 64
+
+TIERS = ['Tier 1', 'Tier 2', 'Tier 3', 'Tier 4', 'Tier 5']
+
+Values = Tuple[str, ...]
+
+
+def _check_key_columns(path, columns: List[str], key_fields: List[str]):
+    missing = [field for field in key_fields if field not in columns]
+    if missing:
+        raise ValueError(f"{path} has no key column(s): {', '.join(missing)}")
+
+
+def read_projected(path, key_fields: List[str], fields: List[str]) -> Iterator[Tuple[str, Values]]:
+    """Stream (key, values) pairs: the normalized join key and the selected columns."""
+    if is_arrow(path):
+        _check_key_columns(path, read_arrow_table(path).column_names, key_fields)
+        for row in read_rows(path):
+            key = '\x1f'.join([str(row.get(field) or '') for field in key_fields] + ['']).lower()
+            yield key, tuple(str(row.get(field) or '') for field in fields)
+        return
+
+    with open_text(path) as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        _check_key_columns(path, header, key_fields)
+        index = {name: i for i, name in enumerate(header)}
+
+        # Columns missing from the file read from one past the end (padded with '')
+        width = len(header)
+        get_key = itemgetter(*[index[field] for field in key_fields], width)
+        get_values = itemgetter(*[index.get(field, width) for field in fields])
+        padding = [''] * (width + 1)
+        for row in reader:
+            # Exactly one '' past the header: short rows are padded, cells past the header dropped
+            row = row[:width] + padding[min(len(row), width):]
+            yield '\x1f'.join(get_key(row)).lower(), get_values(row)
+
+
+def _row_markers(path) -> Iterator:
+    """One item per data row (lines for CSV; the row count from Arrow metadata)."""
+    if is_arrow(path):
+        yield from range(read_arrow_table(path).num_rows)
+        return
+    with open_text(path) as f:
+        next(f, None)
+        yield from f
+
+
+def old_has_fewer_rows(old_path, new_path) -> bool:
+    """Whether the old file has no more rows than the new one (reads both only as far as the shorter one)."""
+    old_rows, new_rows = _row_markers(old_path), _row_markers(new_path)
+    try:
+        while True:
+            if next(old_rows, None) is None:
+                return True
+            if next(new_rows, None) is None:
+                return False
+    finally:
+        old_rows.close()
+        new_rows.close()
+
+
+class SpillPartitions:
+    """Build/probe rows hash-partitioned into temporary CSV files."""
+
+    def __init__(self, partitions: int = SPILL_PARTITIONS, directory: Optional[str] = None):
+        self.partitions = partitions
+        self.directory = tempfile.mkdtemp(prefix='diff_runs_', dir=directory)
+        self.files = {}
+        self.writers = {}
+
+    def _writer(self, side: str, partition: int):
+        writer = self.writers.get((side, partition))
+        if writer is None:
+            f = open(os.path.join(self.directory, f'{side}_{partition}.csv'), 'w', encoding='utf-8', newline='')
+            self.files[(side, partition)] = f
+            writer = self.writers[(side, partition)] = csv.writer(f)
+        return writer
+
+    def add(self, side: str, key: str, values: Values):
+        partition = zlib.crc32(key.encode('utf-8')) % self.partitions
+        self._writer(side, partition).writerow((key,) + values)
+
+    def _read(self, side: str, partition: int) -> Iterator[Tuple[str, Values]]:
+        path = os.path.join(self.directory, f'{side}_{partition}.csv')
+        if not os.path.exists(path):
+            return
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.reader(f):
+                yield row[0], tuple(row[1:])
+
+    def pairs(self) -> Iterator[Tuple[Iterator, Iterator]]:
+        """(build rows, probe rows) per partition."""
+        for f in self.files.values():
+            f.close()
+        for partition in range(self.partitions):
+            yield self._read('build', partition), self._read('probe', partition)
+
+    def cleanup(self):
+        for f in self.files.values():
+            f.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def _join_in_memory(table: Dict[str, List[Values]], probe_rows, on_match: Callable,
+                    on_build_only: Callable, on_probe_only: Callable):
+    for key, values in probe_rows:
+        matches = table.get(key)
+        if matches:
+            on_match(key, matches.pop(0), values)
+            if not matches:
+                del table[key]
+        else:
+            on_probe_only(key, values)
+    for key, rest in table.items():
+        for values in rest:
+            on_build_only(key, values)
+
+
+def hash_join(build_rows, probe_rows, on_match: Callable, on_build_only: Callable, on_probe_only: Callable,
+              max_rows: int = MAX_MEMORY_ROWS, spill_dir: Optional[str] = None) -> bool:
+    """
+    Join two (key, values) streams, calling on_match(key, build, probe) per pair.
+
+    Returns True if the build side spilled to disk.
+    """
+    table: Dict[str, List[Values]] = {}
+    size = 0
+    spill = None
+
+    try:
+        for key, values in build_rows:
+            if spill is not None:
+                spill.add('build', key, values)
+                continue
+            table.setdefault(key, []).append(values)
+            size += 1
+            if size > max_rows:
+                spill = SpillPartitions(directory=spill_dir)
+                for spilled_key, rest in table.items():
+                    for spilled in rest:
+                        spill.add('build', spilled_key, spilled)
+                table = {}
+
+        if spill is None:
+            _join_in_memory(table, probe_rows, on_match, on_build_only, on_probe_only)
+            return False
+
+        for key, values in probe_rows:
+            spill.add('probe', key, values)
+        for build_part, probe_part in spill.pairs():
+            part_table: Dict[str, List[Values]] = {}
+            for key, values in build_part:
+                part_table.setdefault(key, []).append(values)
+            _join_in_memory(part_table, probe_part, on_match, on_build_only, on_probe_only)
+        return True
+
+    finally:
+        if spill is not None:
+            spill.cleanup()
+
+
+class RunDiff:
+    """Accumulates transitions between an old and a new run."""
+
+    def __init__(self, fields: List[str], writer=None):
+        self.fields = fields
+        self.tier_index = fields.index('tier')
+        self.type_index = fields.index('restaurant_type')
+        self.compared = [i for i, field in enumerate(fields) if field in COMPARE_FIELDS]
+        self.writer = writer
+        self.tiers: Counter = Counter()
+        self.types: Counter = Counter()
+        self.matched = 0
+        self.changed = 0
+        self.added = 0
+        self.removed = 0
+
+    def match(self, key: str, old: Values, new: Values):
+        self.matched += 1
+        self.tiers[(old[self.tier_index], new[self.tier_index])] += 1
+        self.types[(old[self.type_index], new[self.type_index])] += 1
+        if old == new:
+            return
+        changes = [self.fields[i] for i in self.compared if old[i] != new[i]]
+        if changes:
+            self.changed += 1
+            self._write('changed', changes, old, new)
+
+    def match_reversed(self, key: str, new: Values, old: Values):
+        """match() for a join built from the new run."""
+        self.match(key, old, new)
+
+    def add(self, key: str, new: Values):
+        self.added += 1
+        self._write('added', [], None, new)
+
+    def remove(self, key: str, old: Values):
+        self.removed += 1
+        self._write('removed', [], old, None)
+
+    def _write(self, status: str, changes: List[str], old: Optional[Values], new: Optional[Values]):
+        if self.writer is None:
+            return
+        name = (new or old)[self.fields.index('company_name')]
+        row = [status, name, ','.join(changes)]
+        for i in self.compared:
+            row.append(old[i] if old else '')
+            row.append(new[i] if new else '')
+        self.writer.writerow(row)
+
+    def header(self) -> List[str]:
+        columns = ['status', 'company_name', 'changed_fields']
+        for i in self.compared:
+            columns.extend([f'old_{self.fields[i]}', f'new_{self.fields[i]}'])
+        return columns
+
+
+def _labels(counter: Counter, preferred: List[str]) -> List[str]:
+    seen = {label for pair in counter for label in pair}
+    return [label for label in preferred if label in seen] + sorted(seen - set(preferred))
+
+
+def print_matrix(title: str, counter: Counter, preferred: List[str]):
+    """Old (rows) x new (columns) counts."""
+    labels = _labels(counter, preferred)
+    width = max([len(label or 'none') for label in labels] + [8]) + 1
+
+    print(f"\n{title} (rows: old run, columns: new run)")
+    print(' ' * width + ''.join(f"{(label or 'none')[:width - 1]:>{width}}" for label in labels))
+    for old in labels:
+        cells = ''.join(f"{counter.get((old, new), 0) or '.':>{width}}" for new in labels)
+        print(f"{(old or 'none')[:width - 1]:<{width}}{cells}")
+
+
+def print_diff_summary(diff: RunDiff, seconds: float, spilled: bool):
+    moved = sum(count for (old, new), count in diff.tiers.items() if old != new)
+    retyped = sum(count for (old, new), count in diff.types.items() if old != new)
+
+    print(f"\n{'='*70}")
+    print("SCORING RUN DIFF")
+    print(f"{'='*70}")
+    print(f"Matched trials: {diff.matched}")
+    print(f"  Changed:      {diff.changed}")
+    print(f"  Moved tier:   {moved}")
+    print(f"  Changed type: {retyped}")
+    print(f"Added (new run only):   {diff.added}")
+    print(f"Removed (old run only): {diff.removed}")
+
+    print_matrix('Tier transitions', diff.tiers, TIERS)
+    print_matrix('Restaurant type transitions', diff.types, [])
+
+    print(f"\n⏱️  {seconds:.1f}s{' (spilled to disk)' if spilled else ''}")
+    print(f"{'='*70}")
+
+
+def diff_runs(old_path, new_path, key_fields: List[str], writer=None, max_rows: int = MAX_MEMORY_ROWS,
+              spill_dir: Optional[str] = None, build_side: str = 'auto') -> Tuple[RunDiff, bool]:
+    """Join two scored outputs and collect their differences. Returns (diff, spilled)."""
+    fields = COMPARE_FIELDS + [field for field in DISPLAY_FIELDS if field not in COMPARE_FIELDS]
+    diff = RunDiff(fields, writer)
+    if writer is not None:
+        writer.writerow(diff.header())
+
+    old_rows = read_projected(old_path, key_fields, fields)
+    new_rows = read_projected(new_path, key_fields, fields)
+
+    # Build the hash table from the file with fewer rows (unless told which)
+    if build_side == 'auto':
+        build_side = 'old' if old_has_fewer_rows(old_path, new_path) else 'new'
+    if build_side == 'old':
+        spilled = hash_join(old_rows, new_rows, diff.match, diff.remove, diff.add, max_rows, spill_dir)
+    else:
+        spilled = hash_join(new_rows, old_rows, diff.match_reversed, diff.add, diff.remove, max_rows, spill_dir)
+    return diff, spilled
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description='Diff two scoring runs: tier/type transitions and changed rows')
+    parser.add_argument('old', help='Scored output of the earlier run')
+    parser.add_argument('new', help='Scored output of the later run')
+    parser.add_argument('--key', default=','.join(DEFAULT_KEY),
+                        help=f"Comma-separated join key columns (default: {','.join(DEFAULT_KEY)})")
+    parser.add_argument('--output', default='data/output/run_diff.csv',
+                        help='Changed / added / removed rows (CSV, .csv.gz or .csv.zst)')
+    parser.add_argument('--max-memory-rows', type=int, default=MAX_MEMORY_ROWS,
+                        help='Build-side rows held in memory before spilling to disk')
+    parser.add_argument('--spill-dir', help='Directory for spill partitions (default: system temp)')
+    parser.add_argument('--build-side', choices=['auto', 'old', 'new'], default='auto',
+                        help='Run held in the hash table (default: the one with fewer rows)')
+
+    args = parser.parse_args(argv)
+    key_fields = [field.strip() for field in args.key.split(',') if field.strip()]
+
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    started = time.monotonic()
+    try:
+        with open_text(args.output, 'w') as f:
+            diff, spilled = diff_runs(args.old, args.new, key_fields, csv.writer(f),
+                                      args.max_memory_rows, args.spill_dir, args.build_side)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    print_diff_summary(diff, time.monotonic() - started, spilled)
+    print(f"\n✅ Changed rows saved to: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Domain Classification Index
+
+Classifies email and website domains before anything is fetched:
+
+- free_mail:   consumer email providers (not a business domain)
+- social:      social profiles and link-in-bio pages
+- aggregator:  delivery, ordering, reservation and review platforms
+- parked:      domain parking and for-sale pages
+- owned:       anything else (presumed restaurant-owned, worth fetching)
+
+Small lists are hash sets. Large lists (parked-domain feeds, free-mail lists
+with tens of thousands of entries) are stored as Bloom filters, which take
+about 1.8 bytes per domain at a 0.1% false-positive rate; a false positive
+only means one site is not fetched. Subdomains match their parent domain
+(m.facebook.com is social), except on site builders (SHARED_HOST_SUFFIXES),
+where the subdomain is the restaurant's own site (harborgrill.carrd.co is
+owned, solo.to/harborgrill is a link-in-bio page).
+
+The built-in lists are always loaded; extra lists are precomputed into an
+index file once and loaded once per process:
+
+    python domain_index.py build --list parked:parked_domains.txt --list free_mail:freemail.txt
+    python domain_index.py classify gmail.com https://linktr.ee/harborgrill harborgrill.com
+"""
+
+import base64
+import hashlib
+import json
+import math
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+
+DEFAULT_INDEX_PATH = 'data/domain_index.json'
+
+OWNED = 'owned'
+CATEGORIES = ['free_mail', 'social', 'aggregator', 'parked']
+
+# Lists with at least this many domains are stored as Bloom filters
+BLOOM_THRESHOLD = 10000
+BLOOM_ERROR_RATE = 0.001
+
+FREE_MAIL_DOMAINS = [
+    'gmail.com', 'googlemail.com', 'yahoo.com', 'yahoo.ca', 'ymail.com', 'rocketmail.com',
+    'aol.com', 'outlook.com', 'hotmail.com', 'hotmail.ca', 'live.com', 'live.ca', 'msn.com',
+    'icloud.com', 'me.com', 'mac.com', 'protonmail.com', 'proton.me', 'gmx.com', 'gmx.net',
+    'mail.com', 'zoho.com', 'yandex.com', 'fastmail.com', 'hey.com', 'comcast.net', 'att.net',
+    'verizon.net', 'sbcglobal.net', 'bellsouth.net', 'charter.net', 'cox.net', 'earthlink.net',
+    'optonline.net', 'shaw.ca', 'rogers.com', 'telus.net', 'sympatico.ca', 'btinternet.com',
+]
+
+SOCIAL_DOMAINS = [
+    'facebook.com', 'fb.com', 'fb.me', 'instagram.com', 'twitter.com', 'x.com', 'tiktok.com',
+    'linkedin.com', 'youtube.com', 'pinterest.com', 'threads.net', 'snapchat.com',
+    # Link-in-bio pages
+    'linktr.ee', 'linkin.bio', 'beacons.ai', 'bio.link', 'lnk.bio', 'taplink.cc', 'campsite.bio',
+    'carrd.co', 'solo.to',
+]
+
+# Site builders where the subdomain identifies the restaurant: a subdomain is
+# owned even if the builder's own domain is listed above
+SHARED_HOST_SUFFIXES = [
+    'square.site', 'poi.place', 'wixsite.com', 'squarespace.com',
+    'business.site', 'godaddysites.com', 'myshopify.com', 'wordpress.com',
+    'blogspot.com', 'weebly.com', 'toasttab.com', 'carrd.co', 'solo.to',
+]
+
+AGGREGATOR_DOMAINS = [
+    # Delivery and ordering
+    'doordash.com', 'ubereats.com', 'grubhub.com', 'seamless.com', 'postmates.com',
+    'skipthedishes.com', 'chownow.com', 'slicelife.com', 'menufy.com', 'beyondmenu.com',
+    'order.online', 'ezcater.com', 'caviar.com',
+    # Reservations, reviews and listings
+    'yelp.com', 'tripadvisor.com', 'opentable.com', 'resy.com', 'exploretock.com',
+    'zomato.com', 'foursquare.com', 'allmenus.com', 'menupages.com', 'restaurantji.com',
+    'google.com', 'goo.gl', 'g.page', 'maps.app.goo.gl',
+]
+
+PARKED_DOMAINS = [
+    'sedoparking.com', 'sedo.com', 'parkingcrew.net', 'bodis.com', 'above.com', 'dan.com',
+    'afternic.com', 'hugedomains.com', 'buydomains.com', 'undeveloped.com', 'domainmarket.com',
+    'parklogic.com', 'namebright.com',
+]
+
+CATEGORY_LABELS = {
+    'free_mail': 'free email domain',
+    'social': 'social media or link-in-bio page',
+    'aggregator': 'delivery or listing platform page',
+    'parked': 'parked domain',
+    OWNED: 'restaurant-owned site',
+}
+
+BUILTIN_LISTS = {
+    'free_mail': FREE_MAIL_DOMAINS,
+    'social': SOCIAL_DOMAINS,
+    'aggregator': AGGREGATOR_DOMAINS,
+    'parked': PARKED_DOMAINS,
+}
+
+
+def normalize_domain(value: str) -> str:
+    """Lowercase host of an email address, URL or bare domain, without www."""
+    value = (value or '').strip().lower()
+    if '@' in value and '/' not in value:
+        value = value.rsplit('@', 1)[1]
+    elif '/' in value or ':' in value:
+        if '//' not in value:
+            value = 'https://' + value
+        value = urlparse(value).hostname or ''
+    value = value.rstrip('.')
+    return value[4:] if value.startswith('www.') else value
+
+
+def parent_domains(host: str) -> List[str]:
+    """The host and each parent domain with at least two labels (a.b.c.com -> b.c.com, c.com)."""
+    labels = host.split('.')
+    return ['.'.join(labels[i:]) for i in range(max(len(labels) - 1, 1))]
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on one blake2b digest)."""
+
+    def __init__(self, capacity: int, error_rate: float = BLOOM_ERROR_RATE,
+                 size: Optional[int] = None, hashes: Optional[int] = None, bits: Optional[bytearray] = None):
+        capacity = max(capacity, 1)
+        self.size = size or max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = hashes or max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bits if bits is not None else bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def to_dict(self) -> Dict:
+        return {
+            'size': self.size,
+            'hashes': self.hashes,
+            'count': self.count,
+            'bits': base64.b64encode(bytes(self.bits)).decode('ascii'),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'BloomFilter':
+        bloom = cls(data['count'], size=data['size'], hashes=data['hashes'],
+                    bits=bytearray(base64.b64decode(data['bits'])))
+        bloom.count = data['count']
+        return bloom
+
+
+class DomainIndex:
+    """Domain -> category, from hash sets and Bloom filters."""
+
+    def __init__(self, builtin: bool = True):
+        self.domains: Dict[str, str] = {}
+        self.blooms: List[Tuple[str, BloomFilter]] = []
+        if builtin:
+            for category, domains in BUILTIN_LISTS.items():
+                self.add_list(category, domains)
+
+    def add_list(self, category: str, domains: Iterable[str], bloom_threshold: int = BLOOM_THRESHOLD):
+        """Add a list of domains; large lists become a Bloom filter."""
+        if category not in CATEGORIES:
+            raise ValueError(f"Unknown domain category: {category} (expected one of {', '.join(CATEGORIES)})")
+
+        domains = [domain for domain in map(normalize_domain, domains) if domain]
+        if len(domains) < bloom_threshold:
+            for domain in domains:
+                self.domains.setdefault(domain, category)
+            return
+
+        bloom = BloomFilter(len(domains))
+        for domain in domains:
+            bloom.add(domain)
+        self.blooms.append((category, bloom))
+
+    def classify(self, value: str) -> str:
+        """Category of an email address, URL or domain ('owned' if it's in no list)."""
+        host = normalize_domain(value)
+        if not host:
+            return OWNED
+        if any(host.endswith('.' + suffix) for suffix in SHARED_HOST_SUFFIXES):
+            return OWNED
+
+        candidates = parent_domains(host)
+        for domain in candidates:
+            category = self.domains.get(domain)
+            if category:
+                return category
+        for category, bloom in self.blooms:
+            if any(domain in bloom for domain in candidates):
+                return category
+        return OWNED
+
+    def fetchable(self, url: str) -> bool:
+        """Whether a URL may be a restaurant's own site (worth a fetch)."""
+        return self.classify(url) == OWNED
+
+    def is_free_mail(self, domain: str) -> bool:
+        return self.classify(domain) == 'free_mail'
+
+    def save(self, path: str = DEFAULT_INDEX_PATH):
+        """Write the lists beyond the built-in ones."""
+        builtin = {domain for domains in BUILTIN_LISTS.values() for domain in domains}
+        data = {
+            'domains': {domain: category for domain, category in self.domains.items() if domain not in builtin},
+            'blooms': [{'category': category, **bloom.to_dict()} for category, bloom in self.blooms],
+        }
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_INDEX_PATH) -> 'DomainIndex':
+        """Built-in lists plus the precomputed index file, if there is one."""
+        index = cls()
+        if not Path(path).exists():
+            return index
+
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for domain, category in data.get('domains', {}).items():
+            index.domains.setdefault(domain, category)
+        for bloom in data.get('blooms', []):
+            index.blooms.append((bloom['category'], BloomFilter.from_dict(bloom)))
+        return index
+
+
+_default_index: Optional[DomainIndex] = None
+
+
+def default_index() -> DomainIndex:
+    """The process-wide index, loaded on first use."""
+    global _default_index
+    if _default_index is None:
+        _default_index = DomainIndex.load()
+    return _default_index
+
+
+def read_domain_list(path: str) -> List[str]:
+    """One domain per line; blank lines and # comments are ignored."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.split('#', 1)[0].strip() for line in f if line.split('#', 1)[0].strip()]
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Build or query the domain classification index')
+    parser.add_argument('command', choices=['build', 'classify', 'stats'])
+    parser.add_argument('values', nargs='*', help='Domains, URLs or email addresses to classify')
+    parser.add_argument('--list', action='append', default=[], metavar='CATEGORY:PATH',
+                        help=f"Domain list to add ({', '.join(CATEGORIES)}), one domain per line")
+    parser.add_argument('--index', default=DEFAULT_INDEX_PATH, help='Index file')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        index = DomainIndex.load(args.index)
+        for spec in args.list:
+            category, _, path = spec.partition(':')
+            domains = read_domain_list(path)
+            index.add_list(category, domains)
+            print(f"✓ {len(domains)} {category} domains from: {path}")
+        index.save(args.index)
+        print(f"✅ Index saved to: {args.index}")
+
+    elif args.command == 'classify':
+        index = DomainIndex.load(args.index)
+        for value in args.values:
+            print(f"  {value}: {index.classify(value)}")
+        return
+
+    index = DomainIndex.load(args.index)
+    counts = {}
+    for category in index.domains.values():
+        counts[category] = counts.get(category, 0) + 1
+    print(f"Domain index: {len(index.domains)} domains in hash sets")
+    for category in CATEGORIES:
+        print(f"  {category}: {counts.get(category, 0)}")
+    for category, bloom in index.blooms:
+        print(f"  {category} (Bloom filter): {bloom.count} domains, {len(bloom.bits) // 1024} KB")
+
+
+if __name__ == '__main__':
+    main()
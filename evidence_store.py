@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Research Evidence Store
+
+SQLite store for research results: one row per trial and one row per
+evidence item (source URL, extracted value, timestamp). Trials are indexed
+by company, website domain, email domain and tier, and re-researching a
+trial upserts in place, so reports are indexed queries instead of re-reading
+every past CSV.
+
+Usage:
+    python evidence_store.py report
+    python evidence_store.py company "Wickie's Pub"
+    python evidence_store.py domain wickiespub.com
+    python evidence_store.py tier "Tier 1" --confidence High
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from group_index import email_domain, normalize_company_name, website_domain
+from work_queue import trial_key
+
+
+DEFAULT_STORE_PATH = 'data/output/evidence.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trials (
+    trial_key TEXT PRIMARY KEY,
+    company_name TEXT NOT NULL,
+    company_norm TEXT NOT NULL,
+    domain TEXT,
+    email_domain TEXT,
+    tier TEXT,
+    confidence_score INTEGER,
+    confidence_tier TEXT,
+    research_status TEXT,
+    research_date TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_trials_company ON trials (company_norm);
+CREATE INDEX IF NOT EXISTS idx_trials_domain ON trials (domain);
+CREATE INDEX IF NOT EXISTS idx_trials_email_domain ON trials (email_domain);
+CREATE INDEX IF NOT EXISTS idx_trials_tier ON trials (tier, confidence_tier);
+
+CREATE TABLE IF NOT EXISTS evidence (
+    id INTEGER PRIMARY KEY,
+    trial_key TEXT NOT NULL REFERENCES trials (trial_key) ON DELETE CASCADE,
+    field TEXT NOT NULL,
+    source_url TEXT NOT NULL DEFAULT '',
+    value TEXT,
+    observed_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_evidence_trial ON evidence (trial_key);
+CREATE INDEX IF NOT EXISTS idx_evidence_field ON evidence (field);
+"""
+
+TRIAL_COLUMNS = ['tier', 'confidence_score', 'confidence_tier', 'research_status', 'research_date']
+
+
+def evidence_items(research: Dict) -> List[Tuple[str, str, str]]:
+    """(field, source_url, value) evidence items from a research result."""
+    website = research.get('website') or research.get('website_found') or ''
+    items = []
+
+    if website:
+        items.append(('website_accessible', website, str(bool(research.get('website_accessible', research.get('website_found'))))))
+    if research.get('actual_locations_found'):
+        items.append(('actual_locations_found', research.get('locations_url') or website, str(research['actual_locations_found'])))
+    if research.get('job_postings_count') or research.get('active_job_postings'):
+        postings = research.get('job_postings_count') or research.get('active_job_postings')
+        items.append(('job_postings_count', research.get('careers_url') or research.get('careers_page_url') or website, str(postings)))
+    if research.get('parent_company') not in (None, '', 'None detected'):
+        items.append(('parent_company', website, research['parent_company']))
+    for field in ['google_business_url', 'yelp_url']:
+        if research.get(field):
+            items.append(('review_count', research[field], str(research.get('review_count', 0))))
+
+    notes = research.get('research_notes') or []
+    notes = [notes] if isinstance(notes, str) else notes
+    for note in notes + list(research.get('evidence_found') or []):
+        if note:
+            items.append(('note', '', note))
+
+    return items
+
+
+class EvidenceStore:
+    """Indexed SQLite store of research results and their evidence."""
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA foreign_keys=ON')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def upsert(self, trial: Dict, research: Dict, commit: bool = True) -> str:
+        """Insert or update a trial's research and evidence. Returns the trial key."""
+        key = trial_key(trial)
+        now = datetime.now().isoformat()
+        company = trial.get('company_name') or research.get('company_name', '')
+
+        row = {
+            'trial_key': key,
+            'company_name': company,
+            'company_norm': normalize_company_name(company),
+            'domain': website_domain(trial.get('website') or research.get('website') or research.get('website_found') or ''),
+            'email_domain': email_domain(trial.get('email', '')),
+            'data': json.dumps(research, default=str),
+        }
+        for column in TRIAL_COLUMNS:
+            row[column] = research.get(column, trial.get(column))
+
+        columns = list(row)
+        updates = ', '.join(f'{c} = excluded.{c}' for c in columns if c != 'trial_key')
+        self.conn.execute(
+            f"INSERT INTO trials ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)}) "
+            f"ON CONFLICT (trial_key) DO UPDATE SET {updates}",
+            [row[c] for c in columns],
+        )
+
+        # A new research pass replaces the trial's evidence
+        self.conn.execute('DELETE FROM evidence WHERE trial_key = ?', (key,))
+        self.conn.executemany(
+            'INSERT INTO evidence (trial_key, field, source_url, value, observed_at) VALUES (?, ?, ?, ?, ?)',
+            [(key, field, source_url, value, research.get('research_date') or now)
+             for field, source_url, value in evidence_items(research)],
+        )
+
+        if commit:
+            self.conn.commit()
+        return key
+
+    def commit(self):
+        self.conn.commit()
+
+    def _query(self, where: str, params: Tuple) -> List[Dict]:
+        rows = self.conn.execute(
+            f'SELECT * FROM trials WHERE {where} ORDER BY confidence_score DESC, company_name', params
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def by_company(self, company: str) -> List[Dict]:
+        return self._query('company_norm = ?', (normalize_company_name(company),))
+
+    def by_domain(self, domain: str) -> List[Dict]:
+        domain = website_domain(domain)
+        return self._query('domain = ? OR email_domain = ?', (domain, domain))
+
+    def by_tier(self, tier: str, confidence_tier: Optional[str] = None) -> List[Dict]:
+        if confidence_tier:
+            return self._query('tier = ? AND confidence_tier = ?', (tier, confidence_tier))
+        return self._query('tier = ?', (tier,))
+
+    def evidence_for(self, key: str) -> List[Dict]:
+        rows = self.conn.execute(
+            'SELECT field, source_url, value, observed_at FROM evidence WHERE trial_key = ? ORDER BY field', (key,)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def research_results(self) -> List[Tuple[str, Dict]]:
+        """(trial_key, research result) for every stored trial."""
+        rows = self.conn.execute('SELECT trial_key, data FROM trials').fetchall()
+        return [(row['trial_key'], json.loads(row['data'])) for row in rows]
+
+    def update_confidence(self, results: List[Tuple[str, Dict]]):
+        """Store re-scored confidence for (trial_key, research result) pairs."""
+        self.conn.executemany(
+            'UPDATE trials SET confidence_score = ?, confidence_tier = ?, data = ? WHERE trial_key = ?',
+            [(research.get('confidence_score'), research.get('confidence_tier'),
+              json.dumps(research, default=str), key) for key, research in results],
+        )
+        self.conn.commit()
+
+    def tier_report(self) -> List[Dict]:
+        """Trials per tier and confidence tier."""
+        rows = self.conn.execute(
+            'SELECT tier, confidence_tier, COUNT(*) AS trials, AVG(confidence_score) AS avg_confidence '
+            'FROM trials GROUP BY tier, confidence_tier ORDER BY tier, avg_confidence DESC'
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Query the research evidence store')
+    parser.add_argument('command', choices=['report', 'company', 'domain', 'tier'])
+    parser.add_argument('value', nargs='?', help='Company name, domain or tier')
+    parser.add_argument('--confidence', help='Confidence tier filter (with tier)')
+    parser.add_argument('--store', default=DEFAULT_STORE_PATH, help='Evidence database')
+    parser.add_argument('--evidence', action='store_true', help='Show evidence items for each trial')
+
+    args = parser.parse_args(argv)
+
+    store = EvidenceStore(args.store)
+
+    if args.command == 'report':
+        print(f"{'Tier':<10} {'Confidence':<10} {'Trials':>7} {'Avg score':>10}")
+        for row in store.tier_report():
+            print(f"{row['tier'] or '-':<10} {row['confidence_tier'] or '-':<10} {row['trials']:>7} {row['avg_confidence'] or 0:>10.1f}")
+        store.close()
+        return
+
+    if not args.value:
+        parser.error(f'{args.command} needs a value')
+
+    if args.command == 'company':
+        trials = store.by_company(args.value)
+    elif args.command == 'domain':
+        trials = store.by_domain(args.value)
+    else:
+        trials = store.by_tier(args.value, args.confidence)
+
+    for trial in trials:
+        print(f"{trial['company_name']} ({trial['tier']}) - {trial['confidence_tier']} confidence "
+              f"[{trial['confidence_score']}], {trial['research_status']}, {trial['research_date']}")
+        if args.evidence:
+            for item in store.evidence_for(trial['trial_key']):
+                print(f"    {item['field']}: {item['value']}  {item['source_url']}")
+
+    print(f"\n{len(trials)} trials")
+    store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -6,8 +6,17 @@ Since we don't have website URLs in the trial data, this tool identifies
 the highest-value leads that are worth manual research effort.
 """
 
-import csv
+import heapq
+import re
 from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from domain_index import default_index
+import progress
+from trial_io import read_rows, write_rows
+
+
+EMPLOYEES_PATTERN = re.compile(r'(\d+)\s*employees')
 
 
 def score_research_priority(trial: dict) -> int:
@@ -37,9 +46,8 @@ def score_research_priority(trial: dict) -> int:
     # Professional email domain (+10 points)
     email = trial.get('email', '')
     if email and '@' in email:
-        domain = email.split('@')[1].lower()
-        # Not Gmail/Yahoo/AOL/Outlook
-        if domain not in ['gmail.com', 'yahoo.com', 'aol.com', 'outlook.com', 'hotmail.com']:
+        # Not Gmail/Yahoo/AOL/Outlook/ISP mail
+        if not default_index().is_free_mail(email):
             score += 10
 
     # Has POS system in notes (+5 points)
@@ -57,61 +65,70 @@ def score_research_priority(trial: dict) -> int:
         score += 5
 
     # Has actual employees in notes (look for "X employees" pattern) (+20 points)
-    import re
-    emp_match = re.search(r'(\d+)\s*employees', notes)
+    emp_match = EMPLOYEES_PATTERN.search(notes)
     if emp_match and int(emp_match.group(1)) > 0:
         score += 20
 
     return score
 
 
-def main():
-    import argparse
+def is_researchable(trial: dict) -> bool:
+    """Restaurants only, excluding "your restaurant" test accounts."""
+    if trial.get('is_restaurant') != 'Yes':
+        return False
+    return trial.get('company_name', '').lower() != 'your restaurant'
 
-    parser = argparse.ArgumentParser(description='Filter and prioritize trials for research')
-    parser.add_argument('--input', default='data/input/first_500_trials.csv', help='Input CSV')
-    parser.add_argument('--output', default='data/output/priority_research_queue.csv', help='Output CSV')
-    parser.add_argument('--min-score', type=int, default=30, help='Minimum priority score')
-    parser.add_argument('--limit', type=int, help='Limit number of results')
-
-    args = parser.parse_args()
 
-    print("=" * 70)
-    print("TRIAL RESEARCH PRIORITY FILTER")
-    print("=" * 70)
-    print()
+def select_top_trials(
+    trials: Iterable[Dict],
+    min_score: int = 0,
+    limit: Optional[int] = None,
+) -> Tuple[List[Dict], int]:
+    """
+    Score trials in one streaming pass and keep the best.
 
-    # Read trials
-    with open(args.input, 'r', encoding='utf-8') as f:
-        trials = list(csv.DictReader(f))
+    With a limit, only a bounded min-heap of `limit` trials is held, so
+    selection is O(n log k) time and O(k) memory. Ties keep input order.
+    A limit of 0 or less means no limit.
+    Returns (selected trials highest score first, total trials read).
+    """
+    if limit is not None and limit <= 0:
+        limit = None
 
-    print(f"📊 Total trials: {len(trials)}")
+    heap = []
+    selected = []
+    total = 0
 
-    # Score each trial
-    scored_trials = []
-    for trial in trials:
-        # Skip non-restaurants
-        if trial.get('is_restaurant') != 'Yes':
+    for index, trial in enumerate(trials):
+        total += 1
+        if not is_researchable(trial):
             continue
 
-        # Skip "your restaurant" test accounts
-        if trial.get('company_name', '').lower() == 'your restaurant':
+        score = score_research_priority(trial)
+        if score < min_score:
             continue
 
-        score = score_research_priority(trial)
-        if score >= args.min_score:
-            trial['research_priority_score'] = score
-            scored_trials.append(trial)
+        trial['research_priority_score'] = score
 
-    # Sort by score (highest first)
-    scored_trials.sort(key=lambda x: x['research_priority_score'], reverse=True)
+        if limit is None:
+            selected.append(trial)
+        elif len(heap) < limit:
+            heapq.heappush(heap, (score, -index, trial))
+        elif (score, -index) > heap[0][:2]:
+            heapq.heapreplace(heap, (score, -index, trial))
 
-    # Apply limit
-    if args.limit:
-        scored_trials = scored_trials[:args.limit]
+    if limit is not None:
+        selected = [trial for _, _, trial in sorted(heap, key=lambda item: item[:2], reverse=True)]
+    else:
+        selected.sort(key=lambda x: x['research_priority_score'], reverse=True)
+
+    return selected, total
 
-    print(f"✅ Filtered to {len(scored_trials)} high-priority trials (score >= {args.min_score})")
-    print()
+
+def print_priority_report(scored_trials: List[Dict], min_score: int):
+    """Print tier and score breakdowns and the top 10 leads."""
+    progress.info(f"✅ Filtered to {len(scored_trials)} high-priority trials (score >= {min_score})")
+    progress.info()
 
     # Show tier breakdown
     tier_counts = {}
@@ -119,15 +136,15 @@ def main():
         tier = trial.get('tier', 'Unknown')
         tier_counts[tier] = tier_counts.get(tier, 0) + 1
 
-    print("Tier Breakdown:")
+    progress.info("Tier Breakdown:")
     for tier in ['Tier 1', 'Tier 2', 'Tier 3', 'Tier 4']:
         count = tier_counts.get(tier, 0)
         if count > 0:
-            print(f"  {tier}: {count}")
+            progress.info(f"  {tier}: {count}")
 
     # Show score distribution
-    print()
-    print("Score Distribution:")
+    progress.info()
+    progress.info("Score Distribution:")
     score_ranges = {'80-100': 0, '60-79': 0, '40-59': 0, '30-39': 0}
     for trial in scored_trials:
         score = trial['research_priority_score']
@@ -142,34 +159,55 @@ def main():
 
     for range_name, count in score_ranges.items():
         if count > 0:
-            print(f"  {range_name}: {count}")
+            progress.info(f"  {range_name}: {count}")
 
     # Show top 10
-    print()
-    print("=" * 70)
-    print("TOP 10 PRIORITY LEADS FOR RESEARCH")
-    print("=" * 70)
-    print()
+    progress.info()
+    progress.info("=" * 70)
+    progress.info("TOP 10 PRIORITY LEADS FOR RESEARCH")
+    progress.info("=" * 70)
+    progress.info()
 
     for i, trial in enumerate(scored_trials[:10], 1):
-        print(f"{i}. {trial['company_name']} (Score: {trial['research_priority_score']})")
-        print(f"   Tier: {trial['tier']}")
-        print(f"   Email: {trial.get('email', 'N/A')}")
-        print(f"   Declared: {trial.get('Declared Number of Locations', 'N/A')} locations, {trial.get('Declared Number Of Employees', 'N/A')} employees")
+        progress.info(f"{i}. {trial['company_name']} (Score: {trial['research_priority_score']})")
+        progress.info(f"   Tier: {trial['tier']}")
+        progress.info(f"   Email: {trial.get('email', 'N/A')}")
+        progress.info(f"   Declared: {trial.get('Declared Number of Locations', 'N/A')} locations, {trial.get('Declared Number Of Employees', 'N/A')} employees")
 
         employee_count = trial.get('Employee Count', '0')
         if employee_count and int(employee_count) > 0:
-            print(f"   ⭐ Has {employee_count} actual employees in system")
+            progress.info(f"   ⭐ Has {employee_count} actual employees in system")
+
+        progress.info()
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Filter and prioritize trials for research')
+    parser.add_argument('--input', default='data/input/first_500_trials.csv', help='Input CSV')
+    parser.add_argument('--output', default='data/output/priority_research_queue.csv', help='Output CSV')
+    parser.add_argument('--min-score', type=int, default=30, help='Minimum priority score')
+    parser.add_argument('--limit', type=int, help='Limit number of results (0 = no limit)')
+
+    args = parser.parse_args(argv)
+
+    print("=" * 70)
+    print("TRIAL RESEARCH PRIORITY FILTER")
+    print("=" * 70)
+    print()
+
+    # Read and score trials in one streaming pass
+    scored_trials, total_trials = select_top_trials(
+        read_rows(args.input), min_score=args.min_score, limit=args.limit
+    )
+
+    print(f"📊 Total trials: {total_trials}")
 
-        print()
+    print_priority_report(scored_trials, args.min_score)
 
     # Write output
-    if scored_trials:
-        fieldnames = list(scored_trials[0].keys())
-        with open(args.output, 'w', encoding='utf-8', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(scored_trials)
+    write_rows(scored_trials, args.output)
 
     print("=" * 70)
     print(f"📄 Output saved to: {args.output}")
@@ -1,32 +1,29 @@
 #!/usr/bin/env python3
 """
-Get next 50 restaurant trials (leads 51-100) from all scored trials
+Get next 50 restaurant trials (starting at lead 51) from all scored trials
 and save them for Apify processing.
+
+A cursor next to the scored trials remembers where the last batch ended, so
+each run reads only the next 50 restaurants instead of the whole file.
 """
 
 import csv
 
+from lead_cursor import CSVCursor
+
 def get_next_50_restaurant_trials():
     """Extract next 50 restaurant trials from scored trials"""
 
     input_file = 'data/output/scored_trials.csv'
     output_file = 'data/output/next_50_restaurant_leads.csv'
 
-    with open(input_file, 'r') as f:
-        reader = csv.DictReader(f)
-        all_trials = list(reader)
-
-    # Filter to restaurants only
-    restaurants = [t for t in all_trials if t['is_restaurant'] == 'Yes']
-
-    print(f"📊 Total trials: {len(all_trials)}")
-    print(f"🍽️  Total restaurants: {len(restaurants)}")
-
-    # Get the next 50 (indices 50-99)
-    next_50 = restaurants[50:100] if len(restaurants) >= 100 else restaurants[50:]
+    # First run starts after the first 50 restaurants
+    cursor = CSVCursor(input_file, start=50)
+    first = cursor.position + 1 if cursor.position else 51
+    next_50 = cursor.next_batch(50, predicate=lambda t: t['is_restaurant'] == 'Yes')
 
     print(f"🎯 Extracting next batch: {len(next_50)} restaurants")
-    print(f"   Range: #{51} to #{50 + len(next_50)}")
+    print(f"   Range: #{first} to #{first + len(next_50) - 1}")
 
     # Write to new CSV
     if next_50:
@@ -53,7 +50,7 @@ def get_next_50_restaurant_trials():
                 print(f"  {tier}: {count}")
 
         print("\nFirst 10:")
-        for i, trial in enumerate(next_50[:10], 51):
+        for i, trial in enumerate(next_50[:10], first):
             tier = trial.get('tier', 'Unknown')
             locs = trial.get('num_locations', '?')
             name = trial['company_name']
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Restaurant Group Index
+
+Persistent index of restaurant groups so each group is researched once.
+
+A group is keyed three ways:
+- company:<name>  holding company and member restaurant names (normalized)
+- domain:<host>   restaurant / holding company website domains (own sites
+                  only; social and listing pages are shared by many groups)
+- email:<host>    business email domains of trials that belong to the group
+
+Seeded from data/output/restaurant_group_mapping_results.json and extended
+with every research pass (parent company mentions, websites, email domains),
+so later trials from the same group reuse its location and job evidence.
+"""
+
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from domain_index import OWNED, SHARED_HOST_SUFFIXES, default_index
+
+
+DEFAULT_INDEX_PATH = 'data/output/group_index.json'
+DEFAULT_MAPPING_PATH = 'data/output/restaurant_group_mapping_results.json'
+
+
+# Second-level suffixes that need three labels for the registered domain
+MULTI_PART_TLDS = ['co.uk', 'com.au', 'co.nz', 'com.mx', 'org.uk']
+
+COMPANY_SUFFIX_PATTERN = re.compile(
+    r'\b(llc|inc|ltd|corp|corporation|co|company|group|grp|hospitality|holdings|enterprises)\b\.?'
+)
+EMPTY_VALUES = {'', 'n/a', 'none detected', 'unknown'}
+
+
+def normalize_company_name(name: str) -> str:
+    """Lowercase, drop parentheticals, punctuation and legal/group suffixes."""
+    text = (name or '').lower()
+    if text.strip() in EMPTY_VALUES:
+        return ''
+    text = re.sub(r'\(.*?\)', ' ', text)
+    text = re.sub(r"['’]", '', text)
+    text = text.replace('&', ' and ')
+    text = re.sub(r'[^a-z0-9\s]', ' ', text)
+    text = COMPANY_SUFFIX_PATTERN.sub(' ', text)
+    return ' '.join(text.split())
+
+
+def website_domain(url: str) -> str:
+    """Registered domain of a website URL ('' for missing or N/A values)."""
+    if not url or url.strip().lower() in EMPTY_VALUES:
+        return ''
+
+    if '//' not in url:
+        url = 'https://' + url
+
+    host = (urlparse(url.strip()).hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+
+    for suffix in SHARED_HOST_SUFFIXES:
+        if host.endswith('.' + suffix):
+            return host
+
+    labels = host.split('.')
+    keep = 3 if any(host.endswith('.' + tld) for tld in MULTI_PART_TLDS) else 2
+    return '.'.join(labels[-keep:])
+
+
+def owned_domain(url: str) -> str:
+    """website_domain() of a restaurant's own site ('' for social, listing and parked pages)."""
+    domain = website_domain(url)
+    return domain if domain and default_index().classify(domain) == OWNED else ''
+
+
+def email_domain(email: str) -> str:
+    """Business email domain ('' for free-mail or malformed addresses)."""
+    if not email or '@' not in email:
+        return ''
+    domain = email.rsplit('@', 1)[1].strip().lower()
+    return '' if default_index().is_free_mail(domain) else domain
+
+
+class GroupIndex:
+    """Holding-company / domain / email-domain index over restaurant groups."""
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH):
+        self.path = Path(path)
+        self.groups: Dict[str, Dict] = {}
+        self.keys: Dict[str, str] = {}
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_INDEX_PATH, mapping_path: Optional[str] = DEFAULT_MAPPING_PATH) -> 'GroupIndex':
+        """Load the index from disk, seeding it from the mapping results on first use."""
+        index = cls(path)
+
+        if index.path.exists():
+            with open(index.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            index.groups = data.get('groups', {})
+            index.keys = data.get('keys', {})
+        elif mapping_path and Path(mapping_path).exists():
+            index.load_mapping_results(mapping_path)
+
+        return index
+
+    def save(self):
+        """Write the index to disk."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'groups': self.groups, 'keys': self.keys}, f, indent=2)
+        tmp_path.replace(self.path)
+
+    def load_mapping_results(self, mapping_path: str) -> int:
+        """Add groups from restaurant_group_mapping_results.json. Returns groups added."""
+        with open(mapping_path, 'r', encoding='utf-8') as f:
+            mappings = json.load(f)
+
+        groups_before = len(self.groups)
+        for entry in mappings:
+            holding = entry.get('holding_company', '')
+            group_name = holding if normalize_company_name(holding) else entry.get('restaurant_name', '')
+
+            restaurants = [entry.get('restaurant_name', '')] + entry.get('sister_child_restaurants', [])
+            restaurants = [r for r in dict.fromkeys(restaurants) if normalize_company_name(r)]
+
+            websites = [entry.get('restaurant_website', ''), entry.get('holding_website', '')]
+            # Sister links with a path are usually directory/listing pages, not the restaurant's own site
+            websites += [
+                url for url in entry.get('sister_child_restaurants_websites', [])
+                if urlparse(url).path in ('', '/')
+            ]
+
+            group_id = self.add_group(group_name, restaurants=restaurants, websites=websites)
+            group = self.groups[group_id]
+            group['evidence'].setdefault('actual_locations_found', 0)
+            group['evidence']['actual_locations_found'] = max(
+                group['evidence']['actual_locations_found'], len(group['restaurants'])
+            )
+            group['evidence'].setdefault('source', 'restaurant_group_mapping_results')
+
+        return len(self.groups) - groups_before
+
+    def find_group(self, company: str = '', website: str = '', email: str = '') -> Optional[str]:
+        """Return the group id matching any of the given keys."""
+        candidates = [
+            ('company', normalize_company_name(company)),
+            ('domain', owned_domain(website)),
+            ('email', email_domain(email)),
+        ]
+        for kind, value in candidates:
+            if value and f'{kind}:{value}' in self.keys:
+                return self.keys[f'{kind}:{value}']
+        return None
+
+    def lookup(self, trial: Dict) -> Optional[Dict]:
+        """Return the group a trial belongs to, if known."""
+        group_id = self.find_group(
+            company=trial.get('company_name', ''),
+            website=trial.get('website', ''),
+            email=trial.get('email', ''),
+        )
+        return self.groups.get(group_id) if group_id else None
+
+    def add_group(
+        self,
+        name: str,
+        restaurants: Optional[List[str]] = None,
+        websites: Optional[List[str]] = None,
+        emails: Optional[List[str]] = None,
+    ) -> str:
+        """Create or extend a group and register its keys. Returns the group id."""
+        restaurants = restaurants or []
+        websites = websites or []
+        emails = emails or []
+
+        group_id = self._existing_group([name] + restaurants, websites, emails) or normalize_company_name(name)
+
+        group = self.groups.setdefault(group_id, {
+            'holding_company': name,
+            'restaurants': [],
+            'domains': [],
+            'email_domains': [],
+            'evidence': {},
+        })
+
+        for restaurant in restaurants:
+            if restaurant not in group['restaurants']:
+                group['restaurants'].append(restaurant)
+            self._register('company', normalize_company_name(restaurant), group_id)
+        self._register('company', normalize_company_name(name), group_id)
+
+        # Facebook pages and delivery listings are shared by unrelated restaurants
+        for url in websites:
+            domain = owned_domain(url)
+            if domain and domain not in group['domains']:
+                group['domains'].append(domain)
+            self._register('domain', domain, group_id)
+
+        for email in emails:
+            domain = email_domain(email)
+            if domain and domain not in group['email_domains']:
+                group['email_domains'].append(domain)
+            self._register('email', domain, group_id)
+
+        return group_id
+
+    def record_research(self, trial: Dict, research: Dict) -> Optional[str]:
+        """Store a finished research pass as its group's evidence."""
+        parent = research.get('parent_company', 'None detected')
+        company = trial.get('company_name', '')
+        name = parent if normalize_company_name(parent) else company
+        if not normalize_company_name(name):
+            return None
+
+        group_id = self.add_group(
+            name,
+            restaurants=[company],
+            websites=[trial.get('website', '')],
+            emails=[trial.get('email', '')],
+        )
+
+        evidence = self.groups[group_id]['evidence']
+        evidence['actual_locations_found'] = max(
+            evidence.get('actual_locations_found', 0), research.get('actual_locations_found', 0)
+        )
+        evidence['job_postings_count'] = max(
+            evidence.get('job_postings_count', 0), research.get('job_postings_count', 0)
+        )
+        evidence['website_accessible'] = evidence.get('website_accessible', False) or research.get('website_accessible', False)
+        evidence['researched_at'] = research.get('research_date', datetime.now().isoformat())
+        evidence['researched_company'] = company
+        evidence['source'] = 'research'
+
+        return group_id
+
+    def _existing_group(self, companies: List[str], websites: List[str], emails: List[str]) -> Optional[str]:
+        for company in companies:
+            group_id = self.find_group(company=company)
+            if group_id:
+                return group_id
+        for url in websites:
+            group_id = self.find_group(website=url)
+            if group_id:
+                return group_id
+        for email in emails:
+            group_id = self.find_group(email=email)
+            if group_id:
+                return group_id
+        return None
+
+    def _register(self, kind: str, value: str, group_id: str):
+        # First group to claim a key keeps it
+        if value:
+            self.keys.setdefault(f'{kind}:{value}', group_id)
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Build the restaurant group index')
+    parser.add_argument('--mapping', default=DEFAULT_MAPPING_PATH, help='Group mapping results JSON')
+    parser.add_argument('--index', default=DEFAULT_INDEX_PATH, help='Group index JSON')
+
+    args = parser.parse_args(argv)
+
+    index = GroupIndex.load(args.index, mapping_path=None)
+    added = index.load_mapping_results(args.mapping)
+    index.save()
+
+    multi = [g for g in index.groups.values() if len(g['restaurants']) > 1]
+
+    print(f"✅ Indexed {len(index.groups)} groups ({added} new) with {len(index.keys)} keys")
+    print(f"🏢 Multi-restaurant groups: {len(multi)}")
+    for group in sorted(multi, key=lambda g: len(g['restaurants']), reverse=True)[:10]:
+        print(f"  {group['holding_company']}: {len(group['restaurants'])} restaurants")
+    print(f"📄 Index saved to: {args.index}")
+
+
+if __name__ == '__main__':
+    main()
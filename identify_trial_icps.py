@@ -4,7 +4,6 @@ Trial ICP Identification Tool
 Identifies and scores restaurant trial customers based on 7shifts ICP criteria.
 """
 
-import csv
 import sys
 import argparse
 import re
@@ -12,6 +11,16 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import time
 
+from entity_resolution import DEFAULT_ID_MAP_PATH, EntityResolver
+from metrics import REGISTRY, add_metrics_arguments, finish_metrics, start_metrics
+import progress
+from trial_io import read_rows
+from trial_record import TrialRecord, write_records, write_tier_shards
+
+
+ROWS_SCORED = REGISTRY.counter('trial_icp_rows_scored', 'Trial rows scored by tier', ('tier',))
+SCORE_SECONDS = REGISTRY.counter('trial_icp_score_seconds', 'Time spent scoring trial rows')
+
 
 class RestaurantIdentifier:
     """Identifies if a company is a restaurant and gathers details."""
@@ -207,28 +216,22 @@ class TierScorer:
 class TrialICPProcessor:
     """Main processor for trial ICP identification."""
 
-    def __init__(self):
+    def __init__(self, entity_map: Optional[str] = None):
         self.restaurant_id = RestaurantIdentifier()
         self.location_counter = LocationCounter()
         self.employee_estimator = EmployeeEstimator()
         self.tier_scorer = TierScorer()
+        # With an entity map, entity ids stay the same across runs
+        self.entity_resolver = EntityResolver(id_map_path=entity_map)
 
-    def process_trial(self, row: Dict[str, str]) -> Dict[str, str]:
-        """Process a single trial company and return enriched data."""
+    def score_trial(self, row: Dict[str, str]) -> TrialRecord:
+        """Score a single trial company."""
         company_name = row.get('company_name', '')
         website = row.get('website', '')
 
-        # Start with input data
-        result = row.copy()
-
         # Check if restaurant
-        is_restaurant = self.restaurant_id.is_restaurant(company_name, website)
-        result['is_restaurant'] = 'Yes' if is_restaurant else 'No'
-
-        if not is_restaurant:
-            result['tier'] = 'Tier 5'
-            result['tier_reason'] = 'Neutral: Non-restaurant business'
-            return result
+        if not self.restaurant_id.is_restaurant(company_name, website):
+            return TrialRecord(row, False, 'Tier 5', 'Neutral: Non-restaurant business')
 
         # Gather restaurant details (will be enhanced with research)
         notes = row.get('notes', '')
@@ -243,67 +246,91 @@ class TrialICPProcessor:
             restaurant_type, num_locations, employees_per_loc
         )
 
-        # Populate result
-        result['restaurant_type'] = restaurant_type
-        result['num_locations'] = num_locations
-        result['employees_per_location'] = str(employees_per_loc)
-        result['tier'] = tier
-        result['tier_reason'] = tier_reason
-        result['research_notes'] = 'Automated analysis - manual research recommended'
-
-        return result
+        return TrialRecord(
+            row, True, tier, tier_reason,
+            restaurant_type=restaurant_type,
+            num_locations=num_locations,
+            employees=employees_per_loc,
+        )
 
-    def process_file(self, input_path: Path, output_path: Path):
-        """Process entire CSV file of trials."""
-        print(f"Reading trials from: {input_path}")
+    def process_trial(self, row: Dict[str, str]) -> Dict[str, str]:
+        """Process a single trial company and return enriched data."""
+        return self.score_trial(row).to_dict()
 
-        with open(input_path, 'r', encoding='utf-8') as infile:
-            reader = csv.DictReader(infile)
-            rows = list(reader)
+    def process_rows(self, rows: List[Dict[str, str]]) -> List[TrialRecord]:
+        """Score trial rows in memory, tagging each with its entity_id."""
+        started = time.monotonic()
+        reporter = progress.ProgressReporter(len(rows), 'Scored', 'trials')
 
-        print(f"Processing {len(rows)} trial companies...")
+        # Fuzzy-dedupe company names into stable entity ids
+        entity_ids = self.entity_resolver.assign([row.get('company_name', '') for row in rows])
+        self.entity_resolver.save()
 
+        show_rows = progress.interactive()
         results = []
-        restaurants_found = 0
-
         for i, row in enumerate(rows, 1):
-            result = self.process_trial(row)
-            results.append(result)
+            record = self.score_trial(row)
+            record.entity_id = entity_ids[i - 1]
+            results.append(record)
+            reporter.update(record.tier)
 
-            if result['is_restaurant'] == 'Yes':
-                restaurants_found += 1
-                print(f"  [{i}/{len(rows)}] {row.get('company_name', 'Unknown')} -> {result['tier']}")
+            if show_rows and record.restaurant:
+                print(f"  [{i}/{len(rows)}] {row.get('company_name', 'Unknown')} -> {record.tier}")
 
-        # Write results
-        print(f"\nWriting results to: {output_path}")
+        reporter.finish()
 
-        if results:
-            fieldnames = list(results[0].keys())
-            with open(output_path, 'w', encoding='utf-8', newline='') as outfile:
-                writer = csv.DictWriter(outfile, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(results)
+        # Recorded once per batch so metrics stay off the per-row path
+        for tier, count in reporter.counts.items():
+            ROWS_SCORED.inc(tier, amount=count)
+        SCORE_SECONDS.inc(amount=time.monotonic() - started)
 
-        # Summary
+        return results
+
+    def print_summary(self, results: List[TrialRecord]):
+        """Print restaurant, entity and tier counts for scored trials."""
         tier_counts = {}
         for result in results:
-            tier = result.get('tier', 'Unknown')
-            tier_counts[tier] = tier_counts.get(tier, 0) + 1
-
-        print(f"\n{'='*60}")
-        print(f"SUMMARY")
-        print(f"{'='*60}")
-        print(f"Total trials processed: {len(rows)}")
-        print(f"Restaurants identified: {restaurants_found}")
-        print(f"\nTier Distribution:")
+            tier_counts[result.tier] = tier_counts.get(result.tier, 0) + 1
+
+        restaurants_found = sum(1 for result in results if result.restaurant)
+        entities = set(result.entity_id for result in results if result.entity_id)
+
+        progress.info(f"\n{'='*60}")
+        progress.info(f"SUMMARY")
+        progress.info(f"{'='*60}")
+        progress.info(f"Total trials processed: {len(results)}")
+        progress.info(f"Restaurants identified: {restaurants_found}")
+        progress.info(f"Distinct companies (entity_id): {len(entities)}")
+        progress.info(f"\nTier Distribution:")
         for tier in ['Tier 1', 'Tier 2', 'Tier 3', 'Tier 4', 'Tier 5']:
             count = tier_counts.get(tier, 0)
             if count > 0:
-                print(f"  {tier}: {count}")
-        print(f"{'='*60}")
+                progress.info(f"  {tier}: {count}")
+        progress.info(f"{'='*60}")
+
+    def process_file(self, input_path: Path, output_path: Path, shard_dir: Optional[Path] = None,
+                     shard_suffix: str = '.csv.gz'):
+        """Process entire CSV file of trials, optionally also writing per-tier shards."""
+        progress.info(f"Reading trials from: {input_path}")
+
+        rows = list(read_rows(input_path))
+
+        progress.info(f"Processing {len(rows)} trial companies...")
 
+        results = self.process_rows(rows)
 
-def main():
+        # Write results
+        progress.info(f"\nWriting results to: {output_path}")
+
+        write_records(results, output_path)
+        if shard_dir:
+            shards = write_tier_shards(results, shard_dir, shard_suffix)
+            progress.info(f"Wrote {len(shards)} tier shards to: {shard_dir}")
+
+        self.print_summary(results)
+
+
+def main(argv: Optional[List[str]] = None):
     parser = argparse.ArgumentParser(
         description='Identify and score restaurant trial customers'
     )
@@ -311,16 +338,42 @@ def main():
         '--input',
         type=str,
         default='data/input/trials.csv',
-        help='Input CSV file with trial companies'
+        help='Input CSV file with trial companies (may be .csv.gz / .csv.zst)'
     )
     parser.add_argument(
         '--output',
         type=str,
         default='data/output/scored_trials.csv',
-        help='Output CSV file for scored results'
+        help='Output file for scored results (.csv, .csv.gz, .csv.zst or .arrow)'
+    )
+    parser.add_argument(
+        '--shard-dir',
+        type=str,
+        help='Also write the scored output partitioned by tier into this directory'
     )
+    parser.add_argument(
+        '--shard-format',
+        choices=['csv.gz', 'csv.zst', 'csv', 'arrow'],
+        default='csv.gz',
+        help='Tier shard format (default: csv.gz)'
+    )
+    parser.add_argument(
+        '--entity-map',
+        type=str,
+        default=DEFAULT_ID_MAP_PATH,
+        help='Company name -> entity_id map kept across runs, so entity ids stay stable'
+    )
+    parser.add_argument(
+        '--no-entity-map',
+        action='store_true',
+        help='Assign entity ids from this input alone'
+    )
+
+    add_metrics_arguments(parser)
+    progress.add_progress_arguments(parser)
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    progress.configure(args.progress)
 
     input_path = Path(args.input)
     output_path = Path(args.output)
@@ -329,12 +382,15 @@ def main():
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     if not input_path.exists():
-        print(f"Error: Input file not found: {input_path}")
+        print(f"Error: Input file not found: {input_path}", file=sys.stderr)
         sys.exit(1)
 
     # Process trials
-    processor = TrialICPProcessor()
-    processor.process_file(input_path, output_path)
+    start_metrics(args)
+    processor = TrialICPProcessor(entity_map=None if args.no_entity_map else args.entity_map)
+    processor.process_file(input_path, output_path,
+                           Path(args.shard_dir) if args.shard_dir else None, '.' + args.shard_format)
+    finish_metrics(args)
 
 
 if __name__ == '__main__':
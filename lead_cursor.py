@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Persistent CSV Cursor
+
+Remembers how far into a lead file (e.g. the priority research queue) we
+have handed out leads, as a file offset. "Give me the next N leads" then
+seeks straight to the offset and reads N rows instead of re-reading and
+re-slicing the whole CSV.
+
+The cursor resets automatically when the lead file is rewritten.
+"""
+
+import csv
+import json
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+def _lines(f) -> Iterator[str]:
+    # readline() (unlike iterating the file) keeps f.tell() usable
+    while True:
+        line = f.readline()
+        if not line:
+            return
+        yield line
+
+
+class CSVCursor:
+    """Byte-offset cursor over a CSV file, persisted as JSON next to it."""
+
+    def __init__(self, path: str, cursor_path: Optional[str] = None, start: int = 0):
+        self.path = Path(path)
+        self.cursor_path = Path(cursor_path) if cursor_path else self.path.with_suffix('.cursor.json')
+        self.start = start
+        self.state = self._load_state()
+
+    @property
+    def position(self) -> int:
+        """Number of rows handed out so far."""
+        return self.state['position']
+
+    def _file_signature(self) -> Dict:
+        stat = self.path.stat()
+        return {'size': stat.st_size, 'mtime': stat.st_mtime}
+
+    def _load_state(self) -> Dict:
+        if self.cursor_path.exists():
+            with open(self.cursor_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('file') == self._file_signature():
+                return state
+        return {'file': self._file_signature(), 'offset': None, 'position': 0}
+
+    def save(self):
+        """Persist the cursor."""
+        with open(self.cursor_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2)
+
+    def reset(self):
+        """Start again from the beginning (plus the configured start row)."""
+        self.state = {'file': self._file_signature(), 'offset': None, 'position': 0}
+        self.save()
+
+    def next_batch(self, size: int, predicate: Optional[Callable[[Dict], bool]] = None) -> List[Dict]:
+        """
+        Read the next `size` rows (matching `predicate`, if given) and advance the cursor.
+
+        Reads only the rows between the saved offset and the end of the batch.
+        """
+        batch = []
+
+        with open(self.path, 'r', encoding='utf-8', newline='') as f:
+            header_line = f.readline()
+            if not header_line:
+                return batch
+            header = next(csv.reader([header_line]))
+
+            first_read = self.state['offset'] is None
+            if not first_read:
+                f.seek(self.state['offset'])
+
+            reader = csv.DictReader(_lines(f), fieldnames=header)
+            skip = self.start if first_read else 0
+
+            while len(batch) < size:
+                try:
+                    row = next(reader)
+                except StopIteration:
+                    break
+
+                if predicate and not predicate(row):
+                    continue
+
+                self.state['position'] += 1
+                if skip:
+                    skip -= 1
+                    continue
+
+                batch.append(row)
+
+            self.state['offset'] = f.tell()
+
+        self.save()
+        return batch
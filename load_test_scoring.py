@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Scoring Service Load Test
+
+Drives a scoring service on localhost (scoring_service.py) with concurrent
+keep-alive clients and reports latency percentiles as seen by the client,
+next to the service's own /stats:
+
+- single:  one POST /score per trial
+- batch:   POST /score/batch with --batch-size trials per request
+
+Trials are the rows of examples/sample_input.csv, cycled with unique names.
+Without --url the service is started as a subprocess on a free port and
+stopped afterwards.
+
+Usage:
+    python load_test_scoring.py --requests 20000 --concurrency 4 --batch-size 100
+    python load_test_scoring.py --url http://127.0.0.1:8765
+"""
+
+import http.client
+import json
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from trial_io import read_rows
+
+
+SAMPLE_INPUT = Path(__file__).parent / 'examples' / 'sample_input.csv'
+
+
+def sample_trials(count: int) -> List[Dict]:
+    rows = list(read_rows(SAMPLE_INPUT))
+    return [dict(rows[i % len(rows)], company_name=f"{rows[i % len(rows)]['company_name']} {i}")
+            for i in range(count)]
+
+
+def percentiles(samples: List[float]) -> Dict:
+    samples = sorted(samples)
+
+    def at(p: float) -> float:
+        return samples[min(len(samples) - 1, int(p * len(samples)))] * 1000
+
+    return {'p50_ms': at(0.50), 'p90_ms': at(0.90), 'p99_ms': at(0.99), 'max_ms': samples[-1] * 1000}
+
+
+def start_service(workers: int) -> Tuple[subprocess.Popen, str]:
+    """Run scoring_service.py on a free local port; returns (process, base URL)."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+
+    process = subprocess.Popen(
+        [sys.executable, str(Path(__file__).parent / 'scoring_service.py'),
+         '--port', str(port), '--workers', str(workers)],
+        stdout=subprocess.DEVNULL,
+    )
+    url = f'http://127.0.0.1:{port}'
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/health')
+            if connection.getresponse().status == 200:
+                connection.close()
+                return process, url
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError('Scoring service did not start')
+
+
+def run_phase(url: str, path: str, bodies: List[bytes], concurrency: int) -> Dict:
+    """POST every body (split across `concurrency` keep-alive clients). Returns latencies and wall time."""
+    target = urlparse(url)
+    latencies: List[float] = []
+    errors: List[str] = []
+    lock = threading.Lock()
+
+    def client(chunk: List[bytes]):
+        connection = http.client.HTTPConnection(target.hostname, target.port, timeout=30)
+        mine = []
+        try:
+            for body in chunk:
+                started = time.perf_counter()
+                connection.request('POST', path, body, {'Content-Type': 'application/json'})
+                response = connection.getresponse()
+                response.read()
+                mine.append(time.perf_counter() - started)
+                if response.status != 200:
+                    with lock:
+                        errors.append(f'HTTP {response.status}')
+        except OSError as e:
+            with lock:
+                errors.append(str(e))
+        finally:
+            connection.close()
+            with lock:
+                latencies.extend(mine)
+
+    threads = [threading.Thread(target=client, args=(bodies[i::concurrency],)) for i in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {'latencies': latencies, 'seconds': time.perf_counter() - started, 'errors': errors}
+
+
+def get_json(url: str, path: str) -> Dict:
+    target = urlparse(url)
+    connection = http.client.HTTPConnection(target.hostname, target.port, timeout=10)
+    connection.request('GET', path)
+    data = json.loads(connection.getresponse().read())
+    connection.close()
+    return data
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Load-test the local scoring service')
+    parser.add_argument('--url', help='Running service (default: start one on a free port)')
+    parser.add_argument('--requests', type=int, default=20000, help='Single-trial requests')
+    parser.add_argument('--batches', type=int, default=200, help='Batch requests')
+    parser.add_argument('--batch-size', type=int, default=100, help='Trials per batch request')
+    parser.add_argument('--concurrency', type=int, default=4, help='Concurrent keep-alive clients')
+    parser.add_argument('--workers', type=int, default=8, help='Service workers (when started here)')
+
+    args = parser.parse_args(argv)
+
+    process = None
+    url = args.url
+    if not url:
+        process, url = start_service(args.workers)
+
+    try:
+        trials = sample_trials(max(args.requests, args.batch_size))
+        singles = [json.dumps(trial).encode('utf-8') for trial in trials[:args.requests]]
+        batches = [
+            json.dumps(trials[(i * args.batch_size) % len(trials):][:args.batch_size]).encode('utf-8')
+            for i in range(args.batches)
+        ]
+
+        print("=" * 70)
+        print("SCORING SERVICE LOAD TEST")
+        print("=" * 70)
+        print(f"{url}, {args.concurrency} concurrent clients")
+        print()
+        print(f"{'Phase':<8} {'Requests':>9} {'Rows/s':>9} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'Per row ms':>11}")
+
+        failed = False
+        for name, path, bodies, rows_per_request in [
+            ('single', '/score', singles, 1),
+            ('batch', '/score/batch', batches, args.batch_size),
+        ]:
+            if not bodies:
+                continue
+            run = run_phase(url, path, bodies, args.concurrency)
+            if run['errors'] or not run['latencies']:
+                print(f"❌ {name}: {len(run['errors'])} errors ({run['errors'][:3]})")
+                failed = True
+                continue
+            stats = percentiles(run['latencies'])
+            rate = len(run['latencies']) * rows_per_request / run['seconds']
+            print(f"{name:<8} {len(run['latencies']):>9} {rate:>9.0f} {stats['p50_ms']:>8.3f} "
+                  f"{stats['p90_ms']:>8.3f} {stats['p99_ms']:>8.3f} {stats['p50_ms'] / rows_per_request:>11.4f}")
+
+        server = get_json(url, '/stats')
+        print()
+        print("Service-side latency (request received -> response written):")
+        for name, summary in list(server['requests'].items()) + [('per row', server['per_row'])]:
+            if 'p50_ms' in summary:
+                print(f"  {name:<8} p50={summary['p50_ms']:.3f}ms p99={summary['p99_ms']:.3f}ms")
+
+        per_row = server['per_row'].get('p99_ms')
+        if per_row is not None and per_row < 1:
+            print(f"\n✅ Sub-millisecond scoring per row (service p99 {per_row:.3f}ms)")
+        if failed:
+            raise SystemExit(1)
+
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == '__main__':
+    main()
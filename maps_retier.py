@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Offline Re-tiering from Google Maps Snapshots
+
+Re-tiers trials from stored Google Maps place results instead of calling the
+maps actor again. Snapshots are the actor's dataset items (JSON array, JSON
+object keyed by place ID, or JSONL) or a place cache (place_ids.py), keyed by
+placeId. Each trial's place IDs (location_place_ids from an enriched export,
+or place_ids / all_place_ids) are looked up in the snapshots, and the places
+found are mapped onto TierScorer inputs:
+
+- restaurant_type:    maps category (plus price level for full service)
+- num_locations:      number of the trial's place IDs
+- employees_per_loc:  the type's default staffing, scaled by reviews per location
+
+Closed places and non-food categories go to Tier 5. Thousands of trials
+re-tier in one batch with no network calls:
+
+    python maps_retier.py --input data/output/scored_trials.csv --snapshots data/maps/
+"""
+
+import re
+import sys
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from identify_trial_icps import EmployeeEstimator, LocationCounter, RestaurantIdentifier, TierScorer
+from place_ids import PlaceCache, read_snapshot_items, trial_place_ids, unique_place_ids
+import progress
+from trial_io import read_rows, write_rows
+from trial_record import TrialRecord
+
+
+SNAPSHOT_SUFFIXES = ('.json', '.jsonl', '.db')
+
+# Maps category keyword -> restaurant type (checked before the name-based rules)
+CATEGORY_TYPES = [
+    ('fast food', 'QSR'),
+    ('hamburger', 'QSR'),
+    ('chicken wings', 'QSR'),
+    ('sandwich', 'QSR'),
+    ('fast casual', 'Fast Casual'),
+    ('steak house', 'FSR'),
+    ('fine dining', 'FSR'),
+    ('seafood', 'FSR'),
+    ('coffee', 'Cafe/Coffee'),
+    ('cafe', 'Cafe/Coffee'),
+]
+FULL_SERVICE_PRICES = ('$$$', '$$$$')
+# Maps categories that are food service, matched as whole words (optionally plural).
+# Company-name keywords are substrings and misfire on categories ("Barber shop", "Fork lift dealer").
+FOOD_CATEGORIES = (
+    'restaurant', 'cafe', 'café', 'coffee shop', 'coffee house', 'coffee roasters', 'espresso bar',
+    'bakery', 'patisserie', 'ice cream', 'gelato', 'frozen yogurt', 'donut', 'doughnut', 'dessert', 'deli',
+    'delicatessen', 'caterer', 'catering', 'bagel', 'bar', 'pub', 'gastropub', 'tavern', 'brewery', 'brewpub',
+    'taproom', 'winery', 'grill', 'diner', 'bistro', 'brasserie', 'eatery', 'canteen', 'cantina',
+    'pizza', 'pizzeria', 'steak house', 'steakhouse', 'fast food', 'food court', 'food truck', 'buffet',
+    'burger', 'hamburger', 'sandwich', 'sushi', 'ramen', 'noodle', 'taqueria', 'taco', 'barbecue', 'bbq',
+    'chicken wings', 'juice', 'smoothie', 'tea house', 'bubble tea', 'creperie', 'chophouse',
+)
+# A food word followed by one of these is a supplier or trade, not a place to eat ("Bakery equipment supplier")
+NON_FOOD_QUALIFIERS = (
+    'supplier', 'supply', 'wholesaler', 'distributor', 'manufacturer', 'equipment', 'repair',
+    'remodeler', 'contractor', 'dealer', 'service', 'consultant', 'school',
+)
+FOOD_CATEGORY_PATTERN = re.compile(r'\b(?:' + '|'.join(map(re.escape, FOOD_CATEGORIES)) + r')s?\b')
+NON_FOOD_PATTERN = re.compile(r'\b(?:' + '|'.join(map(re.escape, NON_FOOD_QUALIFIERS)) + r')s?\b')
+
+# Scoring columns an earlier run may have filled that don't apply to a non-restaurant
+RESTAURANT_FIELDS = ('restaurant_type', 'num_locations', 'employees_per_location', 'research_notes')
+
+# Reviews per location -> share of the type's default staffing. Places with
+# under 20 reviews per location are treated as small / not established.
+REVIEW_STEPS = [20, 50, 500]
+REVIEW_STAFFING = [0.4, 0.8, 1.0, 1.3]
+
+
+def _snapshot_files(paths: Iterable[str]) -> List[Path]:
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob('*') if p.suffix.lower() in SNAPSHOT_SUFFIXES))
+        else:
+            files.append(path)
+    return files
+
+
+def load_snapshots(paths: Iterable[str], place_ids: Optional[List[str]] = None) -> Dict[str, Dict]:
+    """
+    Place ID -> maps result, from snapshot files, place caches or directories
+    of them (later files win). With place_ids, only those places are read
+    from place caches.
+    """
+    snapshots = {}
+    for path in _snapshot_files(paths):
+        if path.suffix.lower() == '.db':
+            cache = PlaceCache(str(path))
+            snapshots.update(cache.all() if place_ids is None else cache.get_many(place_ids))
+            cache.close()
+            continue
+        for item in read_snapshot_items(path):
+            place_id = item.get('placeId') or item.get('place_id')
+            if place_id:
+                snapshots[place_id] = item
+    return snapshots
+
+
+def _reviews(place: Dict) -> int:
+    try:
+        return int(place.get('reviewsCount') or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+class MapsRetierer:
+    """Maps Google Maps place results onto TierScorer inputs."""
+
+    def __init__(self, snapshots: Dict[str, Dict]):
+        self.snapshots = snapshots
+        self.restaurant_id = RestaurantIdentifier()
+        self.location_counter = LocationCounter()
+        self.employee_estimator = EmployeeEstimator()
+        self.tier_scorer = TierScorer()
+
+    def is_food(self, category: str) -> bool:
+        """Whether a Maps category (or comma-separated categories) is food service."""
+        return any(
+            FOOD_CATEGORY_PATTERN.search(part) and not NON_FOOD_PATTERN.search(part)
+            for part in category.lower().split(',')
+        )
+
+    def restaurant_type(self, company_name: str, category: str, price: str) -> str:
+        text = category.lower()
+        for keyword, restaurant_type in CATEGORY_TYPES:
+            if keyword in text:
+                return restaurant_type
+
+        restaurant_type = self.restaurant_id.get_restaurant_type(company_name, category)
+        if restaurant_type == 'Unknown' and 'restaurant' in text and price in FULL_SERVICE_PRICES:
+            return 'FSR'
+        return restaurant_type
+
+    def employees_per_location(self, restaurant_type: str, reviews_per_location: float) -> int:
+        default = self.employee_estimator.estimate_employees_per_location(restaurant_type, '1')
+        return int(default * REVIEW_STAFFING[bisect_right(REVIEW_STEPS, reviews_per_location)])
+
+    def retier(self, row: Dict) -> Tuple[Dict, str]:
+        """(re-tiered row, status) for one trial."""
+        place_ids = trial_place_ids(row)
+        places = [self.snapshots[place_id] for place_id in place_ids if place_id in self.snapshots]
+
+        if not place_ids:
+            return dict(row), 'No place IDs'
+        if not places:
+            return dict(row), 'No snapshot'
+
+        primary = max(places, key=_reviews)
+        company_name = row.get('company_name') or primary.get('title', '')
+        category = primary.get('categoryName') or ', '.join(primary.get('categories') or [])
+        price = primary.get('price') or primary.get('priceLevel') or ''
+        reviews = sum(_reviews(place) for place in places)
+        open_places = [place for place in places if not place.get('permanentlyClosed')]
+
+        if category and not self.is_food(category):
+            record = TrialRecord(row, False, 'Tier 5', 'Neutral: Non-restaurant business')
+        else:
+            restaurant_type = self.restaurant_type(company_name, category, price)
+            num_locations = self.location_counter._categorize_location_count(len(place_ids))
+            if open_places:
+                employees = self.employees_per_location(restaurant_type, reviews / len(places))
+                tier, tier_reason = self.tier_scorer.score(restaurant_type, num_locations, employees)
+            else:
+                employees = 0
+                tier, tier_reason = 'Tier 5', 'Neutral: Permanently closed on Google Maps'
+            record = TrialRecord(
+                row, True, tier, tier_reason,
+                restaurant_type=restaurant_type,
+                num_locations=num_locations,
+                employees=employees,
+            )
+
+        result = record.to_dict()
+        if not record.restaurant:
+            result.update(dict.fromkeys(RESTAURANT_FIELDS, ''))
+        result.update({
+            'original_tier': row.get('tier', ''),
+            'maps_places_found': len(places),
+            'maps_category': category,
+            'maps_rating': primary.get('totalScore') or '',
+            'maps_review_count': reviews,
+            'maps_price': price,
+            'maps_website': primary.get('website') or '',
+        })
+        return result, 'Re-tiered'
+
+    def retier_rows(self, rows: List[Dict]) -> Tuple[List[Dict], Dict[str, int]]:
+        """Re-tier a batch of trials. Returns (rows, status counts)."""
+        reporter = progress.ProgressReporter(len(rows), 'Re-tiered', 'trials')
+        results = []
+        for row in rows:
+            result, status = self.retier(row)
+            result['retier_status'] = status
+            results.append(result)
+            reporter.update(status)
+        reporter.finish()
+        return results, reporter.counts
+
+
+def print_retier_summary(results: List[Dict], statuses: Dict[str, int]):
+    """Print status counts, tier changes and the before/after tier table."""
+    retiered = [r for r in results if r['retier_status'] == 'Re-tiered']
+    changed = [r for r in retiered if r.get('original_tier') != r.get('tier')]
+
+    progress.info(f"\n{'='*60}")
+    progress.info("RE-TIER SUMMARY")
+    progress.info(f"{'='*60}")
+    for status, count in sorted(statuses.items()):
+        progress.info(f"  {status}: {count}")
+    progress.info(f"\nTier changes: {len(changed)} of {len(retiered)} re-tiered trials")
+    progress.info(f"\n{'Tier':<8} {'Before':>8} {'After':>8}")
+    for tier in ['Tier 1', 'Tier 2', 'Tier 3', 'Tier 4', 'Tier 5']:
+        before = sum(1 for r in retiered if r.get('original_tier') == tier)
+        after = sum(1 for r in retiered if r.get('tier') == tier)
+        progress.info(f"{tier:<8} {before:>8} {after:>8}")
+    progress.info(f"{'='*60}")
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Re-tier trials from stored Google Maps snapshots')
+    parser.add_argument('--input', default='data/output/scored_trials.csv',
+                        help='Trials with place IDs (scored trials or an enriched export)')
+    parser.add_argument('--snapshots', nargs='+', default=['data/maps'],
+                        help='Snapshot files, place caches (.db) or directories of them')
+    parser.add_argument('--output', default='data/output/retiered_trials.csv', help='Re-tiered trials')
+    progress.add_progress_arguments(parser)
+
+    args = parser.parse_args(argv)
+    progress.configure(args.progress)
+
+    if not Path(args.input).exists():
+        print(f"Error: Input file not found: {args.input}", file=sys.stderr)
+        sys.exit(1)
+
+    started = time.time()
+    rows = list(read_rows(args.input))
+    place_ids, _ = unique_place_ids(rows)
+
+    snapshots = load_snapshots(args.snapshots, place_ids)
+    progress.info(f"🗺️  Loaded {len(snapshots)} place snapshots")
+    if not snapshots:
+        print("Error: No snapshots found", file=sys.stderr)
+        sys.exit(1)
+
+    progress.info(f"📊 Re-tiering {len(rows)} trials ({len(place_ids)} distinct places) from: {args.input}")
+
+    results, statuses = MapsRetierer(snapshots).retier_rows(rows)
+
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    write_rows(results, args.output)
+
+    print_retier_summary(results, statuses)
+    progress.info(f"✅ Re-tiered in {time.time() - started:.2f}s")
+    progress.info(f"📄 Results saved to: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
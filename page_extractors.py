@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Page Extractors
+
+The HTML side of research: parse a fetched page and pull out what the
+researcher needs (locations / careers links and parent company from a
+homepage, location count, job count). Extractors are plain functions of the
+HTML text that return plain values, so they run the same in-process or in a
+worker process (see staged_research.py). This module only needs
+BeautifulSoup/lxml, so parse workers don't import the HTTP stack.
+"""
+
+import re
+import time
+from typing import Dict, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+from ats_detector import ATSDetector
+from metrics import REGISTRY
+
+
+PARSE_SECONDS = REGISTRY.histogram('trial_icp_parse_seconds', 'HTML parse time')
+
+LOCATION_KEYWORDS = ['location', 'locations', 'our restaurants', 'find us', 'store locator']
+CAREERS_KEYWORDS = ['career', 'careers', 'jobs', 'join us', 'hiring', 'employment']
+
+ADDRESS_PATTERNS = [
+    r'\d+\s+[\w\s]+(?:Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Drive|Dr|Lane|Ln|Way)',
+    r'\d+\s+[A-Z][a-z]+\s+[A-Z][a-z]+',  # "123 Main Street"
+]
+
+# Board detection only uses the provider fingerprints, not the API bases
+_ats_detector = ATSDetector()
+
+
+def parse_html(html: str) -> BeautifulSoup:
+    """Parse HTML content."""
+    started = time.monotonic()
+    soup = BeautifulSoup(html, 'lxml')
+    PARSE_SECONDS.observe(time.monotonic() - started)
+    return soup
+
+
+def _absolute(href: str, website: str) -> str:
+    return href if href.startswith('http') else website.rstrip('/') + '/' + href.lstrip('/')
+
+
+def extract_homepage(html: str, website: str) -> Dict:
+    """Locations / careers page links and parent company mention from a homepage."""
+    result = {
+        'has_locations_page': False,
+        'has_careers_page': False,
+        'parent_company_mention': None,
+    }
+    soup = parse_html(html)
+
+    # Look for common page links
+    links = soup.find_all('a', href=True)
+    link_texts = [(link.get_text().lower(), link['href']) for link in links]
+
+    # Check for locations page
+    for text, href in link_texts:
+        if any(keyword in text for keyword in LOCATION_KEYWORDS):
+            result['has_locations_page'] = True
+            result['locations_url'] = _absolute(href, website)
+            break
+
+    # Check for careers page
+    for text, href in link_texts:
+        if any(keyword in text for keyword in CAREERS_KEYWORDS):
+            result['has_careers_page'] = True
+            result['careers_url'] = _absolute(href, website)
+            break
+
+    # Look for parent company mentions in footer
+    footer = soup.find('footer')
+    if footer:
+        footer_text = footer.get_text()
+        # Look for "© 2024 Company Name" pattern
+        copyright_match = re.search(r'©\s*\d{4}\s+([A-Z][A-Za-z\s&]+(?:LLC|Inc|Group|Hospitality))', footer_text)
+        if copyright_match:
+            result['parent_company_mention'] = copyright_match.group(1).strip()
+
+    return result
+
+
+def extract_location_count(html: str) -> int:
+    """Count locations on a locations page."""
+    soup = parse_html(html)
+
+    # Method 1: Find elements with address-like text
+    addresses = []
+    text = soup.get_text()
+    for pattern in ADDRESS_PATTERNS:
+        addresses.extend(re.findall(pattern, text, re.IGNORECASE))
+
+    # Method 2: Look for structured location data
+    location_markers = soup.find_all(['div', 'li', 'article'], class_=re.compile(r'location|store|restaurant', re.I))
+    if location_markers:
+        return len(location_markers)
+
+    # Return unique addresses found
+    return len(set(addresses))
+
+
+def extract_job_count(html: str) -> int:
+    """Count job postings in careers page markup."""
+    soup = parse_html(html)
+
+    # Look for job posting indicators
+    job_elements = soup.find_all(['div', 'li', 'article'], class_=re.compile(r'job|position|opening|career', re.I))
+    if job_elements:
+        return len(job_elements)
+
+    # Alternative: Count links to job applications
+    return len(soup.find_all('a', href=re.compile(r'apply|job|position', re.I)))
+
+
+def extract_careers(html: str) -> Tuple[Optional[Tuple[str, str]], int]:
+    """(embedded job board, 0) if the careers page embeds one, else (None, job count)."""
+    board = _ats_detector.detect(html)
+    if board:
+        return board, 0
+    return None, extract_job_count(html)
+
+
+EXTRACTORS = {
+    'homepage': lambda html, url: extract_homepage(html, url),
+    'locations': lambda html, url: extract_location_count(html),
+    'careers': lambda html, url: extract_careers(html),
+}
+
+
+def run_extractor(kind: str, html: str, url: str):
+    """Run one extractor; returns (result, seconds). Module-level so it pickles for worker processes."""
+    started = time.monotonic()
+    result = EXTRACTORS[kind](html, url)
+    return result, time.monotonic() - started
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Google Place IDs
+
+Parses place IDs from trial rows (location_place_ids in enriched exports,
+"(google_place_id:..., ...)" pairs, or place_ids / all_place_ids lists),
+deduplicates them across the whole input, and resolves each place through
+a persistent place-ID-keyed cache:
+
+- PlaceCache:     SQLite cache of maps results keyed by place ID. Places the
+                  maps actor returned nothing for are remembered too, so they
+                  aren't requested again until --missing-ttl days have passed
+                  (or with --refresh).
+- plan_lookups:   the place IDs of an input that aren't cached yet, each once,
+                  in fixed-size lookup batches (no per-trial cap).
+- resolve_places: runs the lookups through the Google Maps actor and caches
+                  every result.
+
+Usage:
+    python place_ids.py plan --input data/input/enriched_with_gplace_ids.csv
+    python place_ids.py resolve --input data/input/enriched_with_gplace_ids.csv
+    python place_ids.py import data/maps/places.jsonl
+    python place_ids.py stats
+"""
+
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from metrics import REGISTRY
+
+
+DEFAULT_CACHE_PATH = 'data/maps/places.db'
+# Where the Node maps scripts append the actor's place results
+DEFAULT_SNAPSHOT_PATH = 'data/maps/places.jsonl'
+
+# Places per maps actor run
+LOOKUP_BATCH_SIZE = 50
+
+# Places the maps actor returned nothing for are looked up again after this long
+MISSING_TTL_SECONDS = 30 * 24 * 3600
+
+MAPS_ACTOR_URL = 'https://api.apify.com/v2/acts/compass~crawler-google-places/run-sync-get-dataset-items'
+PLACE_URL = 'https://www.google.com/maps/search/?api=1&query=Google&query_place_id={}'
+
+PLACE_ID_PATTERN = re.compile(r'google_place_id:([^,)]+)')
+LIST_SEPARATORS = re.compile(r'[;,|]')
+
+CACHE_REQUESTS = REGISTRY.counter('trial_icp_cache_requests', 'Cache lookups by cache and result', ('cache', 'result'))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS places (
+    place_id TEXT PRIMARY KEY,
+    found INTEGER NOT NULL,
+    data TEXT,
+    fetched_at REAL NOT NULL
+);
+"""
+
+
+def parse_place_ids(value: str) -> List[str]:
+    """Place IDs in a location_place_ids or place ID list value, in order, without duplicates."""
+    value = value or ''
+    if 'google_place_id:' in value:
+        ids = PLACE_ID_PATTERN.findall(value)
+    else:
+        ids = LIST_SEPARATORS.split(value)
+    return list(dict.fromkeys(place_id.strip() for place_id in ids if place_id.strip()))
+
+
+def trial_place_ids(row: Dict) -> List[str]:
+    """A trial's place IDs."""
+    for column in ('location_place_ids', 'place_ids', 'all_place_ids'):
+        if row.get(column):
+            return parse_place_ids(row[column])
+    return []
+
+
+def unique_place_ids(rows: Iterable[Dict]) -> Tuple[List[str], int]:
+    """(distinct place IDs across all rows in first-seen order, total references)."""
+    seen = {}
+    references = 0
+    for row in rows:
+        for place_id in trial_place_ids(row):
+            references += 1
+            seen.setdefault(place_id, None)
+    return list(seen), references
+
+
+class PlaceCache:
+    """Maps results keyed by place ID, stored in SQLite."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def known(self, place_ids: List[str], missing_ttl: float = MISSING_TTL_SECONDS) -> set:
+        """The place IDs already resolved: found, or not found less than missing_ttl seconds ago."""
+        missing_since = time.time() - missing_ttl
+        known = set()
+        for start in range(0, len(place_ids), 500):
+            chunk = place_ids[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT place_id FROM places WHERE (found = 1 OR fetched_at > ?) "
+                f"AND place_id IN ({', '.join('?' for _ in chunk)})",
+                [missing_since] + chunk,
+            ).fetchall()
+            known.update(row[0] for row in rows)
+        return known
+
+    def get_many(self, place_ids: List[str]) -> Dict[str, Dict]:
+        """Place ID -> maps result, for the cached places that were found."""
+        results = {}
+        for start in range(0, len(place_ids), 500):
+            chunk = place_ids[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT place_id, data FROM places WHERE found = 1 AND place_id IN ({', '.join('?' for _ in chunk)})",
+                chunk,
+            ).fetchall()
+            results.update((place_id, json.loads(data)) for place_id, data in rows)
+        return results
+
+    def all(self) -> Dict[str, Dict]:
+        """Every cached place that was found."""
+        rows = self.conn.execute('SELECT place_id, data FROM places WHERE found = 1').fetchall()
+        return {place_id: json.loads(data) for place_id, data in rows}
+
+    def put_many(self, items: Iterable[Dict], missing: Iterable[str] = ()) -> int:
+        """Cache maps results (keyed by their placeId) and place IDs with no result."""
+        now = time.time()
+        rows = [(item.get('placeId') or item.get('place_id'), 1, json.dumps(item), now) for item in items]
+        rows = [row for row in rows if row[0]]
+        rows.extend((place_id, 0, None, now) for place_id in missing)
+        self.conn.executemany(
+            'INSERT INTO places (place_id, found, data, fetched_at) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT (place_id) DO UPDATE SET found = excluded.found, data = excluded.data, '
+            'fetched_at = excluded.fetched_at WHERE excluded.found = 1 OR places.found = 0',
+            rows,
+        )
+        self.conn.commit()
+        return len(rows)
+
+    def stats(self) -> Dict[str, int]:
+        rows = self.conn.execute('SELECT found, COUNT(*) FROM places GROUP BY found').fetchall()
+        counts = {'found' if found else 'not found': count for found, count in rows}
+        return {'found': counts.get('found', 0), 'not found': counts.get('not found', 0)}
+
+
+def plan_lookups(place_ids: List[str], cache: PlaceCache, batch_size: int = LOOKUP_BATCH_SIZE,
+                 missing_ttl: float = MISSING_TTL_SECONDS) -> List[List[str]]:
+    """Lookup batches covering every place ID not cached yet (or not found and expired), each place once."""
+    known = cache.known(place_ids, missing_ttl)
+    CACHE_REQUESTS.inc('places', 'hit', amount=len(known))
+    CACHE_REQUESTS.inc('places', 'miss', amount=len(place_ids) - len(known))
+
+    pending = [place_id for place_id in place_ids if place_id not in known]
+    return [pending[start:start + batch_size] for start in range(0, len(pending), batch_size)]
+
+
+def fetch_places(place_ids: List[str], token: str, timeout: float = 300) -> List[Dict]:
+    """One maps actor run for a batch of place IDs."""
+    import requests
+
+    response = requests.post(
+        MAPS_ACTOR_URL,
+        params={'token': token},
+        json={
+            'startUrls': [{'url': PLACE_URL.format(place_id)} for place_id in place_ids],
+            'proxyConfig': {'useApifyProxy': True},
+            'maxCrawledPlaces': len(place_ids),
+        },
+        timeout=timeout,
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def resolve_places(batches: List[List[str]], cache: PlaceCache, token: str) -> Dict[str, int]:
+    """Run the lookup batches and cache every result. Returns found / not found counts."""
+    counts = {'found': 0, 'not found': 0, 'failed batches': 0}
+
+    for i, batch in enumerate(batches, 1):
+        print(f"  🔍 [{i}/{len(batches)}] Looking up {len(batch)} places...")
+        try:
+            items = fetch_places(batch, token)
+        except (OSError, ValueError) as e:
+            # Nothing is cached for a failed batch, so it's retried next run
+            print(f"  ❌ Lookup failed: {e}", file=sys.stderr)
+            counts['failed batches'] += 1
+            continue
+
+        found = {item.get('placeId') for item in items}
+        missing = [place_id for place_id in batch if place_id not in found]
+        cache.put_many(items, missing)
+        counts['found'] += len(batch) - len(missing)
+        counts['not found'] += len(missing)
+
+    return counts
+
+
+def read_snapshot_items(path) -> Iterable[Dict]:
+    """Maps results from a JSON array, JSON object keyed by place ID, or JSONL file."""
+    path = str(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+        data = json.load(f)
+
+    if isinstance(data, dict) and isinstance(data.get('items'), list):
+        data = data['items']
+    if isinstance(data, dict):
+        for place_id, item in data.items():
+            item.setdefault('placeId', place_id)
+            yield item
+    else:
+        yield from data
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+    from pathlib import Path
+
+    from trial_io import read_rows
+
+    parser = argparse.ArgumentParser(description='Resolve Google place IDs through a persistent cache')
+    parser.add_argument('command', choices=['plan', 'resolve', 'import', 'stats'])
+    parser.add_argument('files', nargs='*', help='Snapshot files to import (JSON / JSONL)')
+    parser.add_argument('--input', help='Trials with place IDs (CSV or Arrow)')
+    parser.add_argument('--cache', default=DEFAULT_CACHE_PATH, help='Place cache database')
+    parser.add_argument('--batch-size', type=int, default=LOOKUP_BATCH_SIZE, help='Places per maps lookup')
+    parser.add_argument('--missing-ttl', type=float, default=MISSING_TTL_SECONDS / 86400,
+                        help='Days before places with no maps result are looked up again')
+    parser.add_argument('--refresh', action='store_true',
+                        help='Look up every cached place with no maps result again')
+
+    args = parser.parse_args(argv)
+
+    Path(args.cache).parent.mkdir(parents=True, exist_ok=True)
+    cache = PlaceCache(args.cache)
+
+    if args.command == 'import':
+        for path in args.files:
+            added = cache.put_many(read_snapshot_items(path))
+            print(f"✅ Imported {added} places from: {path}")
+
+    elif args.command in ('plan', 'resolve'):
+        if not args.input:
+            parser.error(f'{args.command} needs --input')
+
+        place_ids, references = unique_place_ids(read_rows(args.input))
+        missing_ttl = 0 if args.refresh else args.missing_ttl * 86400
+        batches = plan_lookups(place_ids, cache, args.batch_size, missing_ttl)
+        pending = sum(len(batch) for batch in batches)
+
+        print(f"📍 {references} place ID references, {len(place_ids)} distinct places")
+        print(f"   Cached: {len(place_ids) - pending}")
+        print(f"   To look up: {pending} in {len(batches)} batches of up to {args.batch_size}")
+
+        if args.command == 'resolve' and batches:
+            token = os.environ.get('APIFY_TOKEN')
+            if not token:
+                print("Error: APIFY_TOKEN is not set", file=sys.stderr)
+                cache.close()
+                sys.exit(1)
+            counts = resolve_places(batches, cache, token)
+            print(f"✅ Found {counts['found']}, not found {counts['not found']}, "
+                  f"failed batches {counts['failed batches']}")
+
+    stats = cache.stats()
+    print(f"Place cache: {stats['found']} found, {stats['not found']} not found")
+    cache.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,28 +1,30 @@
 #!/usr/bin/env python3
 """
-Get next 50 leads from priority queue (leads 51-100) and process them with Apify.
+Get next 50 leads from priority queue (starting at lead 51) and process them with Apify.
 Then re-tier them based on actual Google Maps data instead of declared data.
+
+A cursor next to the queue remembers where the last batch ended, so each
+run hands out the following 50 leads without re-reading the whole queue.
 """
 
 import csv
 import sys
 
+from lead_cursor import CSVCursor
+
 def get_next_50_leads():
-    """Extract leads 51-100 from priority research queue"""
+    """Extract the next 50 leads from the priority research queue"""
 
     input_file = 'data/output/priority_research_queue.csv'
     output_file = 'data/output/next_50_leads.csv'
 
-    with open(input_file, 'r') as f:
-        reader = csv.DictReader(f)
-        all_trials = list(reader)
-
-    # Get leads 51-100 (indices 50-99)
-    next_50 = all_trials[50:100] if len(all_trials) >= 100 else all_trials[50:]
+    # First run starts after the 50 leads already researched
+    cursor = CSVCursor(input_file, start=50)
+    first = cursor.position + 1 if cursor.position else 51
+    next_50 = cursor.next_batch(50)
 
-    print(f"📊 Total trials in queue: {len(all_trials)}")
     print(f"🎯 Extracting next batch: {len(next_50)} trials")
-    print(f"   Range: #{51} to #{50 + len(next_50)}")
+    print(f"   Range: #{first} to #{first + len(next_50) - 1}")
 
     # Write to new CSV
     if next_50:
@@ -36,7 +38,7 @@ def get_next_50_leads():
         # Show preview
         print(f"\nPreview of next 50 leads:")
         print("="*70)
-        for i, trial in enumerate(next_50[:10], 51):
+        for i, trial in enumerate(next_50[:10], first):
             print(f"{i}. {trial['company_name']} ({trial['tier']}, {trial['num_locations']} locs)")
 
         if len(next_50) > 10:
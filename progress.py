@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Progress Reporting
+
+Throttled progress for long runs in place of per-row prints. A reporter
+counts rows (and a category per row, e.g. tier or confidence tier) and emits
+one line per interval with rate, ETA and category counts.
+
+Output modes (--progress):
+- auto:        interactive on a terminal, plain otherwise (default)
+- interactive: progress lines plus per-row detail
+- plain:       progress lines only; per-row detail is dropped
+- json:        one JSON object per progress update, no per-row detail;
+               banners and summaries go to stderr so stdout is JSON lines only
+- quiet:       no progress output, banners or summaries (errors still go to
+               stderr)
+"""
+
+import json
+import sys
+import time
+from typing import Dict, Optional
+
+
+MODES = ['auto', 'interactive', 'plain', 'json', 'quiet']
+
+# Seconds between progress lines
+INTERACTIVE_INTERVAL = 2.0
+LOG_INTERVAL = 30.0
+
+_mode = None
+
+
+def resolve_mode(mode: str = 'auto') -> str:
+    if mode == 'auto':
+        return 'interactive' if sys.stdout.isatty() else 'plain'
+    return mode
+
+
+def configure(mode: str = 'auto'):
+    """Set the output mode for this process."""
+    global _mode
+    _mode = resolve_mode(mode)
+
+
+def current_mode() -> str:
+    if _mode is None:
+        configure()
+    return _mode
+
+
+def interactive() -> bool:
+    """Whether per-row detail is shown (lets hot loops skip formatting it)."""
+    return current_mode() == 'interactive'
+
+
+def detail(message: str = '', end: str = '\n'):
+    """Per-row output: shown in interactive mode only."""
+    if current_mode() == 'interactive':
+        print(message, end=end)
+
+
+def info(*values, **kwargs):
+    """Banners, summaries and reports: stdout, stderr in json mode, dropped in quiet mode."""
+    mode = current_mode()
+    if mode == 'quiet':
+        return
+    if mode == 'json':
+        kwargs['file'] = sys.stderr
+    print(*values, **kwargs)
+
+
+def _duration(seconds: float) -> str:
+    if seconds >= 3600:
+        return f'{seconds / 3600:.1f}h'
+    if seconds >= 60:
+        return f'{seconds / 60:.1f}min'
+    return f'{seconds:.0f}s'
+
+
+class ProgressReporter:
+    """Counts processed rows and emits throttled progress updates."""
+
+    def __init__(self, total: Optional[int], label: str = 'Processed', unit: str = 'rows',
+                 interval: Optional[float] = None):
+        self.total = total
+        self.label = label
+        self.unit = unit
+        self.mode = current_mode()
+        if interval is None:
+            interval = INTERACTIVE_INTERVAL if self.mode == 'interactive' else LOG_INTERVAL
+        self.interval = interval
+        self.done = 0
+        self.counts: Dict[str, int] = {}
+        self.started = time.monotonic()
+        self.next_emit = self.started + interval
+
+    def update(self, category: Optional[str] = None, n: int = 1):
+        """Record n processed rows (of one category)."""
+        self.done += n
+        if category is not None:
+            self.counts[category] = self.counts.get(category, 0) + n
+
+        if self.mode != 'quiet':
+            now = time.monotonic()
+            if now >= self.next_emit:
+                self.next_emit = now + self.interval
+                self.emit(now)
+
+    def emit(self, now: Optional[float] = None, final: bool = False):
+        if self.mode == 'quiet':
+            return
+
+        elapsed = (now or time.monotonic()) - self.started
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        eta = (self.total - self.done) / rate if self.total and rate else None
+
+        if self.mode == 'json':
+            print(json.dumps({
+                'event': 'done' if final else 'progress',
+                'label': self.label,
+                'done': self.done,
+                'total': self.total,
+                'elapsed_seconds': round(elapsed, 1),
+                'rate_per_second': round(rate, 2),
+                'eta_seconds': None if eta is None else round(eta, 1),
+                'counts': self.counts,
+            }), flush=True)
+            return
+
+        done = f'{self.done:,}/{self.total:,}' if self.total else f'{self.done:,}'
+        parts = [f'{self.label} {done} {self.unit}', f'{rate:,.1f}/s', f'Elapsed: {_duration(elapsed)}']
+        if final:
+            icon = '✅'
+        else:
+            icon = '⏳'
+            if eta is not None:
+                parts.append(f'ETA: {_duration(eta)}')
+        if self.counts:
+            parts.append(', '.join(f'{name}: {count:,}' for name, count in sorted(self.counts.items())))
+        print(f"  {icon} {' | '.join(parts)}", flush=True)
+
+    def finish(self):
+        """Emit the final totals."""
+        self.emit(final=True)
+
+
+def add_progress_arguments(parser):
+    """--progress option shared by the CLIs."""
+    parser.add_argument('--progress', choices=MODES, default='auto',
+                        help='Progress output: auto (default), interactive, plain, json or quiet')
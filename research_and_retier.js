@@ -8,6 +8,14 @@ const client = new ApifyClient({
     token: process.env.APIFY_TOKEN,
 });
 
+// Raw maps results are kept for offline re-tiering (maps_retier.py)
+const SNAPSHOT_FILE = 'data/maps/places.jsonl';
+
+function saveSnapshots(items) {
+    fs.mkdirSync('data/maps', { recursive: true });
+    fs.appendFileSync(SNAPSHOT_FILE, items.map(item => JSON.stringify(item) + '\n').join(''));
+}
+
 /**
  * Research restaurant using Google Maps and RE-TIER based on actual findings
  */
@@ -66,6 +74,7 @@ async function researchAndRetier(trial) {
         });
 
         const { items } = await client.dataset(run.defaultDatasetId).listItems();
+        saveSnapshots(items);
 
         if (items.length > 0) {
             const place = items[0];
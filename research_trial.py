@@ -2,7 +2,9 @@
 """
 Trial Research & Validation Tool
 
-Validates trial data through external research:
+Validates trial data through external research, fanning out to pluggable
+source adapters (website, job boards, stored Google Maps results, Yelp)
+concurrently for each trial:
 1. Website scraping (locations, careers pages)
 2. Parent company detection (multi-brand groups)
 3. Job posting analysis
@@ -15,19 +17,316 @@ Combines methodologies from:
 - Restaurant Group Mapping (structured research process)
 """
 
-import csv
-import json
+import copy
+import os
 import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+import requests
+
+from automated_researcher import CACHE_REQUESTS, RATE_LIMIT_WAIT_SECONDS, HostRateLimiter, RestaurantResearcher, WebScraper
+import progress
+from confidence import ConfidenceEngine
+from group_index import normalize_company_name, website_domain
+from place_ids import DEFAULT_SNAPSHOT_PATH, read_snapshot_items
+from trial_io import read_rows, write_rows
+
+
+class CachingScraper:
+    """
+    WebScraper wrapper shared by all sources of a pipeline.
+
+    Concurrent requests for the same URL are collapsed into one fetch
+    (single-flight), so the website and job-board sources share the homepage.
+    Pages are only kept until clear() is called at the end of each trial.
+
+    Requests are paced per host (WebScraper.fetch_url paces every request
+    in the process, which would serialize the sources' concurrent fetches).
+    """
+
+    def __init__(self, scraper: Optional[WebScraper] = None, host_period: float = 2.0):
+        self.scraper = scraper or WebScraper()
+        self.limiter = HostRateLimiter(host_period)
+        self.pages: Dict[str, Future] = {}
+        self.lock = threading.Lock()
+
+    def fetch_url(self, url: str, timeout: float = 10) -> Optional[str]:
+        with self.lock:
+            future = self.pages.get(url)
+            owner = future is None
+            if owner:
+                future = self.pages[url] = Future()
+        CACHE_REQUESTS.inc('pages', 'miss' if owner else 'hit')
+
+        if owner:
+            try:
+                future.set_result(self._fetch_html(url, timeout))
+            except Exception as e:
+                future.set_exception(e)
+
+        return future.result()
+
+    def _fetch_html(self, url: str, timeout: float) -> Optional[str]:
+        if self.scraper.skip_fetch(url):
+            return None
+        RATE_LIMIT_WAIT_SECONDS.observe(self.limiter.wait(url))
+        return self.scraper.request_html(url, timeout)
+
+    def clear(self):
+        """Drop cached pages (fetches still in flight finish for their callers)."""
+        with self.lock:
+            self.pages.clear()
+
+    def fetch_json(self, url: str, timeout: float = 10):
+        RATE_LIMIT_WAIT_SECONDS.observe(self.limiter.wait(url))
+        return self.scraper.request_json(url, timeout)
+
+    def parse_html(self, html: str):
+        return self.scraper.parse_html(html)
+
+
+class ResearchSource:
+    """
+    Base class for research source adapters.
+
+    Subclasses set `name` and implement `cache_key` and `fetch`. `fetch`
+    returns a partial research result: any TrialResearcher research fields
+    plus 'evidence' (list of strings). A result with only evidence (e.g. a
+    failed lookup) is kept as a note and doesn't count as a source. Results
+    are cached per cache_key.
+    """
+
+    name = 'source'
+
+    def __init__(self, timeout: float = 20):
+        self.timeout = timeout
+        self.cache: Dict[str, Dict] = {}
+
+    def cache_key(self, trial_data: Dict) -> Optional[str]:
+        """Key results are cached under (None = nothing to look up)."""
+        raise NotImplementedError
+
+    def fetch(self, trial_data: Dict) -> Dict:
+        raise NotImplementedError
+
+    def lookup(self, trial_data: Dict) -> Dict:
+        """Cached fetch."""
+        key = self.cache_key(trial_data)
+        if key is None:
+            return {}
+        if key in self.cache:
+            CACHE_REQUESTS.inc(f'source_{self.name}', 'hit')
+        else:
+            CACHE_REQUESTS.inc(f'source_{self.name}', 'miss')
+            self.cache[key] = self.fetch(trial_data)
+        return self.cache[key]
+
+    def finish_trial(self):
+        """Called when a trial's research is done; drop per-trial state."""
+
+
+class WebsiteSource(ResearchSource):
+    """Restaurant website: accessibility, locations page, parent company."""
+
+    name = 'website'
+
+    def __init__(self, scraper: CachingScraper, timeout: float = 30):
+        super().__init__(timeout)
+        self.researcher = RestaurantResearcher()
+        self.researcher.scraper = scraper
+
+    def cache_key(self, trial_data: Dict) -> Optional[str]:
+        return website_domain(trial_data.get('website', '')) or None
+
+    def finish_trial(self):
+        self.researcher.scraper.clear()
+
+    def fetch(self, trial_data: Dict) -> Dict:
+        website = trial_data.get('website', '')
+        deadline = time.monotonic() + self.timeout
+        basics = self.researcher.scrape_website_basics(website, deadline=deadline)
+        if not basics['website_accessible']:
+            return {'evidence': [f'Website not accessible: {website}']}
+
+        result = {
+            'website_found': website,
+            'website_quality': 'Professional' if basics['has_locations_page'] or basics['has_careers_page'] else 'Basic',
+            'evidence': [f'Website accessible: {website}'],
+        }
+
+        if basics['has_locations_page']:
+            timeout = self.researcher._fetch_timeout(deadline)
+            if timeout is not None:
+                locations = self.researcher.count_locations_from_page(basics['locations_url'], timeout=timeout)
+                result['actual_locations_found'] = locations
+                result['evidence'].append(f"{locations} locations on {basics['locations_url']}")
+
+        if basics.get('parent_company_mention'):
+            result['parent_company'] = basics['parent_company_mention']
+            result['evidence'].append(f"Footer names parent company {basics['parent_company_mention']}")
+
+        return result
+
+
+class JobBoardSource(ResearchSource):
+    """Careers page / embedded ATS job board: active postings."""
+
+    name = 'job_boards'
+
+    def __init__(self, scraper: CachingScraper, timeout: float = 30):
+        super().__init__(timeout)
+        self.researcher = RestaurantResearcher()
+        self.researcher.scraper = scraper
+
+    def cache_key(self, trial_data: Dict) -> Optional[str]:
+        return website_domain(trial_data.get('website', '')) or None
+
+    def finish_trial(self):
+        self.researcher.scraper.clear()
+
+    def fetch(self, trial_data: Dict) -> Dict:
+        deadline = time.monotonic() + self.timeout
+        basics = self.researcher.scrape_website_basics(trial_data.get('website', ''), deadline=deadline)
+        if not basics['has_careers_page']:
+            return {}
+
+        timeout = self.researcher._fetch_timeout(deadline)
+        if timeout is None:
+            return {'careers_page_url': basics['careers_url']}
+
+        postings = self.researcher.count_job_postings(basics['careers_url'], timeout=timeout)
+        return {
+            'careers_page_url': basics['careers_url'],
+            'active_job_postings': postings,
+            'evidence': [f"{postings} job postings on {basics['careers_url']}"],
+        }
+
+
+class MapsSnapshotSource(ResearchSource):
+    """
+    Stand-in for live Google Maps lookups: stored Google Maps actor results.
+
+    Reads the actor items the Node scripts store (data/maps/places.jsonl, or
+    any JSON/JSONL snapshot place_ids.py reads: title, website, totalScore,
+    reviewsCount, categoryName, url) and matches trials by website domain or
+    company name.
+    """
+
+    name = 'maps'
+
+    def __init__(self, snapshot_path: str = DEFAULT_SNAPSHOT_PATH, timeout: float = 5):
+        super().__init__(timeout)
+        self.by_name: Dict[str, List[Dict]] = {}
+        self.by_domain: Dict[str, List[Dict]] = {}
+
+        if Path(snapshot_path).exists():
+            for item in read_snapshot_items(snapshot_path):
+                self.by_name.setdefault(normalize_company_name(item.get('title', '')), []).append(item)
+                domain = website_domain(item.get('website') or '')
+                if domain:
+                    self.by_domain.setdefault(domain, []).append(item)
+
+    def cache_key(self, trial_data: Dict) -> Optional[str]:
+        return normalize_company_name(trial_data.get('company_name', '')) or None
+
+    def fetch(self, trial_data: Dict) -> Dict:
+        items = (
+            self.by_domain.get(website_domain(trial_data.get('website', '')))
+            or self.by_name.get(normalize_company_name(trial_data.get('company_name', '')))
+        )
+        if not items:
+            return {}
+
+        place = max(items, key=lambda item: item.get('reviewsCount') or 0)
+        return {
+            'google_business_url': place.get('url'),
+            'review_count': place.get('reviewsCount') or 0,
+            'rating': place.get('totalScore') or 0.0,
+            'restaurant_type_validated': place.get('categoryName') or 'Unknown',
+            'website_found': place.get('website'),
+            'actual_locations_found': len(items),
+            'evidence': [f"Google Maps: {len(items)} place(s), {place.get('reviewsCount') or 0} reviews"],
+        }
+
+
+class YelpSource(ResearchSource):
+    """Yelp Fusion business search (needs YELP_API_KEY; skipped without it)."""
+
+    name = 'reviews'
+    SEARCH_URL = 'https://api.yelp.com/v3/businesses/search'
+
+    def __init__(self, api_key: Optional[str] = None, timeout: float = 10):
+        super().__init__(timeout)
+        self.api_key = api_key or os.environ.get('YELP_API_KEY')
+        self.session = requests.Session()
+
+    def cache_key(self, trial_data: Dict) -> Optional[str]:
+        if not self.api_key:
+            return None
+        return normalize_company_name(trial_data.get('company_name', '')) or None
+
+    def fetch(self, trial_data: Dict) -> Dict:
+        params = {'term': trial_data.get('company_name', ''), 'limit': 5}
+        location = trial_data.get('locations') or trial_data.get('city')
+        if location:
+            params['location'] = location
+        else:
+            # Yelp requires a location; without one, search North America broadly
+            params.update({'latitude': 39.8, 'longitude': -98.6, 'radius': 40000})
+
+        try:
+            response = self.session.get(
+                self.SEARCH_URL,
+                headers={'Authorization': f'Bearer {self.api_key}'},
+                params=params,
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            businesses = response.json().get('businesses', [])
+        except (requests.RequestException, ValueError) as e:
+            return {'evidence': [f'Yelp lookup failed: {str(e)[:100]}']}
+
+        wanted = normalize_company_name(trial_data.get('company_name', ''))
+        matches = [b for b in businesses if normalize_company_name(b.get('name', '')) == wanted]
+        if not matches:
+            return {}
+
+        best = max(matches, key=lambda b: b.get('review_count', 0))
+        return {
+            'yelp_url': best.get('url'),
+            'review_count': best.get('review_count', 0),
+            'rating': best.get('rating', 0.0),
+            'price_range': best.get('price', 'Unknown'),
+            'evidence': [f"Yelp: {len(matches)} listing(s), {best.get('review_count', 0)} reviews"],
+        }
+
+
+def default_sources(maps_snapshot_path: str = DEFAULT_SNAPSHOT_PATH) -> List[ResearchSource]:
+    """Website, job boards, stored Google Maps results and Yelp."""
+    scraper = CachingScraper()
+    return [
+        WebsiteSource(scraper),
+        JobBoardSource(scraper),
+        MapsSnapshotSource(maps_snapshot_path),
+        YelpSource(),
+    ]
+
 
 class TrialResearcher:
     """Researches and validates trial restaurant data."""
 
-    def __init__(self):
+    # Fields where the largest value across sources wins
+    MAX_FIELDS = ['actual_locations_found', 'active_job_postings', 'review_count', 'rating']
+
+    def __init__(self, sources: Optional[List[ResearchSource]] = None, max_workers: int = 8):
         self.research_cache = {}
+        self.sources = sources if sources is not None else default_sources()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
 
     def research_restaurant(self, trial_data: Dict) -> Dict:
         """
@@ -40,17 +339,26 @@ class TrialResearcher:
         4. Count job postings
         5. Validate declared data
         6. Calculate confidence score
+
+        All sources run concurrently, each bounded by its own timeout, so a
+        trial takes as long as its slowest source rather than the sum.
+        Results are cached per company and domain, except partial ones (a
+        source timed out), which are researched again.
         """
         company_name = trial_data.get('company_name', '')
-        website = trial_data.get('website', '')
+        cache_key = (normalize_company_name(company_name), website_domain(trial_data.get('website', '')))
+        if cache_key in self.research_cache:
+            CACHE_REQUESTS.inc('research', 'hit')
+            return copy.deepcopy(self.research_cache[cache_key])
+        CACHE_REQUESTS.inc('research', 'miss')
 
         research_result = {
             'company_name': company_name,
             'research_date': datetime.now().isoformat(),
 
             # Original declared data
-            'declared_locations': trial_data.get('declared_locations', ''),
-            'declared_employees': trial_data.get('declared_employees', ''),
+            'declared_locations': trial_data.get('declared_locations', '') or trial_data.get('num_locations', ''),
+            'declared_employees': trial_data.get('declared_employees', '') or trial_data.get('employees_per_location', ''),
 
             # Research findings
             'website_found': None,
@@ -94,89 +402,73 @@ class TrialResearcher:
             'research_status': 'Pending'
         }
 
-        # THIS IS A TEMPLATE - ACTUAL IMPLEMENTATION WOULD USE:
-        # - requests library for web scraping
-        # - BeautifulSoup for HTML parsing
-        # - Google/Yelp APIs for business data
-        # - Indeed scraping for job postings
-        # - Your existing restaurant-staffing-researcher agent
-
-        research_result['research_status'] = 'Template - Needs Implementation'
-        research_result['research_notes'] = 'This is a framework. Real implementation requires web scraping tools.'
+        started = time.monotonic()
+        futures = [
+            (source, started + source.timeout, self.executor.submit(source.lookup, trial_data))
+            for source in self.sources
+        ]
+
+        timed_out = []
+        for source, deadline, future in futures:
+            try:
+                partial = future.result(timeout=max(0, deadline - time.monotonic()))
+            except TimeoutError:
+                timed_out.append(source.name)
+                continue
+            except Exception as e:
+                research_result['evidence_found'].append(f'{source.name} failed: {str(e)[:100]}')
+                continue
+
+            if partial:
+                self.merge_source_result(research_result, source.name, partial)
+
+        for source in self.sources:
+            source.finish_trial()
+
+        research_result['multi_brand_group'] = bool(research_result['sister_restaurants'])
+        research_result['hiring_urgency'] = self.hiring_urgency(research_result['active_job_postings'])
+        research_result['manual_review_needed'] = not research_result['research_sources'] or bool(timed_out)
+
+        if timed_out:
+            research_result['research_status'] = 'Partial'
+            research_result['research_notes'] = f"Timed out: {', '.join(timed_out)}"
+        elif research_result['research_sources']:
+            research_result['research_status'] = 'Complete'
+        else:
+            research_result['research_status'] = 'No evidence found'
 
+        if research_result['research_status'] != 'Partial':
+            self.research_cache[cache_key] = copy.deepcopy(research_result)
         return research_result
 
-    def calculate_confidence_score(self, research: Dict) -> int:
-        """
-        Calculate confidence score (0-120).
-
-        Based on:
-        - Location match (0-25)
-        - Employee match (0-25)
-        - Website quality (0-15)
-        - Job posting signals (0-15)
-        - Social proof (0-10)
-        - Parent company discovery (bonus +20)
-        """
-        score = 50  # Base confidence
-
-        # Location match
-        declared = research.get('declared_locations', '')
-        actual = research.get('actual_locations_found', 0)
-
-        if actual > 0:
-            # Parse declared (could be "2-5", "1", etc.)
-            if str(actual) in str(declared):
-                score += 25
-            elif abs(actual - int(declared.split('-')[0] if '-' in declared else declared or '0')) <= 1:
-                score += 15
-            else:
-                score += 10
-
-        # Website quality
-        if research.get('website_found'):
-            if research.get('website_quality') == 'Professional':
-                score += 15
-            elif research.get('website_quality') == 'Basic':
-                score += 10
-
-        # Job postings
-        postings = research.get('active_job_postings', 0)
+    def merge_source_result(self, research: Dict, source_name: str, partial: Dict):
+        """Merge one source's findings into the research result."""
+        research['evidence_found'].extend(partial.get('evidence', []))
+        # Evidence alone (e.g. "Website not accessible") is a note, not a finding
+        if any(field != 'evidence' and value not in (None, '') for field, value in partial.items()):
+            research['research_sources'].append(source_name)
+
+        for field, value in partial.items():
+            if field == 'evidence' or value in (None, ''):
+                continue
+            if field in self.MAX_FIELDS:
+                research[field] = max(research[field], value)
+            elif research.get(field) in (None, 'Unknown', 'None detected', 0, ''):
+                research[field] = value
+
+    def hiring_urgency(self, postings: int) -> str:
+        """Bucket active job postings."""
         if postings >= 10:
-            score += 15
-        elif postings >= 3:
-            score += 10
-        elif postings >= 1:
-            score += 5
-
-        # Social proof
-        reviews = research.get('review_count', 0)
-        if reviews >= 100:
-            score += 10
-        elif reviews >= 50:
-            score += 7
-        elif reviews >= 20:
-            score += 5
-
-        # Parent company bonus
-        if research.get('parent_company') != 'None detected':
-            score += 20
-
-        return min(score, 120)
-
-    def determine_confidence_tier(self, score: int) -> str:
-        """Convert confidence score to tier."""
-        if score >= 90:
             return 'High'
-        elif score >= 70:
+        elif postings >= 3:
             return 'Medium'
-        elif score >= 50:
+        elif postings >= 1:
             return 'Low'
         else:
-            return 'Very Low'
+            return 'None'
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """
     Main workflow for trial research.
 
@@ -191,28 +483,22 @@ def main():
     parser.add_argument('--limit', type=int, help='Limit number to research (for testing)')
     parser.add_argument('--tiers', nargs='+', default=['Tier 1', 'Tier 2'],
                         help='Which tiers to research (default: Tier 1 and 2)')
+    parser.add_argument('--maps-snapshots', default=DEFAULT_SNAPSHOT_PATH,
+                        help='Stored Google Maps actor results (JSON or JSONL)')
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent source lookups')
+    parser.add_argument('--weights', help='Confidence weights JSON (see confidence.py)')
+    progress.add_progress_arguments(parser)
+
+    args = parser.parse_args(argv)
+    progress.configure(args.progress)
 
-    args = parser.parse_args()
-
-    print("=" * 70)
-    print("TRIAL RESEARCH & VALIDATION TOOL")
-    print("=" * 70)
-    print()
-    print("⚠️  NOTE: This is a FRAMEWORK/TEMPLATE")
-    print("⚠️  Full implementation requires:")
-    print("   - Web scraping libraries (requests, BeautifulSoup)")
-    print("   - API integrations (Google Business, Yelp)")
-    print("   - Indeed job posting scraper")
-    print("   - Rate limiting and proxy management")
-    print("   - Integration with existing restaurant-staffing-researcher agent")
-    print()
-    print("=" * 70)
-    print()
+    progress.info("=" * 70)
+    progress.info("TRIAL RESEARCH & VALIDATION TOOL")
+    progress.info("=" * 70)
+    progress.info()
 
     # Read input
-    with open(args.input, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        trials = list(reader)
+    trials = list(read_rows(args.input))
 
     # Filter by tier
     trials_to_research = [
@@ -223,41 +509,50 @@ def main():
     if args.limit:
         trials_to_research = trials_to_research[:args.limit]
 
-    print(f"📊 Input: {len(trials)} total trials")
-    print(f"🎯 Targeting: {args.tiers}")
-    print(f"🔬 Researching: {len(trials_to_research)} trials")
-    print()
+    progress.info(f"📊 Input: {len(trials)} total trials")
+    progress.info(f"🎯 Targeting: {args.tiers}")
+    progress.info(f"🔬 Researching: {len(trials_to_research)} trials")
+    progress.info()
 
     # Research each trial
-    researcher = TrialResearcher()
+    researcher = TrialResearcher(
+        sources=default_sources(args.maps_snapshots),
+        max_workers=args.workers,
+    )
+    progress.info(f"🔌 Sources: {', '.join(source.name for source in researcher.sources)}")
+    if not os.environ.get('YELP_API_KEY'):
+        progress.info("   (reviews source skipped: YELP_API_KEY not set)")
+    progress.info()
+
+    confidence = ConfidenceEngine.load(args.weights)
     results = []
+    reporter = progress.ProgressReporter(len(trials_to_research), 'Researched', 'trials')
 
     for i, trial in enumerate(trials_to_research, 1):
         company = trial.get('company_name', 'Unknown')
-        print(f"[{i}/{len(trials_to_research)}] Researching: {company}")
+        progress.detail(f"[{i}/{len(trials_to_research)}] Researching: {company}")
 
         research_result = researcher.research_restaurant(trial)
 
         # Calculate confidence
-        confidence_score = researcher.calculate_confidence_score(research_result)
-        research_result['confidence_score'] = confidence_score
-        research_result['confidence_tier'] = researcher.determine_confidence_tier(confidence_score)
+        confidence.apply(research_result)
 
         results.append(research_result)
+        reporter.update(research_result['confidence_tier'])
+        progress.detail(f"   {research_result['research_status']} via {', '.join(research_result['research_sources']) or 'no sources'}"
+              f" -> {research_result['confidence_tier']} confidence")
+
+    reporter.finish()
+    researcher.executor.shutdown(wait=False)
 
     # Write output
-    if results:
-        fieldnames = list(results[0].keys())
-        with open(args.output, 'w', encoding='utf-8', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(results)
-
-    print()
-    print("=" * 70)
-    print("✅ Research complete")
-    print(f"📄 Output saved to: {args.output}")
-    print("=" * 70)
+    write_rows(results, args.output)
+
+    progress.info()
+    progress.info("=" * 70)
+    progress.info("✅ Research complete")
+    progress.info(f"📄 Output saved to: {args.output}")
+    progress.info("=" * 70)
 
 
 if __name__ == '__main__':
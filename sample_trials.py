@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Stratified QA Samples
+
+Draws a fixed-size, seeded sample of scored trials for QA in one pass over
+the scored output. Hand-picked samples ("first 20", "first 500") only see the
+head of the export; this one is representative of the whole file.
+
+Rows are grouped into strata by tier, restaurant type and location bucket,
+and each stratum keeps a reservoir sample (at most --size rows), so memory is
+bounded by the number of strata, not the input size. After the pass the
+sample size is allocated across strata in proportion to their population
+(largest remainder, at least --min-per-stratum each), and each stratum's
+reservoir is cut down to its share. The same input and --seed always give the
+same sample.
+
+Usage:
+    python sample_trials.py --input data/output/scored_trials.csv --size 200 --seed 7
+    python trial_icp.py sample --input data/output/scored_trials.csv.gz --by tier
+"""
+
+import random
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from trial_io import read_rows, write_rows
+
+
+STRATA_FIELDS = ['tier', 'restaurant_type', 'num_locations']
+
+
+class Reservoir:
+    """Uniform sample of at most `capacity` items from a stream (Algorithm R)."""
+
+    def __init__(self, capacity: int, rng: random.Random):
+        self.capacity = capacity
+        self.rng = rng
+        self.seen = 0
+        self.items: List[Tuple[int, Dict]] = []
+
+    def offer(self, position: int, row: Dict):
+        self.seen += 1
+        if len(self.items) < self.capacity:
+            self.items.append((position, row))
+            return
+        slot = self.rng.randrange(self.seen)
+        if slot < self.capacity:
+            self.items[slot] = (position, row)
+
+
+def allocate(populations: Dict[Tuple, int], size: int, minimum: int = 1) -> Dict[Tuple, int]:
+    """Split `size` across strata in proportion to population (largest remainder)."""
+    total = sum(populations.values())
+    if total <= size:
+        return dict(populations)
+
+    # Every stratum gets its minimum first (if the sample can afford it)
+    floor = min(minimum, size // len(populations)) if populations else 0
+    allocation = {stratum: min(floor, count) for stratum, count in populations.items()}
+    left = size - sum(allocation.values())
+
+    remaining = {stratum: count - allocation[stratum] for stratum, count in populations.items()}
+    remaining_total = sum(remaining.values())
+    shares = {stratum: left * count / remaining_total for stratum, count in remaining.items()}
+    for stratum, share in shares.items():
+        allocation[stratum] += int(share)
+
+    # Hand out what rounding down left over, biggest remainders first (ties by stratum)
+    left = size - sum(allocation.values())
+    by_remainder = sorted(shares, key=lambda stratum: (-(shares[stratum] - int(shares[stratum])), stratum))
+    for stratum in by_remainder[:left]:
+        allocation[stratum] += 1
+    return allocation
+
+
+def stratified_sample(rows: Iterable[Dict], size: int, by: Optional[List[str]] = None, seed: int = 0,
+                      minimum: int = 1) -> Tuple[List[Dict], Dict[Tuple, int], Dict[Tuple, int]]:
+    """
+    One pass over rows; returns (sample, populations, allocation).
+
+    The sample is ordered by stratum, then by position in the input.
+    """
+    by = by or STRATA_FIELDS
+    rng = random.Random(seed)
+    reservoirs: Dict[Tuple, Reservoir] = {}
+
+    for position, row in enumerate(rows):
+        # Arrow inputs keep column types; strata compare as strings
+        stratum = tuple('' if row.get(field) is None else str(row.get(field)) for field in by)
+        reservoir = reservoirs.get(stratum)
+        if reservoir is None:
+            reservoir = reservoirs[stratum] = Reservoir(size, rng)
+        reservoir.offer(position, row)
+
+    populations = {stratum: reservoir.seen for stratum, reservoir in reservoirs.items()}
+    allocation = allocate(populations, size, minimum)
+
+    sample = []
+    for stratum in sorted(reservoirs):
+        items = reservoirs[stratum].items
+        # A uniform subset of a uniform reservoir is still uniform
+        chosen = rng.sample(items, allocation[stratum]) if allocation[stratum] < len(items) else items
+        for _, row in sorted(chosen, key=lambda item: item[0]):
+            sample.append(dict(row, sample_stratum=' / '.join(value or 'none' for value in stratum)))
+
+    return sample, populations, allocation
+
+
+def print_sample_summary(populations: Dict[Tuple, int], allocation: Dict[Tuple, int], by: List[str]):
+    total = sum(populations.values())
+    sampled = sum(allocation.values())
+
+    print(f"\n{'='*70}")
+    print("STRATIFIED SAMPLE")
+    print(f"{'='*70}")
+    print(f"Population: {total}   Sample: {sampled}   Strata: {len(populations)} (by {', '.join(by)})")
+    print()
+    print(f"  {'Stratum':<44} {'Population':>10} {'Share':>7} {'Sampled':>8}")
+    for stratum in sorted(populations, key=lambda stratum: (-populations[stratum], stratum)):
+        label = ' / '.join(value or 'none' for value in stratum)
+        share = populations[stratum] / total * 100 if total else 0
+        print(f"  {label[:44]:<44} {populations[stratum]:>10} {share:>6.1f}% {allocation[stratum]:>8}")
+    print(f"{'='*70}")
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Draw a stratified, seeded QA sample of scored trials')
+    parser.add_argument('--input', default='data/output/scored_trials.csv', help='Scored trials (any trial_io format)')
+    parser.add_argument('--output', default='data/output/qa_sample.csv', help='Sample output')
+    parser.add_argument('--size', type=int, default=200, help='Sample size')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (same seed, same sample)')
+    parser.add_argument('--by', default=','.join(STRATA_FIELDS),
+                        help=f"Comma-separated strata columns (default: {','.join(STRATA_FIELDS)})")
+    parser.add_argument('--min-per-stratum', type=int, default=1,
+                        help='Rows every stratum gets, however small (if the sample size allows)')
+
+    args = parser.parse_args(argv)
+    by = [field.strip() for field in args.by.split(',') if field.strip()]
+
+    sample, populations, allocation = stratified_sample(
+        read_rows(args.input), args.size, by=by, seed=args.seed, minimum=args.min_per_stratum
+    )
+    print_sample_summary(populations, allocation, by)
+
+    write_rows(sample, args.output)
+    print(f"\n✅ Sample of {len(sample)} trials saved to: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
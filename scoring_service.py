@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Local Scoring Service
+
+Scores trials over HTTP the moment they sign up, instead of running
+identify_trial_icps.py over a CSV. The TrialICPProcessor is built once at
+startup and shared by a bounded pool of worker threads (one keep-alive
+connection per worker). A connection that finds every worker busy for
+ACCEPT_WAIT seconds gets a 503 with Retry-After instead of waiting, so
+shutdown never blocks on the accept loop.
+Connections idle for IDLE_TIMEOUT seconds are closed, so idle clients can't
+hold every worker.
+
+Endpoints (JSON in, JSON out):
+
+    POST /score          one trial row          -> the scored row
+    POST /score/batch    a list of trial rows   -> the scored rows, in order
+                         (or {"trials": [...]})
+    GET  /stats          request and per-row latency p50/p90/p99
+    GET  /health         {"status": "ok"}
+    GET  /metrics        OpenMetrics text (see metrics.py)
+
+Scored rows are the same as identify's output rows (without entity_id, which
+needs the whole file). Bind to localhost only; there is no authentication.
+
+Usage:
+    python scoring_service.py --port 8765 --workers 8
+    curl -s localhost:8765/score -d '{"company_name": "Harbor Grill", "notes": "2 locations"}'
+    python load_test_scoring.py --requests 20000 --batch-size 100
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Dict, List, Optional
+
+from identify_trial_icps import TrialICPProcessor
+from metrics import CONTENT_TYPE, REGISTRY
+
+
+# Most requests finish well under a millisecond
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1, 1.0)
+
+REQUEST_SECONDS = REGISTRY.histogram('trial_icp_scoring_request_seconds', 'Scoring service request latency',
+                                     ('endpoint',), buckets=LATENCY_BUCKETS)
+ROWS_SERVED = REGISTRY.counter('trial_icp_scoring_rows', 'Rows scored by the scoring service', ('endpoint',))
+
+MAX_BATCH_ROWS = 10000
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+# Seconds a keep-alive connection may sit idle before its worker is freed
+IDLE_TIMEOUT = 5
+
+# Seconds a new connection waits for a free worker before it gets a 503
+ACCEPT_WAIT = 0.5
+
+# Sent (from the accept loop) to connections that arrive while every worker is busy
+BUSY_BODY = b'{"error": "All workers are busy"}'
+BUSY_RESPONSE = (b'HTTP/1.1 503 Service Unavailable\r\nContent-Type: application/json\r\n'
+                 b'Retry-After: 1\r\nConnection: close\r\n'
+                 b'Content-Length: ' + str(len(BUSY_BODY)).encode('ascii') + b'\r\n\r\n' + BUSY_BODY)
+
+# Latencies kept for percentiles (most recent)
+LATENCY_WINDOW = 100000
+
+
+class LatencyWindow:
+    """Recent latencies, for p50/p90/p99 without unbounded memory."""
+
+    def __init__(self, size: int = LATENCY_WINDOW):
+        self.samples = deque(maxlen=size)
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def add(self, seconds: float, count: int = 1):
+        with self.lock:
+            self.samples.append(seconds)
+            self.count += count
+
+    def summary(self) -> Dict:
+        with self.lock:
+            samples = sorted(self.samples)
+            count = self.count
+        if not samples:
+            return {'count': count}
+
+        def percentile(p: float) -> float:
+            return round(samples[min(len(samples) - 1, int(p * len(samples)))] * 1000, 4)
+
+        return {
+            'count': count,
+            'p50_ms': percentile(0.50),
+            'p90_ms': percentile(0.90),
+            'p99_ms': percentile(0.99),
+            'max_ms': round(samples[-1] * 1000, 4),
+        }
+
+
+def trial_row(value) -> Optional[Dict[str, str]]:
+    """A JSON object as a trial row of strings, like a CSV row (None if it isn't one)."""
+    if not isinstance(value, dict):
+        return None
+    row = {}
+    for field, item in value.items():
+        if item is None:
+            row[field] = ''
+        elif isinstance(item, str):
+            row[field] = item
+        elif isinstance(item, (bool, int, float)):
+            row[field] = str(item)
+        else:
+            return None
+    return row
+
+
+class ScoringHandler(BaseHTTPRequestHandler):
+    """JSON endpoints over the server's shared processor."""
+
+    # Keep-alive, so clients don't pay a TCP handshake per trial
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are separate writes; with Nagle on, small responses wait for a delayed ACK (~40ms)
+    disable_nagle_algorithm = True
+    # Socket timeout: an idle keep-alive connection is closed instead of holding a worker
+    timeout = IDLE_TIMEOUT
+    server_version = 'TrialICPScoring/1.0'
+
+    def _send(self, status: int, body: bytes, content_type: str = 'application/json'):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, data):
+        self._send(status, json.dumps(data).encode('utf-8'))
+
+    def _error(self, status: int, message: str):
+        self._send_json(status, {'error': message})
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, {'status': 'ok'})
+        elif self.path == '/stats':
+            self._send_json(200, self.server.stats())
+        elif self.path == '/metrics':
+            self._send(200, REGISTRY.render().encode('utf-8'), CONTENT_TYPE)
+        else:
+            self._error(404, f'Unknown path: {self.path}')
+
+    def do_POST(self):
+        started = time.perf_counter()
+        if self.path not in ('/score', '/score/batch'):
+            self._error(404, f'Unknown path: {self.path}')
+            return
+
+        header = self.headers.get('Content-Length')
+        if header is None:
+            self.close_connection = True
+            self._error(411, 'Content-Length required')
+            return
+        # Without a valid length the body can't be framed, so the connection is closed
+        if not header.strip().isdigit():
+            self.close_connection = True
+            self._error(400, f'Invalid Content-Length: {header!r}')
+            return
+        length = int(header)
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self._error(413, f'Request body over {MAX_BODY_BYTES} bytes')
+            return
+        try:
+            payload = json.loads(self.rfile.read(length) or b'null')
+        except ValueError as e:
+            self._error(400, f'Invalid JSON: {e}')
+            return
+
+        processor = self.server.processor
+        if self.path == '/score':
+            trial = trial_row(payload)
+            if trial is None:
+                self._error(400, 'Expected a JSON object of string, number or null values (one trial row)')
+                return
+            endpoint, rows = 'score', 1
+            trials = [trial]
+        else:
+            batch = payload.get('trials') if isinstance(payload, dict) else payload
+            if isinstance(batch, list) and len(batch) > MAX_BATCH_ROWS:
+                self._error(413, f'Batch over {MAX_BATCH_ROWS} rows')
+                return
+            trials = [trial_row(trial) for trial in batch] if isinstance(batch, list) else None
+            if trials is None or None in trials:
+                self._error(400, 'Expected a JSON list of trial rows (or {"trials": [...]}) '
+                                 'with string, number or null values')
+                return
+            endpoint, rows = 'batch', len(trials)
+
+        try:
+            scored = [processor.process_trial(trial) for trial in trials]
+        except Exception as e:
+            self.log_error('Scoring failed: %r', e)
+            self._error(500, f'Scoring failed: {e}')
+            return
+        result = scored[0] if endpoint == 'score' else scored
+
+        self._send_json(200, result)
+        self.server.record(endpoint, time.perf_counter() - started, rows)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ScoringServer(HTTPServer):
+    """HTTP server handing connections to a bounded worker pool."""
+
+    # Connections not yet accepted
+    request_queue_size = 128
+
+
+    def __init__(self, address, processor: Optional[TrialICPProcessor] = None, workers: int = 8,
+                 verbose: bool = False):
+        super().__init__(address, ScoringHandler)
+        self.processor = processor or TrialICPProcessor()
+        self.workers = workers
+        self.verbose = verbose
+        self.pool = ThreadPoolExecutor(workers, thread_name_prefix='scoring')
+        # One connection per worker; more are turned away with a 503
+        self.slots = threading.BoundedSemaphore(workers)
+        self.requests = {'score': LatencyWindow(), 'batch': LatencyWindow()}
+        self.rows = LatencyWindow()
+        self.started_at = time.time()
+
+    def process_request(self, request, client_address):
+        # Wait briefly for a worker, but never block serve_forever for long (shutdown() waits on it)
+        if not self.slots.acquire(timeout=ACCEPT_WAIT):
+            try:
+                request.sendall(BUSY_RESPONSE)
+            except OSError:
+                pass
+            self.shutdown_request(request)
+            return
+        self.pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except ConnectionError:
+            # Client went away mid-request; nothing to answer
+            pass
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self.slots.release()
+
+    def record(self, endpoint: str, seconds: float, rows: int):
+        self.requests[endpoint].add(seconds)
+        self.rows.add(seconds / rows if rows else 0.0, rows)
+        REQUEST_SECONDS.observe(seconds, endpoint)
+        ROWS_SERVED.inc(endpoint, amount=rows)
+
+    def stats(self) -> Dict:
+        return {
+            'uptime_seconds': round(time.time() - self.started_at, 1),
+            'workers': self.workers,
+            'requests': {endpoint: window.summary() for endpoint, window in self.requests.items()},
+            'per_row': self.rows.summary(),
+        }
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def print_stats(stats: Dict):
+    print(f"\n{'='*60}")
+    print("SCORING SERVICE STATS")
+    print(f"{'='*60}")
+    for name, summary in list(stats['requests'].items()) + [('per row', stats['per_row'])]:
+        if 'p50_ms' not in summary:
+            print(f"  {name:<8} no requests")
+            continue
+        print(f"  {name:<8} n={summary['count']:<8} p50={summary['p50_ms']:.3f}ms "
+              f"p99={summary['p99_ms']:.3f}ms max={summary['max_ms']:.3f}ms")
+    print(f"{'='*60}")
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Serve trial scoring over local HTTP')
+    parser.add_argument('--host', default='127.0.0.1', help='Bind address (keep it local)')
+    parser.add_argument('--port', type=int, default=8765, help='Port')
+    parser.add_argument('--workers', type=int, default=8, help='Worker threads (concurrent connections)')
+    parser.add_argument('--verbose', action='store_true', help='Log every request')
+
+    args = parser.parse_args(argv)
+
+    server = ScoringServer((args.host, args.port), workers=args.workers, verbose=args.verbose)
+    print(f"✅ Scoring service on http://{args.host}:{server.server_address[1]} ({args.workers} workers)")
+    print("   POST /score, POST /score/batch, GET /stats, GET /health, GET /metrics")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print_stats(server.stats())
+
+
+if __name__ == '__main__':
+    main()
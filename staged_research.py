@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Staged Research Pipeline
+
+Runs the researcher's page fetching and HTML parsing as separate stages so
+neither waits on the other:
+
+    scheduler -> fetch queue -> fetcher threads -> parse queue (bounded) -> parser processes
+                     ^                                                          |
+                     +----------- follow-up pages (locations, careers, ATS) ----+
+
+- Fetchers (threads) only do network I/O. Each host is paced to one request
+  per host_period seconds (the sequential researcher paces all requests
+  globally), so different restaurants' sites are fetched concurrently.
+- Parsers (a process pool) run the page_extractors functions on raw HTML,
+  outside the GIL.
+- The parse queue is bounded and at most `parsers * 2` parses are in flight:
+  when parsing falls behind, fetchers block on the queue instead of piling
+  up pages (backpressure). At most `max_in_flight` trials are open at once.
+
+Each trial goes through the same steps as RestaurantResearcher.research_trial
+(start_research, homepage, locations/careers pages, ATS listing,
+finish_research) and produces the same result. Results are yielded as trials
+complete.
+
+parsers=0 parses inline on the fetcher thread (the old fetch-then-parse
+shape), which the benchmark uses as its baseline:
+
+    python benchmark_research.py --trials 200 --latency 0.05
+"""
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from automated_researcher import (RATE_LIMIT_WAIT_SECONDS, HostRateLimiter, RestaurantResearcher, WebScraper,
+                                  empty_website_data)
+from page_extractors import PARSE_SECONDS, run_extractor
+import progress
+
+
+# Location and careers notes are added in this order, as in research_trial
+STEP_ORDER = ('locations', 'careers')
+
+
+class TrialJob:
+    """One trial's research while its pages are in flight."""
+
+    def __init__(self, trial: Dict, priority: int, deadline: Optional[float]):
+        self.trial = trial
+        self.priority = priority
+        self.deadline = deadline
+        self.research: Dict = {}
+        self.group: Optional[Dict] = None
+        self.website = ''
+        self.pending = 0
+        self.notes: Dict[str, str] = {}
+        # Set once the homepage is in; research that ends earlier skips validation
+        self.validate = False
+
+
+class StagedResearch:
+    """Researches trials with thread fetchers feeding process-pool parsers."""
+
+    def __init__(self, researcher: RestaurantResearcher, fetchers: int = 8, parsers: Optional[int] = None,
+                 queue_size: Optional[int] = None, host_period: float = 2.0,
+                 max_in_flight: Optional[int] = None):
+        self.researcher = researcher
+        self.fetchers = fetchers
+        self.parsers = (os.cpu_count() or 2) if parsers is None else parsers
+        self.queue_size = queue_size or max(self.parsers, 1) * 4
+        self.max_in_flight = max_in_flight or fetchers * 2
+        self.limiter = HostRateLimiter(host_period)
+
+    # Fetch stage
+
+    def _fetch_loop(self, fetch_queue: queue.Queue, parse_queue: queue.Queue, done_queue: queue.Queue):
+        scraper = WebScraper(domains=self.researcher.domains)
+        while True:
+            item = fetch_queue.get()
+            if item is None:
+                return
+            job, kind, url, timeout = item
+            if kind != 'ats' and scraper.skip_fetch(url):
+                done_queue.put((job, kind, None, None))
+                continue
+
+            RATE_LIMIT_WAIT_SECONDS.observe(self.limiter.wait(url))
+            if kind == 'ats':
+                done_queue.put((job, kind, scraper.request_json(url, timeout), None))
+                continue
+
+            html = scraper.request_html(url, timeout)
+            if not html:
+                done_queue.put((job, kind, None, None))
+            elif self.parsers:
+                # Blocks while the parsers are behind
+                parse_queue.put((job, kind, url, html))
+            else:
+                try:
+                    result, _ = run_extractor(kind, html, url)
+                except Exception as e:
+                    done_queue.put((job, kind, None, e))
+                    continue
+                done_queue.put((job, kind, result, None))
+
+    # Parse stage
+
+    def _dispatch_loop(self, pool: ProcessPoolExecutor, parse_queue: queue.Queue, done_queue: queue.Queue):
+        slots = threading.Semaphore(self.parsers * 2)
+        while True:
+            item = parse_queue.get()
+            if item is None:
+                return
+            job, kind, url, html = item
+
+            slots.acquire()
+            future = pool.submit(run_extractor, kind, html, url)
+
+            def parsed(future, job=job, kind=kind):
+                slots.release()
+                try:
+                    result, seconds = future.result()
+                except Exception as e:
+                    done_queue.put((job, kind, None, e))
+                    return
+                PARSE_SECONDS.observe(seconds)
+                done_queue.put((job, kind, result, None))
+
+            future.add_done_callback(parsed)
+
+    # Coordinator
+
+    def _fetch(self, fetch_queue: queue.Queue, job: TrialJob, kind: str, url: str, step: str) -> bool:
+        """Queue a page fetch for a job, unless its deadline has passed."""
+        timeout = self.researcher._fetch_timeout(job.deadline)
+        if timeout is None:
+            job.research['research_status'] = 'Partial - Deadline reached'
+            job.notes[step] = f'Trial deadline reached before {step} page'
+            return False
+        job.pending += 1
+        fetch_queue.put((job, kind, url, timeout))
+        return True
+
+    def _careers_board(self, fetch_queue: queue.Queue, job: TrialJob, board: Tuple[str, str]) -> bool:
+        detector = self.researcher.ats_detector
+        progress.detail(f"    💼 {detector.provider_name(board[0])} job board detected ({board[1]})")
+        return self._fetch(fetch_queue, job, 'ats', detector.listing_url(*board), 'careers')
+
+    def _start(self, fetch_queue: queue.Queue, job: TrialJob) -> bool:
+        """Run the pre-fetch checks and queue the homepage. False if the trial is already done."""
+        progress.detail(f"\n  🔍 Researching: {job.trial.get('company_name', 'Unknown')}")
+
+        job.research, job.group, done = self.researcher.start_research(job.trial)
+        if done:
+            return False
+
+        website = job.research['website']
+        job.website = website if website.startswith('http') else 'https://' + website
+
+        timeout = self.researcher._fetch_timeout(job.deadline)
+        if timeout is None:
+            job.research.update(empty_website_data())
+            job.research['research_status'] = 'Partial - Deadline reached'
+            job.research['research_notes'].append('Trial deadline reached before website fetch')
+            return False
+
+        progress.detail(f"    🌐 Scraping website: {job.website}")
+        job.pending += 1
+        fetch_queue.put((job, 'homepage', job.website, timeout))
+        return True
+
+    def _handle(self, fetch_queue: queue.Queue, job: TrialJob, kind: str, result) -> bool:
+        """Apply one fetched/parsed page to its job. True once the job is complete."""
+        research = job.research
+        job.pending -= 1
+
+        if kind == 'homepage':
+            website_data = empty_website_data()
+            if result is None:
+                research.update(website_data)
+                research['research_notes'].append('Website not accessible')
+                return True
+
+            website_data['website_accessible'] = True
+            website_data.update(result)
+            research.update(website_data)
+            job.validate = True
+
+            if research['has_locations_page']:
+                self._fetch(fetch_queue, job, 'locations', research.get('locations_url', ''), 'locations')
+            if research['has_careers_page']:
+                careers_url = research.get('careers_url', '')
+                # Careers links often point straight at a hosted job board
+                board = self.researcher.ats_detector.detect(careers_url)
+                if board:
+                    self._careers_board(fetch_queue, job, board)
+                else:
+                    self._fetch(fetch_queue, job, 'careers', careers_url, 'careers')
+
+        elif kind == 'locations':
+            research['actual_locations_found'] = result or 0
+            job.notes['locations'] = f"Found {research['actual_locations_found']} locations on website"
+
+        elif kind == 'careers':
+            board, jobs_found = result if result is not None else (None, 0)
+            if board:
+                # Embedded job board - ask the provider's JSON endpoint
+                self._careers_board(fetch_queue, job, board)
+            else:
+                research['job_postings_count'] = jobs_found
+                job.notes['careers'] = f'Found {jobs_found} job postings'
+
+        elif kind == 'ats':
+            jobs_found = 0 if result is None else self.researcher.ats_detector.count_jobs(result)
+            research['job_postings_count'] = jobs_found
+            job.notes['careers'] = f'Found {jobs_found} job postings'
+
+        return job.pending == 0
+
+    def _complete(self, job: TrialJob) -> Dict:
+        if job.validate:
+            job.research['research_notes'].extend(job.notes[step] for step in STEP_ORDER if step in job.notes)
+            self.researcher.finish_research(job.trial, job.research, job.group)
+        return job.research
+
+    def research(self, scheduled: Iterable[Tuple[Dict, int, Optional[float]]]) -> Iterator[Tuple[Dict, int, Dict]]:
+        """
+        Research (trial, priority, deadline) items, e.g. from a ResearchScheduler.
+
+        Yields (trial, priority, research) as trials complete. New trials are
+        only pulled from `scheduled` when a slot frees up, so a scheduler's
+        budget still bounds the run.
+        """
+        fetch_queue: queue.Queue = queue.Queue()
+        parse_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        done_queue: queue.Queue = queue.Queue()
+
+        pool = None
+        threads: List[threading.Thread] = []
+        if self.parsers:
+            # spawn: forking a process that already runs fetcher threads isn't safe
+            pool = ProcessPoolExecutor(self.parsers, mp_context=multiprocessing.get_context('spawn'))
+        for _ in range(self.fetchers):
+            threads.append(threading.Thread(target=self._fetch_loop, args=(fetch_queue, parse_queue, done_queue),
+                                            daemon=True))
+        dispatcher = None
+        if pool is not None:
+            dispatcher = threading.Thread(target=self._dispatch_loop, args=(pool, parse_queue, done_queue),
+                                          daemon=True)
+            dispatcher.start()
+        for thread in threads:
+            thread.start()
+
+        scheduled = iter(scheduled)
+        exhausted = False
+        open_jobs = 0
+
+        try:
+            while True:
+                # Admit trials while there are free slots
+                while not exhausted and open_jobs < self.max_in_flight:
+                    try:
+                        trial, priority, deadline = next(scheduled)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    job = TrialJob(trial, priority, deadline)
+                    if self._start(fetch_queue, job):
+                        open_jobs += 1
+                    else:
+                        yield trial, priority, self._complete(job)
+
+                if open_jobs == 0:
+                    return
+
+                job, kind, result, error = done_queue.get()
+                if error is not None:
+                    # A page that can't be parsed counts as not fetched; the rest of the run goes on
+                    progress.detail(f"  ⚠️  Error parsing {kind} page for {job.trial.get('company_name', 'Unknown')}: "
+                                    f"{str(error)[:100]}")
+                    job.research['research_notes'].append(f'Could not parse {kind} page: {str(error)[:100]}')
+                    result = None
+                if self._handle(fetch_queue, job, kind, result):
+                    open_jobs -= 1
+                    yield job.trial, job.priority, self._complete(job)
+
+        finally:
+            # Drop fetches not started yet, then let the stages drain and stop
+            while True:
+                try:
+                    fetch_queue.get_nowait()
+                except queue.Empty:
+                    break
+            for _ in threads:
+                fetch_queue.put(None)
+            for thread in threads:
+                thread.join()
+            if dispatcher is not None:
+                parse_queue.put(None)
+                dispatcher.join()
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
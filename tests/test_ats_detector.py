@@ -0,0 +1,41 @@
+import pytest
+
+from ats_detector import ATSDetector
+from ats_standin import check_provider, load_fixtures, standin_bases, start_standin_server
+from automated_researcher import WebScraper
+
+
+FIXTURES = load_fixtures()
+
+
+@pytest.fixture(scope='module')
+def standin():
+    server = start_standin_server(FIXTURES)
+    yield ATSDetector(api_bases=standin_bases(server.server_address[1], FIXTURES))
+    server.shutdown()
+
+
+@pytest.mark.parametrize('provider', sorted(FIXTURES))
+def test_provider_against_standin(standin, provider):
+    assert check_provider(standin, WebScraper(), provider, FIXTURES[provider]) == []
+
+
+def test_every_enabled_provider_has_a_fixture():
+    assert set(ATSDetector().providers()) <= set(FIXTURES)
+
+
+@pytest.mark.parametrize('text', [
+    'https://notjobs.lever.co/acme',
+    'https://myboards.greenhouse.io/acme',
+    'https://acme.bamboohr.com.example.net/careers',
+    'https://x.jobs.ashbyhq.com/acme',
+])
+def test_lookalike_hosts_are_ignored(text):
+    assert ATSDetector().detect(text) is None
+
+
+def test_harri_is_experimental():
+    assert ATSDetector().detect('https://harri.com/harbor-grill') is None
+    assert ATSDetector(experimental=True).detect('https://harri.com/harbor-grill') == ('harri', 'harbor-grill')
+    assert ATSDetector(experimental=True).detect('https://harri.com/careers') is None
+    assert ATSDetector(experimental=True).detect('https://notharri.com/harbor-grill') is None
@@ -0,0 +1,39 @@
+import pytest
+
+from maps_retier import MapsRetierer
+
+
+@pytest.mark.parametrize('category', [
+    'Barber shop', 'Kitchen remodeler', 'Fork lift dealer', 'Vegetable wholesaler',
+    'Bakery equipment supplier', 'Restaurant supply store', 'Hair salon',
+])
+def test_non_food_categories(category):
+    assert not MapsRetierer({}).is_food(category)
+
+
+@pytest.mark.parametrize('category', [
+    'Restaurant', 'Italian restaurant', 'Bar & grill', 'Coffee shop', 'Bakery',
+    'Ice cream shop', 'Pizza delivery', 'Wine bar', 'Barber shop, Cafe',
+])
+def test_food_categories(category):
+    assert MapsRetierer({}).is_food(category)
+
+
+def test_non_restaurant_clears_scoring_fields():
+    row = {
+        'company_name': 'Harbor Cuts', 'location_place_ids': 'ChIJa',
+        'is_restaurant': 'Yes', 'restaurant_type': 'FSR', 'num_locations': '2-5',
+        'employees_per_location': '35', 'tier': 'Tier 2', 'tier_reason': 'FSR, 2-5 locations',
+        'research_notes': 'Automated analysis - manual research recommended',
+    }
+    snapshots = {'ChIJa': {'placeId': 'ChIJa', 'title': 'Harbor Cuts', 'categoryName': 'Barber shop',
+                           'reviewsCount': 120, 'totalScore': 4.8}}
+    result, status = MapsRetierer(snapshots).retier(row)
+    assert status == 'Re-tiered'
+    assert result == {
+        'company_name': 'Harbor Cuts', 'location_place_ids': 'ChIJa',
+        'is_restaurant': 'No', 'restaurant_type': '', 'num_locations': '', 'employees_per_location': '',
+        'tier': 'Tier 5', 'tier_reason': 'Neutral: Non-restaurant business', 'research_notes': '',
+        'original_tier': 'Tier 2', 'maps_places_found': 1, 'maps_category': 'Barber shop',
+        'maps_rating': 4.8, 'maps_review_count': 120, 'maps_price': '', 'maps_website': '',
+    }
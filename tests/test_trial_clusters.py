@@ -0,0 +1,40 @@
+from group_index import GroupIndex
+from trial_clusters import cluster_trials
+
+
+def test_social_pages_do_not_link_trials():
+    trials = [
+        {'company_name': 'Harbor Grill', 'email': 'owner@gmail.com', 'website': 'https://www.facebook.com/harborgrill'},
+        {'company_name': 'Taco Loco', 'email': 'tacos@yahoo.com', 'website': 'https://facebook.com/tacoloco'},
+    ]
+    clusters = cluster_trials(trials)
+    assert len(clusters) == 2
+    assert all(not cluster['members'] and not cluster['domains'] for cluster in clusters)
+
+
+def test_own_domains_still_link_trials():
+    trials = [
+        {'company_name': 'Harbor Grill Downtown', 'email': 'gm@harborgrill.com', 'website': ''},
+        {'company_name': 'Harbor Grill Uptown', 'email': '', 'website': 'https://www.harborgrill.com/uptown'},
+    ]
+    clusters = cluster_trials(trials)
+    assert len(clusters) == 1
+    assert clusters[0]['domains'] == ['harborgrill.com']
+
+
+def test_group_index_ignores_shared_hosts(tmp_path):
+    index = GroupIndex(str(tmp_path / 'group_index.json'))
+    index.add_group('Harbor Grill', websites=['https://www.facebook.com/harborgrill', 'https://www.doordash.com/store/1'])
+    assert not any(key.startswith('domain:') for key in index.keys)
+    assert index.find_group(website='https://facebook.com/tacoloco') is None
+
+
+def test_site_builder_subdomains_are_owned():
+    trials = [
+        {'company_name': 'Harbor Grill', 'email': '', 'website': 'https://harborgrill.carrd.co'},
+        {'company_name': 'Harbor Grill Uptown', 'email': '', 'website': 'harborgrill.carrd.co/uptown'},
+        {'company_name': 'Taco Loco', 'email': '', 'website': 'https://tacoloco.carrd.co'},
+        {'company_name': 'Pho Place', 'email': '', 'website': 'https://solo.to/phoplace'},
+    ]
+    clusters = cluster_trials(trials)
+    assert [cluster['domains'] for cluster in clusters] == [['harborgrill.carrd.co'], ['tacoloco.carrd.co'], []]
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Trial Clustering
+
+Many locations of one operator sign up as separate trials. Before research,
+trials are clustered by business email domain and website domain (free-mail
+addresses and social, delivery or parked websites never link trials), one
+representative per cluster is researched, and its findings are fanned out to
+the other members.
+
+Usage:
+    python trial_clusters.py --input data/output/scored_trials.csv --output data/output/trial_clusters.csv
+"""
+
+from typing import Dict, List, Optional
+
+from filter_best_trials import score_research_priority
+from group_index import email_domain, owned_domain
+from trial_io import read_rows, write_rows
+
+
+class UnionFind:
+    """Disjoint sets over trial indexes."""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, a: int, b: int):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            # Lower index stays root so cluster ids follow file order
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+
+def trial_domains(trial: Dict) -> List[str]:
+    """Business email domain and own website domain of a trial (deduplicated)."""
+    domains = [email_domain(trial.get('email', '')), owned_domain(trial.get('website', ''))]
+    return [d for d in dict.fromkeys(domains) if d]
+
+
+def cluster_trials(trials: List[Dict]) -> List[Dict]:
+    """
+    Group trials that share a business email or website domain.
+
+    Returns clusters in file order of their first member:
+        {'cluster_id', 'domains', 'representative', 'members'}
+    The representative is the member with the highest research priority.
+    """
+    sets = UnionFind(len(trials))
+    first_seen: Dict[str, int] = {}
+
+    for index, trial in enumerate(trials):
+        for domain in trial_domains(trial):
+            if domain in first_seen:
+                sets.union(first_seen[domain], index)
+            else:
+                first_seen[domain] = index
+
+    members: Dict[int, List[int]] = {}
+    for index in range(len(trials)):
+        members.setdefault(sets.find(index), []).append(index)
+
+    clusters = []
+    for cluster_number, (root, indexes) in enumerate(sorted(members.items()), 1):
+        cluster_members = [trials[i] for i in indexes]
+        representative = max(cluster_members, key=score_research_priority)
+        domains = list(dict.fromkeys(d for t in cluster_members for d in trial_domains(t)))
+
+        clusters.append({
+            'cluster_id': f'C{cluster_number:05d}',
+            'domains': domains,
+            'representative': representative,
+            'members': [t for t in cluster_members if t is not representative],
+        })
+
+    return clusters
+
+
+def summarize_clusters(clusters: List[Dict]) -> List[Dict]:
+    """One summary row per cluster."""
+    rows = []
+    for cluster in clusters:
+        rows.append({
+            'cluster_id': cluster['cluster_id'],
+            'domains': '; '.join(cluster['domains']),
+            'cluster_size': len(cluster['members']) + 1,
+            'representative': cluster['representative'].get('company_name', ''),
+            'representative_tier': cluster['representative'].get('tier', ''),
+            'members': ' | '.join(t.get('company_name', '') for t in cluster['members']),
+        })
+    return rows
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Cluster trials by business email and website domain')
+    parser.add_argument('--input', default='data/output/scored_trials.csv', help='Input CSV')
+    parser.add_argument('--output', default='data/output/trial_clusters.csv', help='Cluster summary CSV')
+
+    args = parser.parse_args(argv)
+
+    trials = list(read_rows(args.input))
+
+    clusters = cluster_trials(trials)
+    rows = summarize_clusters(clusters)
+
+    write_rows(rows, args.output)
+
+    multi = [c for c in clusters if c['members']]
+    saved = sum(len(c['members']) for c in clusters)
+
+    print(f"📊 Trials: {len(trials)}")
+    print(f"🔗 Clusters: {len(clusters)} ({len(multi)} with more than one trial)")
+    print(f"✂️  Research passes saved: {saved}")
+    for cluster in sorted(multi, key=lambda c: len(c['members']), reverse=True)[:10]:
+        print(f"  {cluster['cluster_id']} {', '.join(cluster['domains'])}: {len(cluster['members']) + 1} trials")
+    print(f"📄 Cluster summary saved to: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+trial-icp: single entry point for the trial ICP workflow.
+
+Each stage script is a subcommand taking the same flags as the script:
+
+    python trial_icp.py convert --input export.csv --output data/input/trials.csv
+    python trial_icp.py identify --input data/input/trials.csv
+    python trial_icp.py filter --input data/output/scored_trials.csv
+    python trial_icp.py next            # next 50 restaurants from the scored trials
+    python trial_icp.py next-leads      # next 50 leads from the priority queue
+    python trial_icp.py research --input data/output/priority_research_queue.csv --limit 20
+    python trial_icp.py validate --input data/output/scored_trials.csv --output data/output/validated.csv
+
+`pipeline` runs convert -> identify -> filter -> research in one process,
+passing rows in memory between stages. The classifier (and its entity
+resolver cache) and the researcher's HTTP session, ATS detector and group
+index are built once and shared by every stage:
+
+    python trial_icp.py pipeline --input export.csv --research 50 --budget 30m
+"""
+
+import importlib
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+
+# Subcommand -> (module, function, description). Modules are imported on
+# demand so stages that don't fetch anything don't need requests/bs4.
+COMMANDS = {
+    'convert': ('convert_trial_data', 'main', 'Convert a 7shifts trial export'),
+    'identify': ('identify_trial_icps', 'main', 'Identify restaurants and assign tiers'),
+    'filter': ('filter_best_trials', 'main', 'Build the priority research queue'),
+    'next': ('get_next_50_from_all_trials', 'get_next_50_restaurant_trials',
+             'Next 50 restaurants from the scored trials'),
+    'next-leads': ('process_next_50', 'get_next_50_leads', 'Next 50 leads from the priority queue'),
+    'research': ('automated_researcher', 'main', 'Research trials (websites, job boards, groups)'),
+    'validate': ('research_trial', 'main', 'Validate trials against all research sources'),
+    'groups': ('group_index', 'main', 'Build or query the restaurant group index'),
+    'clusters': ('trial_clusters', 'main', 'Cluster trials by business email / website domain'),
+    'queue': ('work_queue', 'main', 'Manage the research work queue'),
+    'evidence': ('evidence_store', 'main', 'Query the research evidence store'),
+    'transcode': ('trial_io', 'main', 'Convert trial rows between CSV (plain, gzip, zstd) and Arrow'),
+    'places': ('place_ids', 'main', 'Plan, resolve and cache Google place ID lookups'),
+    'retier': ('maps_retier', 'main', 'Re-tier trials from stored Google Maps snapshots'),
+    'confidence': ('confidence', 'main', 'Re-score stored research with confidence weights'),
+    'domains': ('domain_index', 'main', 'Build or query the domain classification index'),
+    'sample': ('sample_trials', 'main', 'Draw a stratified, seeded QA sample of scored trials'),
+    'diff': ('diff_runs', 'main', 'Tier / type transitions between two scoring runs'),
+    'watch': ('watch_trials', 'main', 'Score new rows as trial exports arrive in a folder'),
+    'serve': ('scoring_service', 'main', 'Serve trial scoring over local HTTP (single and batch)'),
+}
+
+EXPORT_COLUMN = 'Company / Account'
+
+
+def run_command(command: str, argv: List[str]):
+    """Run one stage with its own command-line flags."""
+    module_name, function_name, _ = COMMANDS[command]
+    function = getattr(importlib.import_module(module_name), function_name)
+
+    if function_name == 'main':
+        function(argv)
+    else:
+        if argv:
+            print(f"Error: {command} takes no arguments")
+            sys.exit(2)
+        function()
+
+
+def run_pipeline(argv: Optional[List[str]] = None):
+    """Convert, identify, filter and research in one process."""
+    import argparse
+
+    from convert_trial_data import convert_rows, read_trial_export
+    from filter_best_trials import print_priority_report, select_top_trials
+    from identify_trial_icps import TrialICPProcessor
+    from trial_io import is_arrow, read_rows, write_rows
+    from trial_record import write_records, write_tier_shards
+    from metrics import add_metrics_arguments, finish_metrics, start_metrics
+    import progress
+
+    parser = argparse.ArgumentParser(prog='trial-icp pipeline',
+                                     description='Run every stage in one process')
+    parser.add_argument('--input', required=True,
+                        help='7shifts trial export (or an already converted trials CSV)')
+    parser.add_argument('--output-dir', default='data/output', help='Where stage outputs are written')
+    parser.add_argument('--format', choices=['csv', 'csv.gz', 'csv.zst', 'arrow'], default='csv',
+                        help='Stage output format (arrow keeps column types; needs pyarrow)')
+    parser.add_argument('--tier-shards', action='store_true',
+                        help='Also write scored trials partitioned by tier into <output-dir>/scored_by_tier/')
+    parser.add_argument('--limit', type=int, help='Limit number of trials to process')
+    parser.add_argument('--entity-map', default='data/output/entity_ids.json',
+                        help='Company name -> entity_id map kept across runs (stable entity ids)')
+    parser.add_argument('--no-entity-map', action='store_true', help='Assign entity ids from this input alone')
+    parser.add_argument('--min-score', type=int, default=30, help='Minimum research priority score')
+    parser.add_argument('--queue-limit', type=int, help='Limit size of the priority research queue')
+    parser.add_argument('--research', type=int, default=50,
+                        help='Research the top N queued clusters; members get their representative\'s findings (0 to stop after filtering)')
+    parser.add_argument('--budget', help='Research wall-clock budget, e.g. 30m, 90s, 1h')
+    parser.add_argument('--trial-timeout', help='Per-trial research deadline, e.g. 20s')
+    parser.add_argument('--group-index', default='data/output/group_index.json',
+                        help='Restaurant group index JSON')
+    parser.add_argument('--no-group-index', action='store_true', help='Research every trial independently')
+    parser.add_argument('--no-cluster', action='store_true',
+                        help='Do not cluster trials by business email / website domain')
+    parser.add_argument('--evidence-db', default='data/output/evidence.db',
+                        help='SQLite evidence store updated with every research result')
+    parser.add_argument('--no-evidence-db', action='store_true', help='Do not update the evidence store')
+    parser.add_argument('--weights', help='JSON confidence weights file (defaults if omitted)')
+    parser.add_argument('--fetchers', type=int, default=0,
+                        help='Research with N fetcher threads feeding parser processes (0: one trial at a time)')
+    parser.add_argument('--parsers', type=int, help='Parser processes for --fetchers (default: CPU count)')
+    add_metrics_arguments(parser)
+    progress.add_progress_arguments(parser)
+
+    args = parser.parse_args(argv)
+    progress.configure(args.progress)
+    start_metrics(args)
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    started = time.time()
+
+    progress.info("=" * 70)
+    progress.info("TRIAL ICP PIPELINE")
+    progress.info("=" * 70)
+    progress.info()
+
+    # 1. Convert (skipped when the input is already in our format)
+    progress.info(f"📥 Reading trials from: {args.input}")
+    if is_arrow(args.input):
+        rows = list(read_rows(args.input))
+    else:
+        rows = read_trial_export(Path(args.input))
+    if args.limit:
+        rows = rows[:args.limit]
+    if rows and EXPORT_COLUMN in rows[0]:
+        rows = convert_rows(rows)
+        progress.info(f"✓ Converted {len(rows)} trials from the 7shifts export")
+
+    # 2. Identify and tier
+    processor = TrialICPProcessor(entity_map=None if args.no_entity_map else args.entity_map)
+    scored = processor.process_rows(rows)
+    write_records(scored, output_dir / f'scored_trials.{args.format}')
+    if args.tier_shards:
+        shard_suffix = '.csv.gz' if args.format == 'csv' else '.' + args.format
+        write_tier_shards(scored, output_dir / 'scored_by_tier', shard_suffix)
+    processor.print_summary(scored)
+
+    # 3. Priority research queue (only queued trials become dicts)
+    queue, total = select_top_trials(
+        (record.to_dict() for record in scored), min_score=args.min_score, limit=args.queue_limit
+    )
+    write_rows(queue, output_dir / f'priority_research_queue.{args.format}')
+    progress.info()
+    progress.info(f"📊 Total trials: {total}")
+    print_priority_report(queue, args.min_score)
+
+    # 4. Research the top of the queue
+    results = []
+    if args.research > 0 and queue:
+        from confidence import ConfidenceEngine
+        from automated_researcher import (
+            RestaurantResearcher, parse_duration, print_research_summary,
+            research_trials, write_cluster_summary, write_results,
+        )
+        from evidence_store import EvidenceStore
+        from group_index import GroupIndex
+
+        group_index = None if args.no_group_index else GroupIndex.load(args.group_index)
+        evidence_store = None if args.no_evidence_db else EvidenceStore(args.evidence_db)
+        researcher = RestaurantResearcher(group_index=group_index,
+                                          confidence=ConfidenceEngine.load(args.weights))
+        pipeline = None
+        if args.fetchers > 0:
+            from staged_research import StagedResearch
+            pipeline = StagedResearch(researcher, fetchers=args.fetchers, parsers=args.parsers)
+
+        results, clusters = research_trials(
+            researcher, queue,
+            limit=args.research,
+            budget_seconds=parse_duration(args.budget) if args.budget else None,
+            trial_seconds=parse_duration(args.trial_timeout) if args.trial_timeout else None,
+            cluster=not args.no_cluster,
+            evidence_store=evidence_store,
+            pipeline=pipeline,
+        )
+        if evidence_store is not None:
+            evidence_store.close()
+
+        write_results(results, output_dir / f'researched_trials.{args.format}')
+        researched_clusters = [c for c in clusters if 'research' in c]
+        if researched_clusters and not args.no_cluster:
+            write_cluster_summary(researched_clusters, output_dir / 'research_clusters.csv')
+        print_research_summary(results, researched_clusters, clustered=not args.no_cluster)
+
+    progress.info()
+    progress.info("=" * 70)
+    progress.info(f"✅ Pipeline finished in {time.time() - started:.1f}s")
+    progress.info(f"   {len(scored)} scored, {len(queue)} queued, {len(results)} researched")
+    progress.info(f"📄 Outputs in: {output_dir}")
+    finish_metrics(args)
+    progress.info("=" * 70)
+
+
+def print_usage():
+    print("usage: trial-icp <command> [options]")
+    print()
+    print("commands:")
+    print(f"  {'pipeline':<12} Run convert, identify, filter and research in one process")
+    for command, (_, _, description) in COMMANDS.items():
+        print(f"  {command:<12} {description}")
+    print()
+    print("Run 'trial-icp <command> --help' for a command's options.")
+
+
+def main(argv: Optional[List[str]] = None):
+    argv = sys.argv[1:] if argv is None else argv
+
+    if not argv or argv[0] in ('-h', '--help'):
+        print_usage()
+        return
+
+    command, rest = argv[0], argv[1:]
+    if command == 'pipeline':
+        run_pipeline(rest)
+    elif command in COMMANDS:
+        run_command(command, rest)
+    else:
+        print(f"Error: unknown command '{command}'")
+        print_usage()
+        sys.exit(2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Trial Row I/O
+
+Reads and writes stage outputs as CSV or, optionally, Arrow IPC. The format
+is picked from the file extension: .arrow / .feather / .ipc is Arrow,
+anything else CSV.
+
+Arrow keeps column types between stages: counts and scores stay integers,
+ratings floats and evidence lists lists, instead of being stringified into
+CSV and parsed again downstream. Arrow files are memory-mapped, so loading a
+1M-row intermediate (or reading a single column with read_columns) does not
+copy or parse the data.
+
+CSV files may be compressed: .csv.gz (gzip) and .csv.zst (zstd) are read and
+written as streams through the codec, so archived exports never need to be
+decompressed on disk. write_partitions writes one shard per partition (e.g.
+per tier) in parallel; the codecs release the GIL while compressing.
+
+Arrow support needs pyarrow (pip install pyarrow), zstd needs zstandard
+(pip install zstandard); plain and gzip CSV need nothing.
+
+Usage:
+    python identify_trial_icps.py --input trials.csv --output data/output/scored_trials.arrow
+    python filter_best_trials.py --input data/output/scored_trials.arrow
+    python trial_io.py data/output/scored_trials.arrow data/output/scored_trials.csv.zst
+"""
+
+import csv
+import gzip
+import io
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TextIO
+
+
+ARROW_SUFFIXES = ('.arrow', '.feather', '.ipc')
+COMPRESSION_SUFFIXES = {'.gz': 'gzip', '.zst': 'zstd'}
+
+# Levels that favour speed: large runs are I/O-bound, not space-bound
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+# Rows per Arrow record batch
+BATCH_SIZE = 65536
+
+# Columns written as integers / floats when every value parses
+INT_COLUMNS = {
+    'employees_per_location', 'research_priority_score', 'confidence_score',
+    'actual_locations_found', 'job_postings_count', 'active_job_postings',
+    'review_count', 'cluster_size', 'Employee Count', 'Number of Locations',
+}
+FLOAT_COLUMNS = {'rating'}
+
+
+def is_arrow(path) -> bool:
+    return Path(path).suffix.lower() in ARROW_SUFFIXES
+
+
+def compression(path) -> Optional[str]:
+    """'gzip', 'zstd' or None, from the file extension."""
+    return COMPRESSION_SUFFIXES.get(Path(path).suffix.lower())
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError('.zst files need zstandard: pip install zstandard') from None
+    return zstandard
+
+
+def open_text(path, mode: str = 'r', encoding: str = 'utf-8') -> TextIO:
+    """Open a text file for CSV reading/writing/appending, streaming through gzip or zstd by extension."""
+    codec = compression(path)
+    if codec == 'gzip':
+        return gzip.open(path, mode + 't', compresslevel=GZIP_LEVEL, encoding=encoding, newline='')
+    if codec == 'zstd':
+        zstandard = _zstandard()
+        if 'r' in mode:
+            # Appended files are several zstd frames; read them all
+            reader = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), read_across_frames=True,
+                                                                closefd=True)
+            return io.TextIOWrapper(reader, encoding=encoding, newline='')
+        return zstandard.open(path, mode + 't', cctx=zstandard.ZstdCompressor(level=ZSTD_LEVEL),
+                              encoding=encoding, newline='')
+    return open(path, mode, encoding=encoding, newline='')
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+    except ImportError:
+        raise ImportError('Arrow files need pyarrow: pip install pyarrow') from None
+    return pyarrow
+
+
+def _parse_int(value) -> Optional[int]:
+    if value is None or value == '':
+        return None
+    if isinstance(value, bool):
+        raise ValueError(value)
+    if isinstance(value, int):
+        return value
+    return int(str(value).strip())
+
+
+def _parse_float(value) -> Optional[float]:
+    if value is None or value == '':
+        return None
+    return float(value)
+
+
+def _to_list(value) -> List[str]:
+    if value is None or value == '':
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(item) for item in value]
+    return [str(value)]
+
+
+def _to_str(value) -> str:
+    return '' if value is None else str(value)
+
+
+def _parses(parse, values) -> bool:
+    try:
+        for value in values:
+            parse(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def column_converters(rows: List[Dict], fieldnames: List[str]) -> Dict:
+    """Pick (arrow type, converter) per column from the values it holds."""
+    pa = _pyarrow()
+    converters = {}
+
+    for field in fieldnames:
+        values = [row.get(field) for row in rows]
+
+        if field in INT_COLUMNS and _parses(_parse_int, values):
+            converters[field] = (pa.int64(), _parse_int)
+        elif field in FLOAT_COLUMNS and _parses(_parse_float, values):
+            converters[field] = (pa.float64(), _parse_float)
+        elif any(isinstance(value, (list, tuple)) for value in values):
+            converters[field] = (pa.list_(pa.string()), _to_list)
+        elif any(isinstance(value, bool) for value in values) and \
+                all(isinstance(value, bool) or value is None for value in values):
+            converters[field] = (pa.bool_(), lambda value: value)
+        else:
+            converters[field] = (pa.string(), _to_str)
+
+    return converters
+
+
+def write_arrow(rows: List[Dict], path, fieldnames: Optional[List[str]] = None):
+    """Write rows as an Arrow IPC file with per-column types."""
+    pa = _pyarrow()
+    fieldnames = fieldnames or list(dict.fromkeys(key for row in rows for key in row))
+    converters = column_converters(rows, fieldnames)
+    schema = pa.schema([(field, converters[field][0]) for field in fieldnames])
+
+    with pa.OSFile(str(path), 'wb') as sink:
+        with pa.ipc.new_file(sink, schema) as writer:
+            for start in range(0, len(rows), BATCH_SIZE):
+                batch = rows[start:start + BATCH_SIZE]
+                arrays = [
+                    pa.array([converters[field][1](row.get(field)) for row in batch], type=converters[field][0])
+                    for field in fieldnames
+                ]
+                writer.write_batch(pa.record_batch(arrays, schema=schema))
+
+
+def read_arrow_table(path):
+    """Memory-mapped Arrow table (no copy of the column data)."""
+    pa = _pyarrow()
+    return pa.ipc.open_file(pa.memory_map(str(path), 'r')).read_all()
+
+
+def read_columns(path, columns: List[str]) -> Dict:
+    """Selected columns of an Arrow file as zero-copy Arrow arrays."""
+    table = read_arrow_table(path)
+    return {column: table.column(column) for column in columns}
+
+
+def read_rows(path) -> Iterator[Dict]:
+    """Stream rows as dicts from a CSV or Arrow file."""
+    if is_arrow(path):
+        pa = _pyarrow()
+        reader = pa.ipc.open_file(pa.memory_map(str(path), 'r'))
+        for i in range(reader.num_record_batches):
+            yield from reader.get_batch(i).to_pylist()
+        return
+
+    with open_text(path) as f:
+        yield from csv.DictReader(f)
+
+
+def write_rows(rows: List[Dict], path, fieldnames: Optional[List[str]] = None):
+    """Write rows to CSV or Arrow, depending on the file extension."""
+    if not rows:
+        return
+    if is_arrow(path):
+        write_arrow(rows, path, fieldnames)
+        return
+
+    fieldnames = fieldnames or list(dict.fromkeys(key for row in rows for key in row))
+    with open_text(path, 'w') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def append_rows(rows: Iterable[Dict], path, fieldnames: Optional[List[str]] = None):
+    """
+    Append rows to a CSV file, keeping its existing columns.
+
+    A new (or empty) file gets a header first. Compressed files grow by one
+    gzip member / zstd frame per append, which open_text reads straight through.
+    """
+    if is_arrow(path):
+        raise ValueError(f'Cannot append to an Arrow file: {path}')
+
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return
+
+    existing = None
+    if Path(path).exists() and Path(path).stat().st_size:
+        with open_text(path) as f:
+            existing = next(csv.reader(f), None)
+
+    with open_text(path, 'a') as f:
+        writer = csv.DictWriter(f, fieldnames=existing or fieldnames or list(first), extrasaction='ignore')
+        if existing is None:
+            writer.writeheader()
+        writer.writerow(first)
+        writer.writerows(rows)
+
+
+def partition_name(value) -> str:
+    """File-name-safe partition label ('Tier 1' -> 'tier_1')."""
+    return re.sub(r'[^a-z0-9]+', '_', str(value or '').lower()).strip('_') or 'none'
+
+
+def partition_rows(rows: Iterable, key: Callable) -> Dict[str, List]:
+    """Group rows by partition_name(key(row)), keeping row order within each partition."""
+    partitions: Dict[str, List] = {}
+    for row in rows:
+        partitions.setdefault(partition_name(key(row)), []).append(row)
+    return partitions
+
+
+def write_partitions(partitions: Dict[str, List], directory, suffix: str = '.csv.gz',
+                     writer: Optional[Callable] = None, workers: Optional[int] = None) -> Dict[str, Path]:
+    """
+    Write each partition to <directory>/<name><suffix>, shards in parallel.
+
+    writer(rows, path) defaults to write_rows. Returns {name: path}.
+    """
+    writer = writer or write_rows
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = {name: directory / f'{name}{suffix}' for name in partitions}
+
+    workers = workers or min(len(partitions), os.cpu_count() or 1) or 1
+    with ThreadPoolExecutor(workers) as pool:
+        futures = [pool.submit(writer, rows, paths[name]) for name, rows in partitions.items()]
+        for future in futures:
+            future.result()
+    return paths
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Convert trial rows between CSV (plain, .gz, .zst) and Arrow')
+    parser.add_argument('input', help='Input file (.csv, .csv.gz, .csv.zst or .arrow)')
+    parser.add_argument('output', help='Output file (.csv, .csv.gz, .csv.zst or .arrow)')
+
+    args = parser.parse_args(argv)
+
+    rows = list(read_rows(args.input))
+    write_rows(rows, args.output)
+    print(f"✅ Wrote {len(rows)} rows to: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
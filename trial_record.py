@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Scored Trial Records
+
+Compact in-memory form of a scored trial. Instead of copying the input row
+and adding string columns to it, a TrialRecord keeps a reference to the
+input row plus small integer codes for tier, restaurant type, location
+bucket and tier reason (each distinct value is stored once, in a code
+table), and the employee estimate as an int. Records become dicts only at
+the output boundary (CSV writing, filtering), via to_dict().
+"""
+
+import csv
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from trial_io import append_rows, is_arrow, open_text, partition_rows, write_arrow, write_partitions
+
+
+class CodeTable:
+    """Interns string values as small integer codes (safe to share between threads)."""
+
+    def __init__(self, values: Iterable[str] = ()):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+        self.lock = threading.Lock()
+        for value in values:
+            self.code(value)
+
+    def code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            # Only new values take the lock; the value is stored before its code is published
+            with self.lock:
+                code = self.codes.get(value)
+                if code is None:
+                    self.values.append(value)
+                    code = self.codes[value] = len(self.values) - 1
+        return code
+
+    def __getitem__(self, code: int) -> str:
+        return self.values[code]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+TIERS = CodeTable(['Tier 1', 'Tier 2', 'Tier 3', 'Tier 4', 'Tier 5'])
+RESTAURANT_TYPES = CodeTable(['Unknown', 'FSR', 'QSR', 'Fast Casual', 'Cafe/Coffee'])
+LOCATION_BUCKETS = CodeTable(['1', '2-5', '6-15', '16+'])
+# Open-ended: reasons embed the restaurant type, so they're added as seen
+TIER_REASONS = CodeTable()
+
+RESEARCH_NOTE = 'Automated analysis - manual research recommended'
+
+# Columns added to the input row, in output order
+OUTPUT_FIELDS = [
+    'is_restaurant', 'restaurant_type', 'num_locations', 'employees_per_location',
+    'tier', 'tier_reason', 'research_notes', 'entity_id',
+]
+
+
+class TrialRecord:
+    """A scored trial: the input row plus coded scoring fields."""
+
+    __slots__ = ('row', 'restaurant', 'type_code', 'locations_code', 'employees',
+                 'tier_code', 'reason_code', 'entity_id')
+
+    def __init__(self, row: Dict[str, str], restaurant: bool, tier: str, tier_reason: str,
+                 restaurant_type: Optional[str] = None, num_locations: Optional[str] = None,
+                 employees: Optional[int] = None, entity_id: str = ''):
+        self.row = row
+        self.restaurant = restaurant
+        self.type_code = -1 if restaurant_type is None else RESTAURANT_TYPES.code(restaurant_type)
+        self.locations_code = -1 if num_locations is None else LOCATION_BUCKETS.code(num_locations)
+        self.employees = employees
+        self.tier_code = TIERS.code(tier)
+        self.reason_code = TIER_REASONS.code(tier_reason)
+        self.entity_id = entity_id
+
+    @property
+    def company_name(self) -> str:
+        return self.row.get('company_name', '')
+
+    @property
+    def is_restaurant(self) -> str:
+        return 'Yes' if self.restaurant else 'No'
+
+    @property
+    def tier(self) -> str:
+        return TIERS[self.tier_code]
+
+    @property
+    def tier_reason(self) -> str:
+        return TIER_REASONS[self.reason_code]
+
+    @property
+    def restaurant_type(self) -> Optional[str]:
+        return None if self.type_code < 0 else RESTAURANT_TYPES[self.type_code]
+
+    @property
+    def num_locations(self) -> Optional[str]:
+        return None if self.locations_code < 0 else LOCATION_BUCKETS[self.locations_code]
+
+    def to_dict(self, typed: bool = False) -> Dict:
+        """
+        The scored row as produced before records existed (input columns first).
+
+        typed keeps employees_per_location an int (for Arrow output).
+        """
+        result = dict(self.row)
+        result['is_restaurant'] = self.is_restaurant
+
+        if not self.restaurant:
+            result['tier'] = self.tier
+            result['tier_reason'] = self.tier_reason
+        else:
+            result['restaurant_type'] = self.restaurant_type
+            result['num_locations'] = self.num_locations
+            result['employees_per_location'] = self.employees if typed else str(self.employees)
+            result['tier'] = self.tier
+            result['tier_reason'] = self.tier_reason
+            result['research_notes'] = RESEARCH_NOTE
+
+        if self.entity_id:
+            result['entity_id'] = self.entity_id
+        return result
+
+
+def record_fieldnames(records: List[TrialRecord]) -> List[str]:
+    """Output columns: the input columns followed by the scoring columns."""
+    input_fields = list(dict.fromkeys(key for record in records[:1] for key in record.row))
+    return input_fields + [field for field in OUTPUT_FIELDS if field not in input_fields]
+
+
+def write_records(records: List[TrialRecord], output_path: Path):
+    """Write records to CSV (converting one row at a time) or Arrow."""
+    if not records:
+        return
+    if is_arrow(output_path):
+        write_arrow([record.to_dict(typed=True) for record in records], output_path, record_fieldnames(records))
+        return
+    with open_text(output_path, 'w') as f:
+        writer = csv.DictWriter(f, fieldnames=record_fieldnames(records), extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(record.to_dict() for record in records)
+
+
+def append_records(records: List[TrialRecord], output_path: Path):
+    """Append records to a CSV output (header only if the file is new)."""
+    if records:
+        append_rows((record.to_dict() for record in records), output_path, record_fieldnames(records))
+
+
+def write_tier_shards(records: List[TrialRecord], directory: Path, suffix: str = '.csv.gz',
+                      workers: Optional[int] = None) -> Dict[str, Path]:
+    """Write records partitioned by tier (tier_1.csv.gz, ...), one shard per thread."""
+    return write_partitions(partition_rows(records, lambda record: record.tier), directory, suffix,
+                            writer=write_records, workers=workers)
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Watch-Folder Scoring
+
+Long-running mode for exports that land in data/input several times a day.
+The classifier (TrialICPProcessor and its entity resolver cache), the domain
+index and, with --research, the researcher (HTTP session, group index,
+evidence store) are built once and stay warm. Each poll only reads what is
+new:
+
+- A plain CSV is read from the byte offset where the last poll stopped, so
+  rows appended to an export are the only rows parsed. A trailing line
+  without a newline (a write in progress) waits for the next poll.
+- Compressed exports (.csv.gz / .csv.zst) can't be resumed mid-stream; a
+  changed file is streamed again and the rows already scored are skipped.
+- A file that shrinks or whose header changes was replaced: all its rows
+  are new.
+- Files are left alone until they have not been modified for --settle
+  seconds, so half-copied exports aren't read.
+- A CSV is cut after its last complete record, so a quoted field with a
+  line break that is still being written waits for the next poll too.
+- A batch's outputs are only appended once the whole batch (scoring and
+  research) succeeded, and the file's progress only moves forward once they
+  are all appended. A batch that fails is read again on the next poll with
+  nothing of it written; outputs whose append failed are appended on the
+  next poll, without redoing the ones already written.
+
+New rows are converted (7shifts exports), scored and appended to the scored
+output; queue-worthy ones are appended to the priority research queue and,
+with --research N, the top N of each batch are researched and appended to
+the researched output. Per-file progress is kept in a state file, so a
+restarted watcher picks up where it stopped.
+
+Changes are found by polling (one stat per file per --interval), which works
+on every platform and on network shares where inotify doesn't.
+
+Entity ids come from the same persisted entity map as `identify`
+(--entity-map), so a company name seen before keeps its id. A new spelling
+is only fuzzy-matched against the names in its own batch, so it gets a new
+id if the company's other spellings arrived in earlier batches, until the
+next full `identify` run.
+
+Usage:
+    python watch_trials.py --input-dir data/input --output-dir data/output
+    python trial_icp.py watch --research 10 --interval 30
+"""
+
+import csv
+import io
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from convert_trial_data import convert_rows
+from domain_index import default_index
+from entity_resolution import DEFAULT_ID_MAP_PATH
+from filter_best_trials import select_top_trials
+from identify_trial_icps import TrialICPProcessor
+import progress
+from trial_icp import EXPORT_COLUMN
+from trial_io import append_rows, compression, read_rows
+from trial_record import append_records
+
+
+DEFAULT_STATE_PATH = 'data/output/watch_state.json'
+WATCH_SUFFIXES = ('.csv', '.csv.gz', '.csv.zst')
+
+
+def watched_files(directory: Path) -> List[Path]:
+    """CSV exports in a directory (plain or compressed), by name."""
+    return sorted(
+        path for path in directory.iterdir()
+        if path.is_file() and path.name.lower().endswith(WATCH_SUFFIXES)
+    )
+
+
+def _decode(data: bytes) -> str:
+    try:
+        return data.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        return data.decode('latin-1')
+
+
+def read_csv_from(path: Path, offset: Optional[int], header: Optional[List[str]]) -> Tuple[List[Dict], int, List[str]]:
+    """
+    Rows of a plain CSV after a byte offset (complete records only).
+
+    Returns (rows, new offset, header). With no offset, or if the header is
+    no longer `header` (the file was rewritten), reads from just after the
+    header.
+    """
+    with open(path, 'rb') as f:
+        header_line = f.readline()
+        if not header_line.endswith(b'\n'):
+            return [], 0, []
+        file_header = next(csv.reader([_decode(header_line)]))
+        if header is not None and file_header != header:
+            offset = None
+        start = offset or len(header_line)
+        f.seek(start)
+        chunk = f.read()
+
+    # A newline ends a record only outside quotes (an even number of quotes before it)
+    end = chunk.rfind(b'\n')
+    while end >= 0 and chunk.count(b'"', 0, end) % 2:
+        end = chunk.rfind(b'\n', 0, end)
+    end += 1
+    reader = csv.DictReader(io.StringIO(_decode(chunk[:end]), newline=''), fieldnames=file_header)
+    return list(reader), start + end, file_header
+
+
+class TrialWatcher:
+    """Scores rows as they arrive in an input directory, with warm classifiers and caches."""
+
+    def __init__(self, input_dir: str, output_dir: str, state_path: str = DEFAULT_STATE_PATH,
+                 output_format: str = 'csv', min_score: int = 30, research: int = 0,
+                 settle: float = 2.0, researcher_options: Optional[Dict] = None,
+                 entity_map: Optional[str] = DEFAULT_ID_MAP_PATH):
+        self.input_dir = Path(input_dir)
+        self.output_dir = Path(output_dir)
+        self.state_path = Path(state_path)
+        self.min_score = min_score
+        self.research = research
+        self.settle = settle
+        self.researcher_options = researcher_options or {}
+
+        self.scored_path = self.output_dir / f'scored_trials.{output_format}'
+        self.queue_path = self.output_dir / f'priority_research_queue.{output_format}'
+        self.researched_path = self.output_dir / f'researched_trials.{output_format}'
+
+        # Built once, reused by every batch
+        self.processor = TrialICPProcessor(entity_map=entity_map)
+        default_index()
+        self.researcher = None
+        self.evidence_store = None
+
+        # File -> (outputs still to append, state to apply once they are)
+        self.unwritten: Dict[str, Tuple[List[Tuple], Dict]] = {}
+
+        self.state: Dict[str, Dict] = {}
+        if self.state_path.exists():
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                self.state = json.load(f)
+
+    def save_state(self):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2)
+        tmp_path.replace(self.state_path)
+
+    def _researcher(self):
+        """The researcher and its caches, built on first use."""
+        if self.researcher is None:
+            from automated_researcher import RestaurantResearcher
+            from confidence import ConfidenceEngine
+            from evidence_store import EvidenceStore
+            from group_index import GroupIndex
+
+            options = self.researcher_options
+            group_index = GroupIndex.load(options['group_index']) if options.get('group_index') else None
+            if options.get('evidence_db'):
+                self.evidence_store = EvidenceStore(options['evidence_db'])
+            self.researcher = RestaurantResearcher(group_index=group_index,
+                                                   confidence=ConfidenceEngine.load(options.get('weights')))
+        return self.researcher
+
+    def read_new_rows(self, path: Path, stat) -> Tuple[List[Dict], Dict]:
+        """
+        Rows added to a file since it was last read, and the file's state after them.
+
+        The state is not applied here: the caller stores it once the rows are
+        processed, so a batch that fails is read again on the next poll.
+        """
+        state = dict(self.state.get(str(path), {}))
+        replaced = stat.st_size < state.get('size', 0)
+
+        if compression(path) is None:
+            offset = None if replaced else state.get('offset')
+            rows, new_offset, header = read_csv_from(path, offset, state.get('header'))
+            restarted = offset is None or header != state.get('header')
+            state.update({'offset': new_offset, 'header': header,
+                          'rows': (0 if restarted else state.get('rows', 0)) + len(rows)})
+        else:
+            skip = 0 if replaced else state.get('rows', 0)
+            rows = list(read_rows(path))
+            if len(rows) < skip:
+                skip = 0
+            rows = rows[skip:]
+            state['rows'] = skip + len(rows)
+
+        state.update({'size': stat.st_size, 'mtime': stat.st_mtime})
+        return rows, state
+
+    def process_batch(self, path: Path, rows: List[Dict]) -> Tuple[Dict, List[Tuple]]:
+        """
+        Convert, score, queue and (optionally) research one batch.
+
+        Returns (counts, outputs). Nothing is appended here: outputs are
+        (append function, rows, path) to write once the whole batch succeeded.
+        """
+        if rows and EXPORT_COLUMN in rows[0]:
+            rows = convert_rows(rows)
+
+        records = self.processor.process_rows(rows)
+        queue, _ = select_top_trials((record.to_dict() for record in records), min_score=self.min_score)
+        outputs = [(append_records, records, self.scored_path), (append_rows, queue, self.queue_path)]
+
+        researched = 0
+        if self.research > 0 and queue:
+            from automated_researcher import research_trials
+
+            results, _ = research_trials(self._researcher(), queue, limit=self.research,
+                                         evidence_store=self.evidence_store)
+            outputs.append((append_rows, results, self.researched_path))
+            researched = len(results)
+
+        tiers: Dict[str, int] = {}
+        for record in records:
+            tiers[record.tier] = tiers.get(record.tier, 0) + 1
+        return {'scored': len(records), 'queued': len(queue), 'researched': researched, 'tiers': tiers}, outputs
+
+    def write_outputs(self, path: Path, outputs: List[Tuple], new_state: Dict) -> bool:
+        """
+        Append a batch's outputs, then move the file's progress to `new_state`.
+
+        Outputs are appended one at a time; if one fails, it and the ones after
+        it are kept and retried on the next poll, so none is appended twice.
+        """
+        while outputs:
+            append, rows, output_path = outputs[0]
+            try:
+                append(rows, output_path)
+            except Exception as e:
+                self.unwritten[str(path)] = (outputs, new_state)
+                print(f"❌ {path.name}: could not append to {output_path.name} ({e}); retrying next poll",
+                      file=sys.stderr)
+                return False
+            outputs.pop(0)
+
+        self.unwritten.pop(str(path), None)
+        self.state[str(path)] = new_state
+        self.save_state()
+        return True
+
+    def poll(self) -> int:
+        """Process every settled file with new rows. Returns rows scored."""
+        scored = 0
+        now = time.time()
+
+        for path in watched_files(self.input_dir):
+            if str(path) in self.unwritten:
+                # Finish the last batch's appends before reading anything new
+                if not self.write_outputs(path, *self.unwritten[str(path)]):
+                    continue
+
+            stat = path.stat()
+            state = self.state.get(str(path), {})
+            if state.get('size') == stat.st_size and state.get('mtime') == stat.st_mtime:
+                continue
+            if now - stat.st_mtime < self.settle:
+                continue
+
+            started = time.monotonic()
+            rows, new_state = self.read_new_rows(path, stat)
+            if not rows:
+                self.write_outputs(path, [], new_state)
+                continue
+            try:
+                counts, outputs = self.process_batch(path, rows)
+            except Exception as e:
+                # Nothing was appended and the state stays where it was, so the batch is read again next poll
+                print(f"❌ {path.name}: {len(rows)} new trials not processed ({e}); retrying next poll", file=sys.stderr)
+                continue
+            if not self.write_outputs(path, outputs, new_state):
+                continue
+            scored += counts['scored']
+            tiers = ', '.join(f"{tier}: {count}" for tier, count in sorted(counts['tiers'].items()))
+            progress.info(f"✅ {path.name}: {counts['scored']} new trials scored in "
+                  f"{time.monotonic() - started:.2f}s ({tiers}); "
+                  f"{counts['queued']} queued, {counts['researched']} researched")
+
+        return scored
+
+    def run(self, interval: float = 5.0, once: bool = False):
+        """Poll until interrupted (or once)."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        progress.info(f"👀 Watching {self.input_dir} (every {interval:g}s) -> {self.output_dir}")
+        try:
+            while True:
+                self.poll()
+                if once:
+                    return
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            progress.info("\n👋 Stopped watching")
+        finally:
+            self.save_state()
+            if self.evidence_store is not None:
+                self.evidence_store.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Score new trial rows as exports arrive in a folder')
+    parser.add_argument('--input-dir', default='data/input', help='Folder to watch for trial exports')
+    parser.add_argument('--output-dir', default='data/output', help='Where outputs are appended')
+    parser.add_argument('--format', choices=['csv', 'csv.gz', 'csv.zst'], default='csv', help='Output format')
+    parser.add_argument('--state', default=DEFAULT_STATE_PATH, help='Per-file progress state')
+    parser.add_argument('--interval', type=float, default=5.0, help='Seconds between polls')
+    parser.add_argument('--settle', type=float, default=2.0,
+                        help='Only read files unmodified for this many seconds')
+    parser.add_argument('--once', action='store_true', help='Process what is new and exit')
+    parser.add_argument('--min-score', type=int, default=30, help='Minimum research priority score to queue')
+    parser.add_argument('--research', type=int, default=0, help='Research the top N queued clusters of each batch')
+    parser.add_argument('--group-index', default='data/output/group_index.json', help='Restaurant group index JSON')
+    parser.add_argument('--evidence-db', default='data/output/evidence.db',
+                        help='SQLite evidence store updated with every research result')
+    parser.add_argument('--weights', help='JSON confidence weights file (defaults if omitted)')
+    parser.add_argument('--entity-map', default=DEFAULT_ID_MAP_PATH,
+                        help='Company name -> entity_id map shared with identify, so entity ids stay stable')
+    parser.add_argument('--no-entity-map', action='store_true',
+                        help='Assign entity ids from each batch alone')
+    progress.add_progress_arguments(parser)
+
+    args = parser.parse_args(argv)
+    progress.configure(args.progress)
+
+    watcher = TrialWatcher(
+        args.input_dir, args.output_dir, args.state,
+        output_format=args.format, min_score=args.min_score, research=args.research, settle=args.settle,
+        researcher_options={'group_index': args.group_index, 'evidence_db': args.evidence_db,
+                            'weights': args.weights},
+        entity_map=None if args.no_entity_map else args.entity_map,
+    )
+    watcher.run(args.interval, once=args.once)
+
+
+if __name__ == '__main__':
+    main()
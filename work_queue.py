@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Research Work Queue
+
+SQLite-backed queue over scored trials so several researcher processes can
+drain one backlog without overlapping or dropping trials (replaces the
+hard-coded restaurants[50:100] slices and per-batch output files).
+
+- Workers lease a batch of the highest-priority pending trials for a while
+- Finished trials are marked done (with their research result)
+- Failed trials go back to pending until they hit max_attempts
+- Leases that expire (crashed or killed worker) count as an attempt and are
+  requeued, so a trial that keeps killing its worker ends up failed
+- Only the worker holding a lease can complete, fail or release it; a worker
+  whose lease expired and was taken over can't overwrite the new holder
+
+Usage:
+    python work_queue.py enqueue --input data/output/priority_research_queue.csv
+    python automated_researcher.py --queue data/output/research_queue.db --worker-id w1
+    python work_queue.py stats
+    python work_queue.py export --output data/output/researched_trials.csv
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from filter_best_trials import score_research_priority
+from trial_io import read_rows, write_rows
+
+
+DEFAULT_QUEUE_PATH = 'data/output/research_queue.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    trial_key TEXT NOT NULL UNIQUE,
+    priority INTEGER NOT NULL DEFAULT 0,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_items_status_priority ON items (status, priority DESC, id);
+CREATE INDEX IF NOT EXISTS idx_items_lease ON items (status, lease_expires);
+"""
+
+
+def trial_key(trial: Dict) -> str:
+    """Stable key for a trial: company name plus email."""
+    return f"{trial.get('company_name', '').strip().lower()}|{trial.get('email', '').strip().lower()}"
+
+
+def default_worker_id() -> str:
+    return f'{socket.gethostname()}-{os.getpid()}'
+
+
+class WorkQueue:
+    """Lease-based work queue stored in SQLite."""
+
+    def __init__(self, path: str = DEFAULT_QUEUE_PATH, max_attempts: int = 3):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def _transaction(self):
+        # BEGIN IMMEDIATE takes the write lock up front so two workers can't lease the same rows
+        self.conn.execute('BEGIN IMMEDIATE')
+
+    def enqueue(self, trials: Iterable[Dict]) -> int:
+        """Add trials not already queued. Returns the number added."""
+        now = time.time()
+        rows = []
+        for trial in trials:
+            priority = trial.get('research_priority_score')
+            priority = int(priority) if priority not in (None, '') else score_research_priority(trial)
+            rows.append((trial_key(trial), priority, json.dumps(trial), now))
+
+        self._transaction()
+        try:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO items (trial_key, priority, payload, updated_at) VALUES (?, ?, ?, ?)',
+                rows,
+            )
+            added = self.conn.total_changes - before
+            self.conn.execute('COMMIT')
+        except Exception:
+            self.conn.execute('ROLLBACK')
+            raise
+        return added
+
+    def _reclaim_expired(self, now: float) -> int:
+        # An expired lease is a failed attempt (the worker may have crashed on this trial)
+        cursor = self.conn.execute(
+            "UPDATE items SET attempts = attempts + 1, error = 'Lease expired', "
+            "status = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE 'pending' END, "
+            "lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+            "WHERE status = 'leased' AND lease_expires < ?",
+            (self.max_attempts, now, now),
+        )
+        return cursor.rowcount
+
+    def requeue_expired(self) -> int:
+        """Return expired leases to pending (or failed). Returns the number reclaimed."""
+        return self._reclaim_expired(time.time())
+
+    def lease(self, worker_id: str, batch_size: int = 10, lease_seconds: float = 600) -> List[Tuple[int, Dict]]:
+        """Lease up to batch_size pending trials, highest priority first."""
+        now = time.time()
+
+        self._transaction()
+        try:
+            self._reclaim_expired(now)
+            rows = self.conn.execute(
+                "SELECT id, payload FROM items WHERE status = 'pending' ORDER BY priority DESC, id LIMIT ?",
+                (batch_size,),
+            ).fetchall()
+            self.conn.executemany(
+                "UPDATE items SET status = 'leased', lease_owner = ?, lease_expires = ?, updated_at = ? WHERE id = ?",
+                [(worker_id, now + lease_seconds, now, row['id']) for row in rows],
+            )
+            self.conn.execute('COMMIT')
+        except Exception:
+            self.conn.execute('ROLLBACK')
+            raise
+
+        return [(row['id'], json.loads(row['payload'])) for row in rows]
+
+    def complete(self, item_id: int, worker_id: str, result: Dict) -> bool:
+        """Mark a trial leased by worker_id done and store its result. False if the lease was lost."""
+        cursor = self.conn.execute(
+            "UPDATE items SET status = 'done', result = ?, error = NULL, attempts = attempts + 1, "
+            "lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+            "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+            (json.dumps(result, default=str), time.time(), item_id, worker_id),
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, item_id: int, worker_id: str, error: str) -> bool:
+        """Record a failed attempt; the trial is retried until max_attempts. False if the lease was lost."""
+        cursor = self.conn.execute(
+            "UPDATE items SET attempts = attempts + 1, error = ?, "
+            "status = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE 'pending' END, "
+            "lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+            "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+            (error[:500], self.max_attempts, time.time(), item_id, worker_id),
+        )
+        return cursor.rowcount == 1
+
+    def release(self, item_ids: List[int], worker_id: str):
+        """Give leased trials back without counting an attempt (e.g. budget ran out)."""
+        self.conn.executemany(
+            "UPDATE items SET status = 'pending', lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+            "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+            [(time.time(), item_id, worker_id) for item_id in item_ids],
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """Number of trials per status."""
+        rows = self.conn.execute('SELECT status, COUNT(*) AS n FROM items GROUP BY status').fetchall()
+        return {row['status']: row['n'] for row in rows}
+
+    def results(self) -> List[Dict]:
+        """Research results of finished trials, highest priority first."""
+        rows = self.conn.execute(
+            "SELECT result FROM items WHERE status = 'done' ORDER BY priority DESC, id"
+        ).fetchall()
+        return [json.loads(row['result']) for row in rows]
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Manage the research work queue')
+    parser.add_argument('command', choices=['enqueue', 'stats', 'requeue', 'export'])
+    parser.add_argument('--queue', default=DEFAULT_QUEUE_PATH, help='Queue database')
+    parser.add_argument('--input', default='data/output/priority_research_queue.csv', help='Trials CSV to enqueue')
+    parser.add_argument('--output', default='data/output/researched_trials.csv', help='Export CSV')
+
+    args = parser.parse_args(argv)
+
+    queue = WorkQueue(args.queue)
+
+    if args.command == 'enqueue':
+        added = queue.enqueue(read_rows(args.input))
+        print(f"✅ Enqueued {added} new trials")
+
+    elif args.command == 'requeue':
+        print(f"♻️  Reclaimed {queue.requeue_expired()} expired leases")
+
+    elif args.command == 'export':
+        results = queue.results()
+        write_rows(results, args.output)
+        print(f"📄 Exported {len(results)} results to: {args.output}")
+
+    stats = queue.stats()
+    print("Queue status:")
+    for status in ['pending', 'leased', 'done', 'failed']:
+        print(f"  {status}: {stats.get(status, 0)}")
+
+    queue.close()
+
+
+if __name__ == '__main__':
+    main()